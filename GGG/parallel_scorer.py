@@ -0,0 +1,111 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from pattern_matrix import CHUNK_CELLS, NUMPY_AVAILABLE, block_entropies, encode_letters, np, pattern_rows
+
+
+# -----------------------------
+# Recherche parallèle du meilleur guess
+# -----------------------------
+# Le score de chaque guess est indépendant des autres : la liste des guesses
+# est découpée en tranches réparties sur un pool de processus.
+#   - les lettres du dictionnaire (N x 5 uint8) sont publiées une fois en
+#     mémoire partagée ; chaque processus les ouvre par leur nom, sans copie ;
+#   - si la matrice des feedbacks existe (pattern_matrix.py), chaque processus
+#     l'ouvre en memmap : les pages du fichier sont partagées par le système ;
+#     sinon les codes sont calculés (numpy) à partir des lettres partagées.
+# Chaque tâche ne transporte que des indices ; elle renvoie le meilleur
+# (score, position) de sa tranche. La réduction garde le meilleur score et, à
+# égalité, la plus petite position : même résultat que la boucle séquentielle,
+# quel que soit le nombre de processus.
+TASKS_PER_WORKER = 4   # plus de tranches que de processus : charge équilibrée
+
+_worker = {}
+
+
+def init_worker(shm_name, n, patterns_path):
+    # Une fois par processus : vues sur le bloc partagé (+ memmap de la matrice)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _worker["shm"] = shm  # garde le bloc ouvert tant que le processus vit
+    _worker["letters"] = np.ndarray((n, 5), dtype=np.uint8, buffer=shm.buf)
+    _worker["codes"] = None
+    if patterns_path:
+        from pattern_matrix import HEADER
+        _worker["codes"] = np.memmap(patterns_path, dtype=np.uint8, mode="r", offset=HEADER, shape=(n, n))
+
+
+def score_slice(guess_idx, possible_idx):
+    """(meilleur score, position dans guess_idx) pour une tranche de guesses."""
+    letters, codes = _worker["letters"], _worker["codes"]
+    secrets = letters[possible_idx]
+    rows = max(1, CHUNK_CELLS // (5 * len(possible_idx)))
+    best_score, best_pos = -1.0, -1
+    for lo in range(0, len(guess_idx), rows):
+        chunk = guess_idx[lo:lo + rows]
+        if codes is not None:
+            block = codes[chunk][:, possible_idx]
+        else:
+            block = pattern_rows(letters[chunk], secrets)
+        scores = block_entropies(block)
+        pos = int(np.argmax(scores))  # premier maximum de la tranche
+        if scores[pos] > best_score:
+            best_score, best_pos = float(scores[pos]), lo + pos
+    return best_score, best_pos
+
+
+class ParallelScorer:
+    """
+    Pool de processus pour best_guess_entropy (numpy requis).
+
+    Usage :
+        with ParallelScorer(words, workers=4) as scorer:
+            guess, score = scorer.best_guess(possible, words)
+    patterns : PatternMatrix optionnelle (son fichier est ouvert par chaque processus).
+    """
+
+    def __init__(self, words, workers=None, patterns=None):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("numpy is required for the parallel scorer")
+        self.words = list(words)
+        self.index = {w: i for i, w in enumerate(self.words)}
+        self.workers = workers or os.cpu_count() or 1
+
+        n = len(self.words)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(5 * n, 1))
+        letters = np.ndarray((n, 5), dtype=np.uint8, buffer=self.shm.buf)
+        letters[...] = encode_letters(self.words)
+        del letters
+
+        path = patterns.codes.filename if patterns is not None else None
+        self.pool = ProcessPoolExecutor(self.workers, initializer=init_worker,
+                                        initargs=(self.shm.name, n, path))
+
+    def indices(self, words):
+        return np.fromiter((self.index[w] for w in words), dtype=np.intp, count=len(words))
+
+    def best_guess(self, possible_words, candidates):
+        """(mot, entropie) ; à égalité, le premier candidat de la liste (comme best_guess_entropy)."""
+        guess_idx = self.indices(candidates)
+        possible_idx = self.indices(possible_words)
+        if len(guess_idx) == 0 or len(possible_idx) == 0:
+            return None, -1.0
+
+        size = -(-len(guess_idx) // (self.workers * TASKS_PER_WORKER))
+        starts = range(0, len(guess_idx), size)
+        results = self.pool.map(score_slice, [guess_idx[lo:lo + size] for lo in starts],
+                                [possible_idx] * len(starts))
+        # Réduction déterministe : meilleur score, puis plus petite position
+        best_score, best_pos = max(((score, -(lo + pos)) for lo, (score, pos) in zip(starts, results)))
+        return candidates[-best_pos], best_score
+
+    def close(self):
+        self.pool.shutdown()
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
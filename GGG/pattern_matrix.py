@@ -0,0 +1,252 @@
+import hashlib
+import os
+import sys
+import time
+from math import log2
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:  # le solveur reste utilisable sans numpy (calcul direct du feedback)
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+# -----------------------------
+# Matrice des feedbacks (guess x secret)
+# -----------------------------
+# Le feedback d'un couple (guess, secret) ne dépend que du dictionnaire : on le
+# calcule une fois pour tous les couples et on l'écrit dans un fichier, à côté
+# de words.txt. Chaque feedback est codé en base 3 sur un octet :
+#   B = 0, Y = 1, G = 2, position i -> chiffre de poids 3**i  (0 .. 242)
+# La ligne g contient les codes du guess n°g contre tous les secrets. Le
+# fichier est ouvert en memmap (lecture seule) : seules les lignes lues sont
+# chargées, et la mémoire est partagée par tous les processus qui l'ouvrent.
+#
+# Format du fichier :
+#   en-tête  48 octets  MAGIC (8), N (uint32), réservé (4), sha256 du dictionnaire (32)
+#   codes    N*N        uint8, ligne = guess, colonne = secret
+# Le sha256 porte sur la liste de mots chargée : si words.txt change, le fichier
+# est refusé (load) ou reconstruit (open_patterns).
+MAGIC = b"GGGPAT1\0"
+HEADER = 48
+PATTERNS = 3 ** 5
+ALL_GREEN = PATTERNS - 1
+CHUNK_CELLS = 1 << 22   # cases traitées par bloc (mémoire bornée, quelle que soit la taille du dictionnaire)
+DIGITS = {"B": 0, "Y": 1, "G": 2}
+
+
+def feedback_code(feedback: str) -> int:
+    """'BYGGG' -> code base 3 (position 0 = chiffre de poids faible)."""
+    return sum(DIGITS[ch] * 3 ** i for i, ch in enumerate(feedback.upper()))
+
+
+def code_feedback(code: int) -> str:
+    out = []
+    for _ in range(5):
+        code, digit = divmod(code, 3)
+        out.append("BYG"[digit])
+    return "".join(out)
+
+
+def words_checksum(words) -> bytes:
+    return hashlib.sha256("\n".join(words).encode("utf-8")).digest()
+
+
+def default_path(words_file: str = "words.txt") -> str:
+    return os.path.splitext(words_file)[0] + ".patterns"
+
+
+# -----------------------------
+# Construction (une fois)
+# -----------------------------
+def encode_letters(words):
+    """(N, 5) uint8 : codes des lettres de chaque mot."""
+    return np.array([[ord(c) for c in w] for w in words], dtype=np.uint8).reshape(len(words), 5)
+
+
+def pattern_rows(guesses, secrets):
+    """
+    Codes (len(guesses), len(secrets)) en uint8, mêmes règles que build_feedback :
+    verts d'abord, puis un jaune par occurrence de la lettre restant dans le secret.
+    """
+    g = guesses[:, None, :]
+    s = secrets[None, :, :]
+    green = g == s                                   # (G, S, 5)
+    codes = np.zeros(green.shape[:2], dtype=np.uint8)
+    for i in range(5):
+        letter = g[:, :, i:i + 1]
+        # occurrences de la lettre du guess parmi les positions non vertes du secret
+        available = ((s == letter) & ~green).sum(axis=2)
+        # positions précédentes du guess, même lettre, non vertes : elles consomment ces occurrences
+        before = ((g[:, :, :i] == letter) & ~green[:, :, :i]).sum(axis=2)
+        yellow = ~green[:, :, i] & (available > before)
+        codes += (2 * green[:, :, i] + yellow).astype(np.uint8) * np.uint8(3 ** i)
+    return codes
+
+
+def build(words, path: str, verbose: bool = False) -> str:
+    """Écrit la matrice de tous les couples de `words` dans `path` (fichier temporaire puis renommage)."""
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("numpy is required to build the pattern matrix")
+    n = len(words)
+    letters = encode_letters(words)
+
+    header = MAGIC + n.to_bytes(4, "little") + bytes(4) + words_checksum(words)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(header)
+    matrix = np.memmap(tmp, dtype=np.uint8, mode="r+", offset=HEADER, shape=(n, n))
+
+    start = time.perf_counter()
+    rows = max(1, CHUNK_CELLS // (5 * max(n, 1)))
+    for lo in range(0, n, rows):
+        matrix[lo:lo + rows] = pattern_rows(letters[lo:lo + rows], letters)
+        if verbose and (lo // rows) % 50 == 0:
+            print(f"  {lo}/{n} lignes ({time.perf_counter() - start:.0f} s)")
+    matrix.flush()
+    del matrix
+    os.replace(tmp, path)
+    return path
+
+
+# -----------------------------
+# Lecture + requêtes
+# -----------------------------
+def block_entropies(block):
+    """Entropie de chaque ligne d'un bloc de codes (guesses x secrets possibles)."""
+    k, n = block.shape
+    # un seul bincount pour tout le bloc : la ligne r occupe les cases [r*243, (r+1)*243)
+    counts = np.bincount((block + np.arange(k)[:, None] * PATTERNS).ravel(),
+                         minlength=k * PATTERNS).reshape(k, PATTERNS)
+    # H = log2(n) - sum(c * log2(c)) / n
+    nonzero = np.where(counts > 0, counts, 1)
+    return log2(n) - (counts * np.log2(nonzero)).sum(axis=1) / n
+
+
+def guess_entropies(guesses, possible_words):
+    """
+    Entropie de chaque guess sans matrice précalculée : codes calculés par blocs
+    (pattern_rows), puis block_entropies, comme PatternMatrix et ParallelScorer.
+    Les trois chemins donnent donc exactement les mêmes scores.
+    """
+    secrets = encode_letters(possible_words)
+    letters = encode_letters(guesses)
+    out = np.zeros(len(guesses))
+    if len(possible_words) == 0:
+        return out
+    rows = max(1, CHUNK_CELLS // (5 * len(possible_words)))
+    for lo in range(0, len(guesses), rows):
+        out[lo:lo + rows] = block_entropies(pattern_rows(letters[lo:lo + rows], secrets))
+    return out
+
+
+def best_guess(possible_words, candidates):
+    """(mot, entropie) ; à égalité, le premier candidat de la liste."""
+    if not candidates:
+        return None, -1.0
+    scores = guess_entropies(candidates, possible_words)
+    best = int(np.argmax(scores))
+    return candidates[best], float(scores[best])
+
+
+class PatternMatrix:
+    """
+    Matrice des feedbacks ouverte en memmap.
+
+    entropies / best_guess / filter travaillent sur des listes de mots du
+    dictionnaire (comme entropy_of_guess et filter_possible) ; un mot absent
+    du dictionnaire lève KeyError.
+    """
+
+    def __init__(self, words, codes):
+        self.words = list(words)
+        self.codes = codes
+        self.index = {w: i for i, w in enumerate(self.words)}
+
+    @classmethod
+    def load(cls, words, path: str) -> "PatternMatrix":
+        with open(path, "rb") as f:
+            header = f.read(HEADER)
+        if len(header) < HEADER or header[:8] != MAGIC:
+            raise ValueError(f"{path}: not a pattern matrix")
+        n = int.from_bytes(header[8:12], "little")
+        if n != len(words) or header[16:48] != words_checksum(words):
+            raise ValueError(f"{path}: built for another word list")
+        if os.path.getsize(path) != HEADER + n * n:
+            raise ValueError(f"{path}: truncated file")
+        return cls(words, np.memmap(path, dtype=np.uint8, mode="r", offset=HEADER, shape=(n, n)))
+
+    def indices(self, words):
+        return np.fromiter((self.index[w] for w in words), dtype=np.intp, count=len(words))
+
+    def code(self, secret: str, guess: str) -> int:
+        return int(self.codes[self.index[guess], self.index[secret]])
+
+    def feedback(self, secret: str, guess: str) -> str:
+        return code_feedback(self.code(secret, guess))
+
+    def filter(self, possible_words, guess, feedback):
+        """Même résultat que filter_possible : les secrets qui donnent exactement ce feedback."""
+        possible = self.indices(possible_words)
+        keep = self.codes[self.index[guess]][possible] == feedback_code(feedback)
+        return [possible_words[i] for i in np.flatnonzero(keep)]
+
+    def entropies(self, guesses, possible_words):
+        """Entropie de chaque guess (tableau float64) : une ligne de codes + bincount par guess."""
+        guess_idx = self.indices(guesses)
+        possible = self.indices(possible_words)
+        n = len(possible)
+        out = np.zeros(len(guess_idx))
+        if n == 0:
+            return out
+        rows = max(1, CHUNK_CELLS // n)
+        for lo in range(0, len(guess_idx), rows):
+            out[lo:lo + rows] = block_entropies(self.codes[guess_idx[lo:lo + rows]][:, possible])
+        return out
+
+    def entropy(self, guess, possible_words) -> float:
+        return float(self.entropies([guess], possible_words)[0])
+
+    def best_guess(self, possible_words, candidates):
+        """(mot, entropie) ; à égalité, le premier candidat de la liste (comme best_guess_entropy)."""
+        if not candidates:
+            return None, -1.0
+        scores = self.entropies(candidates, possible_words)
+        best = int(np.argmax(scores))
+        return candidates[best], float(scores[best])
+
+
+def open_patterns(words, path: str, build_missing: bool = True):
+    """
+    PatternMatrix pour `words`, ou None si numpy manque.
+
+    Si le fichier est absent ou construit pour une autre liste de mots, il est
+    (re)construit quand build_missing est vrai ; sinon None.
+    """
+    if not NUMPY_AVAILABLE:
+        return None
+    try:
+        return PatternMatrix.load(words, path)
+    except (OSError, ValueError):
+        if not build_missing:
+            return None
+    print(f"Construction de {path} ({len(words)}² feedbacks, une seule fois)...")
+    build(words, path, verbose=True)
+    return PatternMatrix.load(words, path)
+
+
+def main():
+    from wordle_solver import load_words
+
+    words_file = sys.argv[1] if len(sys.argv) > 1 else "words.txt"
+    path = sys.argv[2] if len(sys.argv) > 2 else default_path(words_file)
+    words = load_words(words_file)
+    start = time.perf_counter()
+    build(words, path, verbose=True)
+    size = os.path.getsize(path) / 1e6
+    print(f"✓ {path} : {len(words)} mots, {size:.0f} Mo, {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
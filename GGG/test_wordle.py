@@ -9,6 +9,11 @@ from wordle_solver_csp_llm import (
     best_guess_entropy,
     load_words
 )
+import os
+import tempfile
+
+from pattern_matrix import NUMPY_AVAILABLE, PatternMatrix, build, code_feedback
+from parallel_scorer import ParallelScorer
 
 
 def test_feedback():
@@ -179,6 +184,74 @@ def test_repeated_letters():
     return passed == len(tests)
 
 
+def test_pattern_matrix():
+    """Test de la matrice des feedbacks précalculée"""
+    print("\n" + "="*50)
+    print("TEST 7 : Matrice des feedbacks")
+    print("="*50)
+    
+    if not NUMPY_AVAILABLE:
+        print("numpy absent : test ignoré")
+        return True
+    
+    words = load_words("words.txt")[:300] + ["SPEED", "ERASE", "LLAMA", "LEVEL", "SISSY", "SWISS"]
+    path = os.path.join(tempfile.mkdtemp(), "words.patterns")
+    build(words, path)
+    patterns = PatternMatrix.load(words, path)
+    
+    # Tous les couples : même feedback que build_feedback
+    errors = sum(1 for g in words for s in words
+                 if patterns.feedback(s, g) != build_feedback(s, g))
+    print(f"{'✓' if errors == 0 else '✗'} {len(words)**2} couples comparés, {errors} différence(s)")
+    
+    entropy_ok = all(abs(patterns.entropy(g, words) - entropy_of_guess(g, words)) < 1e-9
+                     for g in words[:20])
+    print(f"{'✓' if entropy_ok else '✗'} Entropie identique au calcul direct")
+    
+    # Fichier construit pour une autre liste de mots : refusé (checksum)
+    try:
+        PatternMatrix.load(words[::-1], path)
+        checksum_ok = False
+    except ValueError:
+        checksum_ok = True
+    print(f"{'✓' if checksum_ok else '✗'} Dictionnaire modifié détecté")
+    
+    codes_ok = code_feedback(242) == "GGGGG" and code_feedback(5) == "GYBBB"
+    del patterns
+    os.remove(path)
+    return errors == 0 and entropy_ok and checksum_ok and codes_ok
+
+
+def test_parallel_scorer():
+    """Test de la recherche parallèle du meilleur guess"""
+    print("\n" + "="*50)
+    print("TEST 8 : Recherche parallèle")
+    print("="*50)
+    
+    if not NUMPY_AVAILABLE:
+        print("numpy absent : test ignoré")
+        return True
+    
+    words = load_words("words.txt")
+    guesses = words[:600]
+    # Plusieurs ensembles de secrets possibles : même mot ET même score (au bit près) avec ou sans scorer
+    cases = [words[:150], words[1000:1040], words[::500], ["CRANE", "CRATE", "GRATE", "TRACE"]]
+    expected = [best_guess_entropy(possible, guesses) for possible in cases]
+    
+    with ParallelScorer(words, workers=2) as scorer:
+        results = [best_guess_entropy(possible, guesses, scorer=scorer) for possible in cases]
+        # Un seul secret possible : tous les guesses à 0 bit, le premier de la liste l'emporte
+        tie, _ = scorer.best_guess(["CRANE"], guesses[10:])
+    
+    same = results == expected
+    for (guess, score), (seq_guess, seq_score) in zip(results, expected):
+        print(f"{'✓' if (guess, score) == (seq_guess, seq_score) else '✗'} "
+              f"Parallèle : {guess} ({score:.3f} bits), séquentiel : {seq_guess} ({seq_score:.3f} bits)")
+    tie_ok = tie == guesses[10]
+    print(f"{'✓' if tie_ok else '✗'} Égalité départagée par l'ordre des candidats : {tie}")
+    return same and tie_ok
+
+
 def run_all_tests():
     """Exécute tous les tests"""
     print("\n" + "#"*50)
@@ -192,6 +265,8 @@ def run_all_tests():
         ("Filtrage CSP", test_csp_filtering),
         ("Lettres répétées", test_repeated_letters),
         ("Partie complète", test_full_game),
+        ("Matrice des feedbacks", test_pattern_matrix),
+        ("Recherche parallèle", test_parallel_scorer),
     ]
     
     results = []
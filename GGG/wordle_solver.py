@@ -1,6 +1,10 @@
+import sys
 from collections import Counter, defaultdict
 from math import log2
 
+import pattern_matrix
+from pattern_matrix import NUMPY_AVAILABLE, default_path, open_patterns
+
 # -----------------------------
 # Utils dictionnaire + feedback
 # -----------------------------
@@ -36,10 +40,13 @@ def build_feedback(secret: str, guess: str) -> str:
     return "".join(fb)
 
 
-def filter_possible(possible_words, guess, feedback):
+def filter_possible(possible_words, guess, feedback, patterns=None):
     """
     Garde uniquement les mots qui produisent exactement ce feedback.
+    - patterns : PatternMatrix optionnelle (lecture des codes au lieu de build_feedback)
     """
+    if patterns is not None:
+        return patterns.filter(possible_words, guess, feedback)
     out = []
     for w in possible_words:
         if build_feedback(w, guess) == feedback:
@@ -50,11 +57,15 @@ def filter_possible(possible_words, guess, feedback):
 # -----------------------------
 # Stratégie entropie
 # -----------------------------
-def entropy_of_guess(guess, possible_words):
+def entropy_of_guess(guess, possible_words, patterns=None):
     """
     Entropie attendue des feedbacks si on joue 'guess' alors que le secret
     est dans possible_words.
     """
+    if patterns is not None:
+        return patterns.entropy(guess, possible_words)
+    if NUMPY_AVAILABLE:
+        return float(pattern_matrix.guess_entropies([guess], possible_words)[0])
     counts = defaultdict(int)
     n = len(possible_words)
     for secret in possible_words:
@@ -68,17 +79,29 @@ def entropy_of_guess(guess, possible_words):
     return H
 
 
-def best_guess_entropy(possible_words, all_words, limit_guesses=None):
+def best_guess_entropy(possible_words, all_words, limit_guesses=None, patterns=None, scorer=None):
     """
     Retourne le mot qui maximise l'entropie.
     - possible_words : secrets possibles
     - all_words : mots autorisés comme guess
     - limit_guesses : optionnel, pour accélérer (ex: tester que sur possible_words)
+    - patterns : PatternMatrix optionnelle (bincount sur les codes précalculés)
+    - scorer : ParallelScorer optionnel (guesses répartis sur un pool de processus)
     """
     candidates = all_words
     if limit_guesses == "possible_only":
         candidates = possible_words
 
+    if scorer is not None:
+        return scorer.best_guess(possible_words, candidates)
+
+    if patterns is not None:
+        return patterns.best_guess(possible_words, candidates)
+
+    # Même calcul (block_entropies) que la matrice et le scorer parallèle : même guess choisi
+    if NUMPY_AVAILABLE:
+        return pattern_matrix.best_guess(possible_words, candidates)
+
     best_word = None
     best_score = -1.0
 
@@ -94,7 +117,22 @@ def best_guess_entropy(possible_words, all_words, limit_guesses=None):
 # -----------------------------
 # Mode interactif
 # -----------------------------
-def interactive_solver(words):
+def interactive_solver(words, patterns=None, workers=0):
+    """
+    Avec la matrice des feedbacks (patterns), l'entropie est calculée sur tous
+    les mots à chaque tour, ouverture comprise ; sans elle, ouverture fixe et
+    guesses limités aux secrets possibles.
+    workers > 0 : recherche du meilleur guess répartie sur ce nombre de processus.
+    """
+    if workers and NUMPY_AVAILABLE:
+        from parallel_scorer import ParallelScorer
+
+        with ParallelScorer(words, workers, patterns) as scorer:
+            return solve_loop(words, patterns, scorer)
+    return solve_loop(words, patterns)
+
+
+def solve_loop(words, patterns=None, scorer=None):
     possible = words[:]          # secrets possibles
     all_words = words[:]         # guesses autorisés (ici = même liste)
 
@@ -112,12 +150,15 @@ def interactive_solver(words):
             print(f"✅ Mot trouvé : {possible[0]}")
             return
 
-        if step == 1:
+        if patterns is not None:
+            guess, score = best_guess_entropy(possible, all_words, patterns=patterns, scorer=scorer)
+            print(f"[Tour {step}] Je propose : {guess}  (entropie={score:.3f})")
+        elif step == 1:
             guess = "SLATE"   # tu peux mettre "CRANE" ou "ALERT"
             score = 0.0
             print(f"[Tour {step}] Je propose : {guess} (mot fixe pour aller vite)")
         else:
-            guess, score = best_guess_entropy(possible, all_words, limit_guesses="possible_only")
+            guess, score = best_guess_entropy(possible, all_words, limit_guesses="possible_only", scorer=scorer)
             print(f"[Tour {step}] Je propose : {guess}  (entropie={score:.3f})")
 
         fb = input("Feedback (G/Y/B) : ").strip().upper()
@@ -128,7 +169,7 @@ def interactive_solver(words):
             print("⚠️ Feedback invalide. Exemple valide: BYGBB")
             continue
 
-        possible = filter_possible(possible, guess, fb)
+        possible = filter_possible(possible, guess, fb, patterns)
         print(f"→ Solutions restantes : {len(possible)}")
         if len(possible) <= 20:
             print("  ", possible)
@@ -140,7 +181,14 @@ def main():
     words = load_words("words.txt")
     print(f"{len(words)} mots chargés")
 
-    interactive_solver(words)
+    # Matrice des feedbacks (numpy) : construite au premier lancement, puis ouverte en memmap
+    patterns = open_patterns(words, default_path("words.txt"))
+    if patterns is None:
+        print("numpy absent : calcul direct des feedbacks (plus lent)")
+
+    # python wordle_solver.py [processus] : recherche parallèle du meilleur guess
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    interactive_solver(words, patterns, workers)
 
 
 if __name__ == "__main__":
@@ -2,6 +2,9 @@
 from collections import Counter, defaultdict
 from math import log2
 import json
+import sys
+
+import pattern_matrix
 
 
 # ====================================
@@ -176,6 +179,9 @@ def entropy_of_guess(guess, possible_words):
     Calcule l'entropie d'un mot guess.
     Plus l'entropie est élevée, plus le mot nous donne d'informations.
     """
+    if pattern_matrix.NUMPY_AVAILABLE:
+        return float(pattern_matrix.guess_entropies([guess], possible_words)[0])
+    
     counts = defaultdict(int)
     n = len(possible_words)
     
@@ -192,12 +198,21 @@ def entropy_of_guess(guess, possible_words):
     return H
 
 
-def best_guess_entropy(possible_words, all_words, limit=None):
+def best_guess_entropy(possible_words, all_words, limit=None, scorer=None):
     """
     Trouve le meilleur mot à jouer selon l'entropie.
+    Avec un scorer (ParallelScorer), les guesses sont répartis sur un pool de processus.
     """
     candidates = possible_words if limit == "possible_only" else all_words
     
+    if scorer is not None:
+        return scorer.best_guess(possible_words, candidates)
+    
+    # Avec numpy : même calcul d'entropie que le scorer parallèle (pattern_matrix.block_entropies),
+    # donc le même mot choisi avec ou sans scorer
+    if pattern_matrix.NUMPY_AVAILABLE:
+        return pattern_matrix.best_guess(possible_words, candidates)
+    
     best_word = None
     best_score = -1.0
     
@@ -214,9 +229,10 @@ def best_guess_entropy(possible_words, all_words, limit=None):
 # PARTIE 5 : INTÉGRATION LLM (SIMULATION)
 # ====================================
 
-def llm_suggest_word(csp: WordleCSP, possible_words, history):
+def llm_suggest_word(csp: WordleCSP, possible_words, history, scorer=None):
     """
     Simule l'intégration d'un LLM qui suggère un mot.
+    scorer : ParallelScorer optionnel pour le calcul d'entropie.
     
     Dans une vraie implémentation, on appellerait l'API OpenAI avec function calling.
     Ici, on simule juste la logique qu'un LLM pourrait suivre.
@@ -236,7 +252,7 @@ def llm_suggest_word(csp: WordleCSP, possible_words, history):
     
     # 2. Si beaucoup de mots, utiliser l'entropie
     if len(possible_words) > 10:
-        word, score = best_guess_entropy(possible_words, possible_words, limit="possible_only")
+        word, score = best_guess_entropy(possible_words, possible_words, limit="possible_only", scorer=scorer)
         return word, f"Maximisation de l'information (entropie={score:.2f})"
     
     # 3. Sinon, chercher un mot avec lettres communes non testées
@@ -264,9 +280,28 @@ def llm_suggest_word(csp: WordleCSP, possible_words, history):
 # PARTIE 6 : MODE INTERACTIF
 # ====================================
 
-def interactive_solver(words):
+def interactive_solver(words, workers=0):
     """
     Mode interactif où l'utilisateur entre les feedbacks.
+    workers > 0 : calcul d'entropie réparti sur ce nombre de processus (numpy requis).
+    """
+    scorer = None
+    if workers:
+        from parallel_scorer import NUMPY_AVAILABLE, ParallelScorer
+        if NUMPY_AVAILABLE:
+            scorer = ParallelScorer(words, workers)
+        else:
+            print("numpy absent : calcul séquentiel")
+    try:
+        solve_loop(words, scorer)
+    finally:
+        if scorer is not None:
+            scorer.close()
+
+
+def solve_loop(words, scorer=None):
+    """
+    Boucle de jeu (voir interactive_solver).
     """
     
     # Initialisation
@@ -316,7 +351,7 @@ def interactive_solver(words):
             reason = "Mot d'ouverture optimal"
         else:
             # Utiliser le LLM simulé
-            guess, reason = llm_suggest_word(csp, possible, history)
+            guess, reason = llm_suggest_word(csp, possible, history, scorer)
         
         print(f"\n💡 Proposition : {guess}")
         print(f"   Raison : {reason}")
@@ -366,7 +401,9 @@ def main():
     words = load_words("words.txt")
     print(f"✓ {len(words)} mots de 5 lettres chargés\n")
     
-    interactive_solver(words)
+    # python wordle_solver_csp_llm.py [processus] : calcul d'entropie parallèle
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    interactive_solver(words, workers)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,205 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict, fields
+from typing import List, Optional
+
+from ortools.sat.python import cp_model
+
+from main import TournamentScheduler
+from round_robin import count_breaks, double_round_robin
+from solver_stats import SolverLog
+from tuning import DEFAULT_HISTORY, RESULTS_DIR
+
+try:
+    import resource  # mesure du pic mémoire (Unix uniquement)
+except ImportError:
+    resource = None
+
+# Benchmark sans interface graphique du calendrier sportif.
+# Chaque configuration (nombre d'équipes, limite de breaks, workers, formulation, moteur, miroir)
+# est exécutée dans un processus neuf pour que le pic mémoire mesuré soit celui de la configuration.
+
+
+@dataclass
+class BenchRow:
+    n_teams: int
+    engine: str
+    formulation: str
+    mirrored: str
+    max_breaks: int
+    workers: int
+    symmetry_breaking: bool
+    bound_cut: bool
+    time_limit_s: float
+    variables: int
+    constraints: int
+    build_time_s: float
+    time_first_s: Optional[float]     # première solution réalisable
+    time_best_s: Optional[float]      # dernière solution améliorante
+    time_optimal_s: Optional[float]   # optimalité prouvée (None si non prouvée)
+    status: str
+    breaks: Optional[int]
+    bound: Optional[float]
+    peak_memory_mb: Optional[float]
+    presolved_variables: Optional[int] = None    # taille du modèle après presolve
+    presolved_constraints: Optional[int] = None
+    best_worker: Optional[str] = None            # sous-solveur ayant trouvé la meilleure solution
+
+
+def peak_memory_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)  # octets sous macOS, Ko sous Linux
+
+
+def run_config(n_teams: int, engine: str, formulation: str, mirrored: str, max_breaks: int,
+               workers: int, time_limit: float, symmetry_breaking: bool = False, bound_cut: bool = True) -> BenchRow:
+    scheduler = TournamentScheduler(n_teams)
+    variant = scheduler.mirror_variant(mirrored)
+
+    if engine == "constructive":
+        start = time.perf_counter()
+        schedule = double_round_robin(scheduler.n_teams, variant)
+        elapsed = time.perf_counter() - start
+        return BenchRow(scheduler.n_teams, engine, "-", variant or "-", max_breaks, 1, False, False, time_limit, 0, 0,
+                        round(elapsed, 6), round(elapsed, 6), round(elapsed, 6), round(elapsed, 6),
+                        "OPTIMAL", count_breaks(schedule), float(scheduler.min_breaks(variant)), peak_memory_mb())
+
+    start = time.perf_counter()
+    model, _ = scheduler.build_model(max_breaks, formulation=formulation, mirrored=variant,
+                                     symmetry_breaking=symmetry_breaking, bound_cut=bound_cut)
+    build_time = time.perf_counter() - start
+    proto = model.Proto()
+
+    solver = scheduler.create_solver(time_limit, workers)
+    log = SolverLog(solver)
+    status = solver.Solve(model)
+    report = log.report(solver, status)
+    found = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    last = report.solutions[-1] if report.solutions else None
+
+    return BenchRow(
+        n_teams=scheduler.n_teams,
+        engine=engine,
+        formulation=formulation,
+        mirrored=variant or "-",
+        max_breaks=max_breaks,
+        workers=workers,
+        symmetry_breaking=symmetry_breaking,
+        bound_cut=bound_cut,
+        time_limit_s=time_limit,
+        variables=len(proto.variables),
+        constraints=len(proto.constraints),
+        build_time_s=round(build_time, 4),
+        time_first_s=report.first_solution_s,
+        time_best_s=last[0] if last else None,
+        time_optimal_s=round(solver.WallTime(), 4) if status == cp_model.OPTIMAL else None,
+        status=solver.StatusName(status),
+        breaks=int(solver.ObjectiveValue()) if found else None,
+        bound=solver.BestObjectiveBound() if found else None,
+        peak_memory_mb=peak_memory_mb(),
+        presolved_variables=report.presolve.get("variables_after"),
+        presolved_constraints=report.presolve.get("constraints_after"),
+        best_worker=last[2] if last else None,
+    )
+
+
+def run_isolated(config: dict) -> BenchRow:
+    # Un processus neuf par configuration : le pic mémoire n'est pas pollué par les runs précédents
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        return pool.submit(run_config, **config).result()
+
+
+def make_folder(path: Optional[str]):
+    folder = os.path.dirname(path) if path else ""
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+
+
+def write_results(rows: List[BenchRow], csv_path: Optional[str]):
+    # CSV : les résultats du lancement en cours (réécrit à chaque configuration)
+    make_folder(csv_path)
+    if csv_path:
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=[field.name for field in fields(BenchRow)])
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(asdict(row))
+
+
+def append_history(row: BenchRow, history_path: Optional[str], run: str):
+    # Historique : une ligne JSON horodatée par mesure, ajoutée en fin de fichier ; les lancements
+    # successifs s'accumulent et tuning.py les relit tous (load_history)
+    if not history_path:
+        return
+    make_folder(history_path)
+    record = dict(asdict(row), run=run, recorded_at=time.strftime("%Y-%m-%d %H:%M:%S"))
+    with open(history_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def print_row(row: BenchRow):
+    def fmt(value, width, spec=""):
+        return "-".rjust(width) if value is None else format(value, f">{width}{spec}")
+
+    print(f"{row.n_teams:>3} {row.engine:>12} {row.formulation:>9} {row.mirrored:>8} {row.max_breaks:>3} {row.workers:>3} "
+          f"{'on' if row.symmetry_breaking else 'off':>4} {'on' if row.bound_cut else 'off':>4} "
+          f"{row.variables:>7} {row.constraints:>7} {row.build_time_s:>8.3f} {fmt(row.time_first_s, 8, '.2f')} "
+          f"{fmt(row.time_best_s, 8, '.2f')} {fmt(row.time_optimal_s, 8, '.2f')} {row.status:>10} "
+          f"{fmt(row.breaks, 6)} {fmt(row.peak_memory_mb, 8, '.1f')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du calendrier sportif (sans affichage graphique)")
+    parser.add_argument("--teams", type=int, nargs="+", default=[6, 8, 10, 12])
+    parser.add_argument("--max-breaks", type=int, nargs="+", default=[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--formulations", nargs="+", default=["match", "opponent"], choices=["match", "opponent"])
+    parser.add_argument("--engines", nargs="+", default=["cp-sat", "constructive"], choices=["cp-sat", "constructive"])
+    parser.add_argument("--mirrored", nargs="+", default=["none"], choices=["none", "mirror", "french", "english"])
+    parser.add_argument("--symmetry", nargs="+", default=["off", "on"], choices=["off", "on"],
+                        help="brisure de symétrie (numérotation canonique des équipes)")
+    parser.add_argument("--bound-cut", nargs="+", default=["on"], choices=["off", "on"],
+                        help="borne inférieure des breaks ajoutée au modèle (arrêt dès qu'elle est atteinte)")
+    parser.add_argument("--time-limit", type=float, default=30.0, help="limite de temps par résolution (s)")
+    parser.add_argument("--csv", default=os.path.join(RESULTS_DIR, "benchmark.csv"))
+    parser.add_argument("--json", default=DEFAULT_HISTORY,
+                        help="historique JSON lines, complété à chaque lancement (lu par tuning.py)")
+    args = parser.parse_args()
+
+    configs = []
+    for n, max_breaks, mirrored, engine in itertools.product(args.teams, args.max_breaks, args.mirrored, args.engines):
+        mirrored = None if mirrored == "none" else mirrored
+        if engine == "constructive":
+            configs.append(dict(n_teams=n, engine=engine, formulation="-", mirrored=mirrored,
+                                max_breaks=max_breaks, workers=1, time_limit=args.time_limit))
+            continue
+        for formulation, workers, symmetry, cut in itertools.product(args.formulations, args.workers,
+                                                                     args.symmetry, args.bound_cut):
+            configs.append(dict(n_teams=n, engine=engine, formulation=formulation, mirrored=mirrored,
+                                max_breaks=max_breaks, workers=workers, time_limit=args.time_limit,
+                                symmetry_breaking=symmetry == "on", bound_cut=cut == "on"))
+
+    print(f"{'n':>3} {'engine':>12} {'form.':>9} {'mirror':>8} {'mb':>3} {'w':>3} {'sym':>4} {'cut':>4} {'vars':>7} {'constr':>7} "
+          f"{'build':>8} {'first':>8} {'best':>8} {'optimal':>8} {'status':>10} {'breaks':>6} {'mem(MB)':>8}")
+
+    run = time.strftime("%Y-%m-%dT%H:%M:%S")
+    rows = []
+    for config in configs:
+        rows.append(run_isolated(config))
+        print_row(rows[-1])
+        write_results(rows, args.csv)  # résultats partiels écrits au fil de l'eau
+        append_history(rows[-1], args.json, run)
+
+    print(f"\nRésultats écrits dans {args.csv}, ajoutés à l'historique {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import argparse
+import csv
+import time
+from dataclasses import dataclass, asdict
+
+from ortools.sat.python import cp_model
+
+from main import TournamentScheduler
+
+# Comparaison des deux formulations CP-SAT du calendrier :
+#   - "match"    : un booléen par (i, j, journée)          -> n(n-1)(2n-2) variables
+#   - "opponent" : un adversaire entier + un booléen domicile -> 2n(2n-2) variables (+ liens AddElement)
+# On mesure la taille du modèle, le temps de construction et le temps de résolution.
+
+
+@dataclass
+class ComparisonRow:
+    n_teams: int
+    formulation: str
+    variables: int
+    constraints: int
+    build_time_s: float
+    solve_time_s: float
+    status: str
+    breaks: float
+    bound: float
+
+
+def compare(n_teams: int, formulation: str, time_limit: float = None, workers: int = None,
+            mirrored=False) -> ComparisonRow:
+    # time_limit / workers à None : réglages de tuning.py pour cette taille (comme solve_tournament)
+    scheduler = TournamentScheduler(n_teams)
+
+    start = time.perf_counter()
+    model, _ = scheduler.build_model(max_breaks=1, formulation=formulation, mirrored=mirrored)
+    build_time = time.perf_counter() - start
+
+    proto = model.Proto()
+
+    solver = scheduler.create_solver(time_limit, workers)
+
+    start = time.perf_counter()
+    status = solver.Solve(model)
+    solve_time = time.perf_counter() - start
+
+    found = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    return ComparisonRow(
+        n_teams=scheduler.n_teams,
+        formulation=formulation,
+        variables=len(proto.variables),
+        constraints=len(proto.constraints),
+        build_time_s=round(build_time, 4),
+        solve_time_s=round(solve_time, 4),
+        status=solver.StatusName(status),
+        breaks=solver.ObjectiveValue() if found else float("nan"),
+        bound=solver.BestObjectiveBound() if found else float("nan"),
+    )
+
+
+def print_header():
+    print(f"{'n':>3} {'formulation':>11} {'vars':>8} {'constr':>8} {'build(s)':>9} {'solve(s)':>9} {'status':>10} {'breaks':>7} {'bound':>6}")
+
+
+def print_row(row: ComparisonRow):
+    print(f"{row.n_teams:>3} {row.formulation:>11} {row.variables:>8} {row.constraints:>8} "
+          f"{row.build_time_s:>9.3f} {row.solve_time_s:>9.2f} {row.status:>10} {row.breaks:>7.0f} {row.bound:>6.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare les formulations CP-SAT match / opponent")
+    parser.add_argument("--min-teams", type=int, default=8)
+    parser.add_argument("--max-teams", type=int, default=30)
+    parser.add_argument("--time-limit", type=float, default=None,
+                        help="limite de temps par résolution (s) ; par défaut, celle de tuning.py")
+    parser.add_argument("--workers", type=int, default=None, help="par défaut, ceux de tuning.py")
+    parser.add_argument("--mirrored", default=None, choices=["mirror", "french", "english"],
+                        help="ne modélise que la phase aller (phase retour miroir)")
+    parser.add_argument("--csv", default=None, help="fichier CSV de sortie (optionnel)")
+    args = parser.parse_args()
+
+    print_header()
+    rows = []
+    for n in range(args.min_teams, args.max_teams + 1, 2):
+        for formulation in ("match", "opponent"):
+            rows.append(compare(n, formulation, args.time_limit, args.workers, args.mirrored))
+            print_row(rows[-1])
+
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(asdict(rows[0]).keys()))
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(asdict(row))
+        print(f"\nRésultats écrits dans {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
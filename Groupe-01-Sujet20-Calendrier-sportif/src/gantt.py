@@ -0,0 +1,106 @@
+import html
+import os
+from typing import List
+
+from matplotlib.colors import ListedColormap
+from matplotlib.figure import Figure
+import matplotlib.patches as mpatches
+
+from schedule_matrix import ScheduleMatrix
+
+# Diagramme de Gantt du calendrier, rendu en une seule image (équipes x journées) au lieu de deux barres
+# et deux textes par match : le temps de rendu ne dépend presque plus du nombre d'équipes.
+# L'export (PNG, SVG, PDF, HTML) se fait sans affichage (pas de plt.show), utilisable sur un serveur.
+
+HOME_COLOR = "green"
+AWAY_COLOR = "red"
+ALPHA = 0.7
+LABEL_MAX_TEAMS = 12  # au-delà, les noms des adversaires ne sont pas écrits par défaut (illisibles et coûteux)
+
+
+def draw_gantt(fig: Figure, matrix: ScheduleMatrix, teams: List[str], labels: bool = None):
+    n_rounds, n_teams = matrix.n_rounds, matrix.n_teams
+    if labels is None:
+        labels = n_teams <= LABEL_MAX_TEAMS
+
+    ax = fig.add_subplot()
+
+    # Une seule image : case (équipe, journée) verte à domicile, rouge à l'extérieur
+    ax.imshow(matrix.home.T, cmap=ListedColormap([AWAY_COLOR, HOME_COLOR]), vmin=0, vmax=1, alpha=ALPHA,
+              aspect="auto", interpolation="nearest", origin="lower", extent=(0, n_rounds, -0.5, n_teams - 0.5))
+    ax.hlines([t + 0.5 for t in range(n_teams - 1)], 0, n_rounds, colors="white", linewidth=1)  # une seule collection
+
+    if labels:
+        for r in range(n_rounds):
+            for t in range(n_teams):
+                ax.text(r + 0.5, t, teams[matrix.opponent[r, t]], ha="center", va="center",
+                        fontsize=8, color="white", fontweight="bold")
+
+    # Configuration des axes
+    ax.set_yticks(range(n_teams))
+    ax.set_yticklabels(teams, fontsize=min(10, 400 / n_teams))
+    ax.set_ylabel("Équipes", fontsize=15, fontweight="bold")
+
+    ax.set_xlabel("Journées", fontsize=15, fontweight="bold")
+    ax.set_xlim(0, n_rounds)
+    ax.set_xticks([r + 0.5 for r in range(n_rounds)])
+    ax.set_xticklabels([f"J{r + 1}" for r in range(n_rounds)], rotation=45, ha="right", fontsize=min(10, 600 / n_rounds))
+
+    # Légende
+    home_patch = mpatches.Patch(color=HOME_COLOR, alpha=ALPHA, label="Domicile")
+    away_patch = mpatches.Patch(color=AWAY_COLOR, alpha=ALPHA, label="Extérieur")
+    ax.legend(handles=[home_patch, away_patch], loc="upper right")
+
+    ax.set_title(f"CALENDRIER DU CHAMPIONNAT - {n_teams} ÉQUIPES", fontsize=16, fontweight="bold", pad=20)
+    fig.tight_layout()
+    return ax
+
+
+def export_gantt(matrix: ScheduleMatrix, teams: List[str], path: str, labels: bool = None, figsize=(14, 10)) -> str:
+    # Format déduit de l'extension : .png, .svg, .pdf (matplotlib, sans fenêtre) ou .html (tableau coloré)
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+
+    if path.lower().endswith(".html"):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(gantt_html(matrix, teams, labels))
+        return path
+
+    fig = Figure(figsize=figsize)  # figure hors pyplot : aucune interface graphique n'est créée
+    draw_gantt(fig, matrix, teams, labels)
+    fig.savefig(path, dpi=100)
+    return path
+
+
+def gantt_html(matrix: ScheduleMatrix, teams: List[str], labels: bool = None) -> str:
+    # Page HTML autonome : une ligne par équipe, une cellule par journée ; l'adversaire s'affiche au survol
+    # (et dans la cellule si labels est vrai)
+    n_rounds, n_teams = matrix.n_rounds, matrix.n_teams
+    if labels is None:
+        labels = n_teams <= LABEL_MAX_TEAMS
+    names = [html.escape(team) for team in teams]
+
+    rows = []
+    for t in range(n_teams):
+        cells = []
+        for r in range(n_rounds):
+            opponent = names[matrix.opponent[r, t]]
+            at_home = matrix.home[r, t]
+            title = f"J{r + 1} : {names[t]} - {opponent}" if at_home else f"J{r + 1} : {opponent} - {names[t]}"
+            cells.append(f'<td class="{"d" if at_home else "e"}" title="{title}">{opponent if labels else ""}</td>')
+        rows.append(f"<tr><th>{names[t]}</th>{''.join(cells)}</tr>")
+
+    header = "".join(f"<th>J{r + 1}</th>" for r in range(n_rounds))
+    return (
+        "<!DOCTYPE html>\n<html lang=\"fr\"><head><meta charset=\"utf-8\">"
+        f"<title>Calendrier - {n_teams} équipes</title><style>"
+        "table{border-collapse:collapse;font:11px sans-serif}th,td{border:1px solid #fff;padding:2px 4px;white-space:nowrap}"
+        f"td{{color:#fff;font-weight:bold;min-width:12px;height:16px}}td.d{{background:{HOME_COLOR};opacity:{ALPHA}}}"
+        f"td.e{{background:{AWAY_COLOR};opacity:{ALPHA}}}th{{text-align:right}}"
+        "</style></head><body>"
+        f"<h2>CALENDRIER DU CHAMPIONNAT - {n_teams} ÉQUIPES</h2>"
+        f"<p><span style=\"color:{HOME_COLOR}\">&#9632;</span> Domicile "
+        f"<span style=\"color:{AWAY_COLOR}\">&#9632;</span> Extérieur</p>"
+        f"<table><tr><th></th>{header}</tr>\n" + "\n".join(rows) + "\n</table></body></html>\n"
+    )
@@ -0,0 +1,221 @@
+import argparse
+import random
+import time
+from typing import List, Dict, Tuple
+
+from ortools.sat.python import cp_model
+
+from round_robin import count_breaks, double_round_robin
+from travel import distance_matrix, team_locations, travel_distance
+
+# Recherche à voisinage large (LNS) pour les grands championnats (30 équipes et plus), objectif : distance parcourue.
+# À chaque itération on libère une partie du calendrier courant et on la ré-optimise avec un petit modèle CP-SAT :
+#   - "rounds" : les matchs d'une fenêtre de journées consécutives sont réaffectés aux journées de la fenêtre
+#   - "teams"  : les matchs entre un groupe d'équipes voisines sont réaffectés aux journées où ces équipes se rencontraient
+# Les matchs gardent leur lieu : le calendrier reste un aller-retour valide et équilibré domicile/extérieur,
+# seuls l'ordre des matchs (donc les trajets) et les breaks changent (limite totale de breaks respectée).
+
+Schedule = Dict[int, List[Tuple[int, int]]]
+
+
+class TravelLNS:
+
+    def __init__(self, scheduler, distances=None, break_limit: int = None, window: int = 4, team_subset: int = 6,
+                 sub_time_limit: float = 1.0, workers: int = None, seed: int = 0):
+        self.scheduler = scheduler
+        self.n_teams = scheduler.n_teams
+        if distances is None:
+            distances = distance_matrix(scheduler.teams)  # matrice calculée une seule fois
+        # Listes d'entiers (km) pour CP-SAT, quelle que soit la matrice fournie (listes, tableau numpy)
+        self.distances = [[int(round(d)) for d in row] for row in distances]
+        self.break_limit = break_limit  # None : pas de limite sur les breaks
+        self.window = min(window, scheduler.total_rounds)
+        self.team_subset = min(team_subset, self.n_teams)
+        self.sub_time_limit = sub_time_limit
+        self.workers = workers  # None : workers de tuning.py (create_solver)
+        self.rng = random.Random(seed)
+
+    def run(self, schedule: Schedule = None, time_budget: float = 60.0, on_progress=None):
+        # Algorithme anytime : renvoie le meilleur calendrier trouvé à l'échéance et l'historique
+        # [(temps écoulé, distance, breaks), ...] ; on_progress(event) est appelé à chaque amélioration
+        start = time.perf_counter()
+        deadline = start + time_budget
+
+        best = schedule or double_round_robin(self.n_teams)
+        if self.break_limit is not None and count_breaks(best) > self.break_limit:
+            raise ValueError("Le calendrier de départ dépasse la limite de breaks")
+
+        best_travel = travel_distance(best, self.distances)
+        history = [(0.0, best_travel, count_breaks(best))]
+        iterations = 0
+
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0.05:
+                break
+
+            kind = "rounds" if iterations % 2 == 0 else "teams"
+            free = self.free_rounds(best) if kind == "rounds" else self.free_teams(best)
+            candidate = self.solve_neighbourhood(best, free, min(self.sub_time_limit, remaining))
+            iterations += 1
+
+            if not candidate:
+                continue
+            travel = travel_distance(candidate, self.distances)
+            if travel > best_travel:
+                continue
+
+            improved = travel < best_travel
+            best, best_travel = candidate, travel  # à égalité on accepte aussi : on se déplace sur le plateau
+            if improved:
+                elapsed = time.perf_counter() - start
+                history.append((round(elapsed, 3), travel, count_breaks(best)))
+                if on_progress:
+                    on_progress({"schedule": best, "travel": travel, "breaks": history[-1][2],
+                                 "elapsed": elapsed, "iterations": iterations, "neighbourhood": kind})
+
+        return best, history
+
+    def free_rounds(self, schedule: Schedule):
+        # Voisinage "journées" : tous les matchs d'une fenêtre de journées consécutives
+        first = self.rng.randrange(0, len(schedule) - self.window + 1)
+        return [(h, a, r) for r in range(first, first + self.window) for h, a in schedule[r]]
+
+    def free_teams(self, schedule: Schedule):
+        # Voisinage "équipes" : une équipe tirée au hasard et ses plus proches voisines (ce sont leurs
+        # déplacements qu'on peut enchaîner), on libère les matchs qu'elles jouent entre elles
+        pivot = self.rng.randrange(self.n_teams)
+        group = set(sorted(range(self.n_teams), key=lambda t: self.distances[pivot][t])[:self.team_subset])
+        return [(h, a, r) for r, matches in schedule.items() for h, a in matches if h in group and a in group]
+
+    def solve_neighbourhood(self, schedule: Schedule, free, time_limit: float) -> Schedule:
+        n = self.n_teams
+        dist = self.distances
+        free_set = set(free)
+        rounds = sorted(schedule.keys())
+        model = cp_model.CpModel()
+
+        # Journées où chaque équipe a un match libre
+        slots = {t: set() for t in range(n)}
+        for h, a, r in free:
+            slots[h].add(r)
+            slots[a].add(r)
+
+        # y[(h, a, r)] = 1 si le match libre (h, a) est joué à la journée r
+        y = {}
+        for h, a, _ in free:
+            for r in slots[h] & slots[a]:
+                y[(h, a, r)] = model.NewBoolVar(f"y_{h}_{a}_{r}")
+        for h, a, _ in free:
+            model.AddExactlyOne(y[(h, a, r)] for r in slots[h] & slots[a])
+
+        # Pour chaque équipe : un match par journée libre, lieu (ville de l'équipe qui reçoit) et domicile
+        playing = {}
+        for (h, a, r), var in y.items():
+            playing.setdefault((h, r), []).append((var, h, 1))
+            playing.setdefault((a, r), []).append((var, h, 0))
+
+        locations = team_locations(schedule, n)
+        location, home = {}, {}
+        for t in range(n):
+            for r in slots[t]:
+                options = playing[(t, r)]
+                model.AddExactlyOne(var for var, _, _ in options)
+                cities = sorted({city for _, city, _ in options})
+                location[(t, r)] = model.NewIntVarFromDomain(cp_model.Domain.FromValues(cities), f"loc_{t}_{r}")
+                model.Add(location[(t, r)] == sum(var * city for var, city, _ in options))
+                model.AddHint(location[(t, r)], locations[t][r])
+                home[(t, r)] = sum(var for var, _, at_home in options if at_home)
+
+        def loc(t, r):
+            return location[(t, r)] if (t, r) in location else locations[t][r]
+
+        def at_home(t, r):
+            return home[(t, r)] if (t, r) in home else int(locations[t][r] == t)
+
+        # Breaks et distance sur chaque transition touchée par une journée libre
+        fixed_breaks = count_breaks(schedule)
+        break_vars, legs = [], []
+        flat = [dist[p][q] for p in range(n) for q in range(n)]
+        longest = max(flat)
+        for t in range(n):
+            for r in rounds[:-1]:
+                if (t, r) not in location and (t, r + 1) not in location:
+                    continue
+                fixed_breaks -= int((locations[t][r] == t) == (locations[t][r + 1] == t))
+                b = model.NewBoolVar(f"break_{t}_{r}")
+                model.Add(b >= at_home(t, r) + at_home(t, r + 1) - 1)
+                model.Add(b >= 1 - at_home(t, r) - at_home(t, r + 1))
+                model.AddHint(b, int((locations[t][r] == t) == (locations[t][r + 1] == t)))
+                break_vars.append(b)
+
+            path = [t] + [loc(t, r) for r in rounds] + [t]  # départ et retour à domicile
+            current = [t] + locations[t] + [t]
+            for k, (p, q) in enumerate(zip(path, path[1:])):
+                if isinstance(p, int) and isinstance(q, int):
+                    continue  # trajet figé : constante de l'objectif
+                leg = model.NewIntVar(0, longest, "")
+                model.AddHint(leg, dist[current[k]][current[k + 1]])
+                if isinstance(q, int):
+                    model.AddElement(p, [dist[c][q] for c in range(n)], leg)
+                elif isinstance(p, int):
+                    model.AddElement(q, dist[p], leg)
+                else:
+                    index = model.NewIntVar(0, n * n - 1, "")
+                    model.Add(index == n * p + q)
+                    model.AddHint(index, n * current[k] + current[k + 1])
+                    model.AddElement(index, flat, leg)
+                legs.append(leg)
+
+        if self.break_limit is not None:
+            model.Add(fixed_breaks + sum(break_vars) <= self.break_limit)
+
+        model.Minimize(sum(legs))
+
+        # Solution de départ complète : le calendrier courant (matchs, lieux, breaks et trajets)
+        for key, var in y.items():
+            model.AddHint(var, int(key in free_set))
+
+        solver = self.scheduler.create_solver(time_limit, self.workers)
+        solver.parameters.random_seed = self.rng.randrange(2 ** 31)
+        status = solver.Solve(model)
+        if status != cp_model.OPTIMAL and status != cp_model.FEASIBLE:
+            return {}
+
+        result = {r: [(h, a) for h, a in schedule[r] if (h, a, r) not in free_set] for r in rounds}
+        for (h, a, r), var in y.items():
+            if solver.Value(var):
+                result[r].append((h, a))
+        return result
+
+
+def main():
+    from main import TournamentScheduler
+
+    parser = argparse.ArgumentParser(description="Réduction des déplacements par recherche à voisinage large (LNS)")
+    parser.add_argument("--teams", type=int, default=30)
+    parser.add_argument("--time-budget", type=float, default=60.0, help="budget total en secondes")
+    parser.add_argument("--max-breaks", type=int, default=None,
+                        help="limite max_breaks du modèle (n-2 breaks avec 1) ; sans limite par défaut")
+    parser.add_argument("--window", type=int, default=4, help="taille de la fenêtre de journées libérée")
+    parser.add_argument("--team-subset", type=int, default=6, help="nombre d'équipes voisines libérées")
+    parser.add_argument("--sub-time-limit", type=float, default=1.0, help="limite de temps d'un sous-problème (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    scheduler = TournamentScheduler(args.teams)
+    start = double_round_robin(scheduler.n_teams)
+    print(f"Calendrier de départ : {travel_distance(start, distance_matrix(scheduler.teams))} km, {count_breaks(start)} breaks")
+
+    def report(event):
+        print(f"{event['elapsed']:7.1f}s  {event['travel']:>8} km  {event['breaks']:>4} breaks  "
+              f"(itération {event['iterations']}, voisinage {event['neighbourhood']})")
+
+    schedule, history = scheduler.optimize_travel(start, args.time_budget, args.max_breaks, args.window,
+                                                  args.team_subset, args.sub_time_limit, args.seed, report)
+    print(f"\nMeilleur calendrier : {history[-1][1]} km, {count_breaks(schedule)} breaks "
+          f"({100 * (1 - history[-1][1] / history[0][1]):.1f} % de distance en moins)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,21 @@
+import os
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import asdict
 from typing import List, Dict, Tuple
 from ortools.sat.python import cp_model  # Solveur Or tools
 import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
+
+from round_robin import MIRROR_VARIANTS, canonical_form, count_breaks, double_round_robin, mirror_order, mirror_schedule
+from lns import TravelLNS
+from schedule_matrix import ScheduleMatrix
+from schedule_cache import ScheduleCache
+from solver_stats import SolverLog
+from tuning import DEFAULT_HISTORY, load_history, tune
+from gantt import draw_gantt, export_gantt
 
 
 class TournamentScheduler:
@@ -16,13 +30,23 @@ class TournamentScheduler:
         self.rounds = n_teams - 1
         self.total_rounds = self.rounds * 2  # définiation du nombre de jours du tournoi
 
+        self.history_path = DEFAULT_HISTORY  # historique du benchmark utilisé pour régler le solveur
+        self.settings = None  # réglages du solveur, calculés au premier besoin (voir solver_settings)
+        self.last_report = None  # statistiques de la dernière résolution CP-SAT (SolveReport)
+
     def create_teams(self) -> List[str]:
 
         cities = ["Paris", "Lyon", "Marseille", "Lille", "Bordeaux", "Toulouse",
-                  "Nice", "Nantes", "Strasbourg", "Montpellier", "Rennes", "Reims"] # nombre total de team (1 à 12)
+                  "Nice", "Nantes", "Strasbourg", "Montpellier", "Rennes", "Reims",
+                  "Le Havre", "Saint-Étienne", "Toulon", "Grenoble", "Dijon", "Angers",
+                  "Nîmes", "Villeurbanne", "Clermont-Ferrand", "Le Mans", "Aix-en-Provence", "Brest",
+                  "Tours", "Amiens", "Limoges", "Annecy", "Perpignan", "Metz",
+                  "Besançon", "Orléans", "Rouen", "Mulhouse", "Caen", "Nancy",
+                  "Avignon", "Poitiers", "Pau", "Lorient"] # nombre total de villes (1 à 40)
 
         selected_cities = cities[:self.n_teams]
-        return [f"{city}" for city in selected_cities] # Prendre le nombre nécessaire de villes
+        extra_teams = [f"Équipe {i + 1}" for i in range(len(selected_cities), self.n_teams)] # au-delà de 40, noms génériques
+        return [f"{city}" for city in selected_cities] + extra_teams # Prendre le nombre nécessaire de villes
 
     def print_teams(self):
         print("\n" + "=" * 40)
@@ -33,46 +57,295 @@ class TournamentScheduler:
             print(f"Équipe {i}: {team}")
         print()
 
-    def solve_tournament(self, max_breaks: int = 1) -> Dict[int, List[Tuple[int, int]]]:
+    def mirror_variant(self, mirrored):
+        # mirrored=True équivaut au miroir classique ; False/None : phase retour libre
+        if mirrored is True:
+            return "mirror"
+        if not mirrored:
+            return None
+        if mirrored not in MIRROR_VARIANTS:
+            raise ValueError(f"Variante miroir inconnue : {mirrored}")
+        return mirrored
+
+    def min_breaks(self, mirrored=None):
+        # Borne inférieure théorique du nombre de breaks selon le mode miroir
+        variant = self.mirror_variant(mirrored)
+        if variant == "mirror":
+            return 3 * self.n_teams - 6  # de Werra : la jonction coûte un break aux équipes qui en ont un à l'aller
+        if variant == "english":
+            return 2 * self.n_teams - 4  # chaque phase est un round-robin simple (n-2 breaks chacune), jonction sans break
+        if variant == "french":
+            return 2 * self.n_teams  # optimum prouvé par CP-SAT jusqu'à n=8, atteint par la construction directe
+        return self.n_teams - 2
+
+    def max_total_breaks(self, max_breaks: int = 1, mirrored=None):
+        # Limite imposée au solveur : n-2 avec max_breaks=1, décalée de la borne du mode miroir
+        return (max_breaks * self.n_teams) - 2 + self.min_breaks(mirrored) - (self.n_teams - 2)
+
+    def solve_tournament(self, max_breaks: int = 1, constraints=None, engine: str = "auto", formulation: str = None,
+                         mirrored=False, on_solution=None, as_matrix: bool = False, symmetry_breaking: bool = None,
+                         cache: ScheduleCache = None, cache_hint_only: bool = False):
+
+        # formulation / symmetry_breaking : par défaut, les réglages déduits de l'historique du benchmark (solver_settings)
+
+        # cache : calendrier relu sur disque si la même configuration a déjà été résolue par CP-SAT
+        # (cache_hint_only=True : il ne sert que de solution de départ, le solveur est relancé)
+        # as_matrix=True : le calendrier est renvoyé sous forme de ScheduleMatrix (matrices journées x équipes)
+        # on_solution(event) est appelé à chaque calendrier améliorant, avec event = {"schedule", "breaks", "bound", "elapsed"} ;
+        # s'il renvoie True, la recherche s'arrête et le dernier calendrier est retourné
+
+        constraints = list(constraints or [])
+        variant = self.mirror_variant(mirrored)
+
+        if engine not in ("auto", "constructive", "cp-sat"):
+            raise ValueError(f"Moteur inconnu : {engine}")
+
+        # Sans contrainte supplémentaire, la construction directe (méthode du cercle) atteint déjà la borne
+        # théorique en quelques millisecondes : CP-SAT n'est utile que pour les contraintes métier
+        if engine == "auto":
+            reaches_bound = self.max_total_breaks(max_breaks, variant) >= self.min_breaks(variant)
+            engine = "constructive" if not constraints and reaches_bound else "cp-sat"
+
+        if engine == "constructive":
+            if constraints:
+                raise ValueError("La construction directe ne gère pas les contraintes supplémentaires")
+            start = time.perf_counter()
+            schedule = double_round_robin(self.n_teams, variant)
+            print("\nSolution trouvée (construction directe)")
+            if on_solution:
+                breaks = self.min_breaks(variant)
+                on_solution({"schedule": schedule, "breaks": breaks, "bound": float(breaks),
+                             "elapsed": time.perf_counter() - start})
+            return ScheduleMatrix.from_schedule(schedule, self.n_teams) if as_matrix else schedule
+
+        settings = self.solver_settings()
+        formulation = formulation or settings.formulation
+        if symmetry_breaking is None:
+            symmetry_breaking = settings.symmetry_breaking and not constraints  # seulement si les équipes sont interchangeables
+
+        config = ScheduleCache.config(self.n_teams, max_breaks, constraints, engine, formulation, variant,
+                                      symmetry_breaking) if cache else None
+        cached = cache.get(config) if cache else None
+        if cached and not cache_hint_only:
+            schedule, stats = cached
+            print(f"\nSolution trouvée (cache, {stats['status']})")
+            if on_solution:
+                on_solution({"schedule": schedule, "breaks": int(stats["objective"]), "bound": stats["best_bound"],
+                             "elapsed": 0.0})
+            return ScheduleMatrix.from_schedule(schedule, self.n_teams) if as_matrix else schedule
+
+        model, variables = self.build_model(max_breaks, constraints, formulation, variant,
+                                            symmetry_breaking=symmetry_breaking)
+        if cached:
+            self.add_schedule_hint(model, variables, cached[0])
 
-        model = cp_model.CpModel()
+        #Résolution par le solveur
+        solver = self.create_solver()
+        log = SolverLog(solver)
+        status = solver.Solve(model, SolutionStream(self, variables, on_solution) if on_solution else None)
+        self.last_report = log.report(solver, status)
+
+        if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:  # Retourner la solution si le solveur trouve une solution optimal ou simplement faisable
+            print("\nSolution trouvée")
+            if as_matrix:
+                schedule = self.extract_matrix(solver, variables)
+            else:
+                schedule = self.extract_schedule(solver, variables)
+            if cache and status == cp_model.OPTIMAL:
+                # Seul un optimum prouvé ne dépend pas de la limite de temps : une solution FEASIBLE n'est pas mise en cache
+                cache.put(config, schedule.to_schedule() if as_matrix else schedule, self.solver_stats(self.last_report))
+            return schedule
+        else:
+            print("Aucune solution trouvée")
+            return None if as_matrix else {}
+
+    def iter_solutions(self, max_breaks: int = 1, constraints=None, formulation: str = "match", mirrored=False,
+                       time_limit: float = None, symmetry_breaking: bool = False):
+
+        # Générateur : chaque calendrier améliorant est renvoyé dès que CP-SAT le trouve (la recherche tourne dans un thread).
+        # Sortir de la boucle arrête la recherche, par exemple dès que event["breaks"] == self.min_breaks()
+        model, variables = self.build_model(max_breaks, constraints, formulation, mirrored,
+                                            symmetry_breaking=symmetry_breaking)
+        solver = self.create_solver(time_limit)
+        log = SolverLog(solver)
+        events = queue.Queue()
+        stream = SolutionStream(self, variables, events.put)
+
+        def search():
+            try:
+                status = solver.Solve(model, stream)
+                self.last_report = log.report(solver, status)
+            finally:
+                events.put(None)  # fin de la recherche
+
+        thread = threading.Thread(target=search, daemon=True)
+        thread.start()
+        try:
+            while True:
+                event = events.get()
+                if event is None:
+                    return
+                yield event
+        finally:
+            solver.StopSearch()
+            thread.join()
+
+    def solver_stats(self, report) -> dict:
+        # Statistiques de résolution conservées avec un calendrier (cache), sans l'historique détaillé
+        stats = {key: value for key, value in asdict(report).items() if key not in ("solutions", "bounds")}
+        stats["engine"] = "cp-sat"
+        stats["solved_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+        return stats
+
+    def solver_settings(self):
+        # Nombre de workers, limite de temps et options de recherche selon la taille du championnat (tuning.py)
+        if self.settings is None:
+            self.settings = tune(self.n_teams, load_history(self.history_path))
+        return self.settings
+
+    def create_solver(self, time_limit: float = None, workers: int = None):
+        # Seul point de création des solveurs : sans valeur explicite, les réglages de solver_settings s'appliquent
+        settings = self.solver_settings()
         solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = time_limit if time_limit is not None else settings.time_limit
+        solver.parameters.num_search_workers = workers or settings.workers
+        return solver
+
+    def build_model(self, max_breaks: int = 1, constraints=None, formulation: str = "match", mirrored=False,
+                    break_limit: int = None, symmetry_breaking: bool = False, bound_cut: bool = True):
+        # Construit le modèle CP-SAT sans le résoudre (utilisé aussi par compare_formulations.py)
+        # symmetry_breaking : numérotation canonique des équipes (voir add_symmetry_breaking)
+        # bound_cut : la borne inférieure théorique des breaks est ajoutée au modèle
+        if formulation not in ("match", "opponent"):
+            raise ValueError(f"Formulation inconnue : {formulation}")
+
+        variant = self.mirror_variant(mirrored)
+
+        # En mode miroir, seule la phase aller est modélisée (chaque paire s'y rencontre une fois)
+        n_rounds = self.rounds if variant else self.total_rounds
+        meetings = 1 if variant else 2
+
+        model = cp_model.CpModel()
+
+        if formulation == "match":
+            variables = self.build_match_variables(model, n_rounds, meetings)
+        else:
+            variables = self.build_opponent_variables(model, n_rounds, meetings)
+
+        variables["mirror"] = variant
+        variables["n_rounds"] = n_rounds
+
+        # Lieu de chaque équipe sur toute la saison : la phase retour miroir est l'inverse d'une journée aller
+        is_home = dict(variables["is_home"])
+        if variant:
+            for i in range(self.n_teams):
+                for k, source in enumerate(mirror_order(n_rounds, variant)):
+                    is_home[(i, n_rounds + k)] = 1 - variables["is_home"][(i, source)]
+
+        # Variables de break
+        break_vars = {}
+        for i in range(self.n_teams):
+            for r in range(self.total_rounds - 1):
+                break_vars[(i, r)] = model.NewBoolVar(f"break_{i}_{r}")
+
+            # Équilibre domicile / extérieur (automatique en mode miroir)
+        if not variant:
+            for i in range(self.n_teams):
+                model.Add(
+                    sum(is_home[(i, r)] for r in range(self.total_rounds))
+                    == self.rounds
+                )
+
+            # Détection correcte des breaks
+        for i in range(self.n_teams):
+            for r in range(self.total_rounds - 1):
+
+                model.Add(
+                    break_vars[(i, r)] >=
+                    is_home[(i, r)] + is_home[(i, r + 1)] - 1
+                )
+
+                model.Add(
+                    break_vars[(i, r)] >=
+                    (1 - is_home[(i, r)]) + (1 - is_home[(i, r + 1)]) - 1
+                )
+
+        # Contraintes métier supplémentaires (indisponibilité de stade, matchs imposés, ...)
+        self.apply_constraints(model, variables, constraints or [])
+
+        # Limiter le nombre total de breaks
+        total_breaks = sum(break_vars.values())
+        if break_limit is None:
+            break_limit = self.max_total_breaks(max_breaks, variant)
+        model.Add(total_breaks <= break_limit) # Appliquer comme contarinte la limite théorque du nombre de break (n-2 break hors miroir)
+
+        # Borne inférieure prouvée (n-2, 3n-6 en miroir, 2n-4 en anglais) : dès qu'un calendrier l'atteint, CP-SAT
+        # conclut à l'optimalité et s'arrête au lieu de chercher à la prouver. La borne "french" n'est pas démontrée.
+        if bound_cut and variant != "french":
+            model.Add(total_breaks >= self.min_breaks(variant))
+
+        if symmetry_breaking:
+            if constraints:
+                raise ValueError("La brisure de symétrie suppose des équipes interchangeables (aucune contrainte métier)")
+            self.add_symmetry_breaking(model, variables)
+
+        # Objectif : minimiser les breaks
+        model.Minimize(total_breaks)
+
+        variables["break_vars"] = break_vars
+        variables["total_breaks"] = total_breaks
+        return model, variables
+
+    def add_symmetry_breaking(self, model, variables):
+        # Sans contrainte métier, renuméroter les équipes donne un calendrier équivalent : on n'explore
+        # qu'une numérotation par calendrier.
+        #   1) journée 1 : l'équipe 2k reçoit l'équipe 2k+1
+        #   2) les matchs de la journée 1 sont rangés par première journée de réception (après la J1) de l'équipe 2k
+        n_rounds = variables["n_rounds"]
+        first_home = []
+        for k in range(self.n_teams // 2):
+            model.Add(self.match_literal(model, variables, 2 * k, 2 * k + 1, 0) == 1)
+
+            first = model.NewIntVar(1, n_rounds, f"first_home_{2 * k}")
+            model.AddMinEquality(first, [r + n_rounds * (1 - variables["is_home"][(2 * k, r)]) for r in range(1, n_rounds)]
+                                 + [n_rounds])  # n_rounds : ne reçoit plus (phase aller miroir)
+            first_home.append(first)
+
+        for previous, current in zip(first_home, first_home[1:]):
+            model.Add(previous <= current)
+
+    def build_match_variables(self, model, n_rounds, meetings):
 
         # Variables principales qui prend en compte toute les possibilité de match ( 1 si le match ce joue 0 sinon)
         match_vars = {}
         for i in range(self.n_teams):
             for j in range(self.n_teams):
                 if i != j:
-                    for r in range(self.total_rounds):
+                    for r in range(n_rounds):
                         match_vars[(i, j, r)] = model.NewBoolVar(f"match_{i}_{j}_{r}")
 
         # Variable qui contient toute les décision des matches domicile ou extèrieur (1 si le match est à domicile sinon 0), il permet est résolution bein plus rapide dans le solveur
         is_home = {}
         for i in range(self.n_teams):
-            for r in range(self.total_rounds):
+            for r in range(n_rounds):
                 is_home[(i, r)] = model.NewBoolVar(f"is_home_{i}_{r}")
 
-        # Variables de break
-        break_vars = {}
-        for i in range(self.n_teams):
-            for r in range(self.total_rounds - 1):
-                break_vars[(i, r)] = model.NewBoolVar(f"break_{i}_{r}")
-
         # CONTRAINTES
 
-            # Chaque paire joue exactement 2 fois (aller-retour)
+            # Aller-retour : chaque couple ordonné (i reçoit j) est joué exactement une fois, donc chaque paire
+            # se rencontre deux fois, une fois chez chacune (même règle que la formulation opponent).
+            # Phase aller seule : chaque paire se rencontre une fois, chez l'une ou l'autre
         for i in range(self.n_teams):
             for j in range(i + 1, self.n_teams):
-                model.Add(
-                    sum(
-                        match_vars[(i, j, r)] + match_vars[(j, i, r)]
-                        for r in range(self.total_rounds)
-                    ) == 2
-                )
+                if meetings == 1:
+                    model.Add(sum(match_vars[(i, j, r)] + match_vars[(j, i, r)] for r in range(n_rounds)) == 1)
+                else:
+                    model.Add(sum(match_vars[(i, j, r)] for r in range(n_rounds)) == 1)
+                    model.Add(sum(match_vars[(j, i, r)] for r in range(n_rounds)) == 1)
 
             # Une équipe joue exactement un match par journée
         for i in range(self.n_teams):
-            for r in range(self.total_rounds):
+            for r in range(n_rounds):
                 model.Add(
                     sum(match_vars[(i, j, r)] for j in range(self.n_teams) if j != i) +
                     sum(match_vars[(j, i, r)] for j in range(self.n_teams) if j != i)
@@ -81,65 +354,309 @@ class TournamentScheduler:
 
             # Définition domicile / extérieur
         for i in range(self.n_teams):
-            for r in range(self.total_rounds):
+            for r in range(n_rounds):
                 model.Add(
                     sum(match_vars[(i, j, r)] for j in range(self.n_teams) if j != i)
                     == is_home[(i, r)]
                 )
 
-            # Équilibre domicile / extérieur
-        for i in range(self.n_teams):
-            model.Add(
-                sum(is_home[(i, r)] for r in range(self.total_rounds))
-                == self.rounds
-            )
+        return {"formulation": "match", "match_vars": match_vars, "is_home": is_home}
 
-            # Détection correcte des breaks
+    def build_opponent_variables(self, model, n_rounds, meetings):
+
+        # Formulation compacte : un adversaire (entier) et un booléen domicile par (équipe, journée),
+        # soit n(2n-2) entiers au lieu de n(n-1)(2n-2) booléens
+        opponent = {}
+        is_home = {}
         for i in range(self.n_teams):
-            for r in range(self.total_rounds - 1):
+            others = cp_model.Domain.FromValues([j for j in range(self.n_teams) if j != i])
+            for r in range(n_rounds):
+                opponent[(i, r)] = model.NewIntVarFromDomain(others, f"opp_{i}_{r}")
+                is_home[(i, r)] = model.NewBoolVar(f"is_home_{i}_{r}")
 
-                model.Add(
-                    break_vars[(i, r)] >=
-                    is_home[(i, r)] + is_home[(i, r + 1)] - 1
-                )
+        # CONTRAINTES
 
-                model.Add(
-                    break_vars[(i, r)] >=
-                    (1 - is_home[(i, r)]) + (1 - is_home[(i, r + 1)]) - 1
+            # Chaque journée est un couplage parfait : l'adversaire de mon adversaire, c'est moi (opp est sa propre inverse)
+        for r in range(n_rounds):
+            column = [opponent[(i, r)] for i in range(self.n_teams)]
+            model.AddInverse(column, column)
+
+            # Si une équipe reçoit, son adversaire joue à l'extérieur
+            home_column = [is_home[(i, r)] for i in range(self.n_teams)]
+            for i in range(self.n_teams):
+                opponent_home = model.NewBoolVar(f"opp_home_{i}_{r}")
+                model.AddElement(opponent[(i, r)], home_column, opponent_home)
+                model.Add(is_home[(i, r)] + opponent_home == 1)
+
+            # Aller-retour : chaque couple (adversaire, lieu) apparaît exactement une fois par équipe
+            # (phase aller seule : chaque adversaire apparaît une fois)
+        for i in range(self.n_teams):
+            if meetings == 1:
+                model.AddAllDifferent([opponent[(i, r)] for r in range(n_rounds)])
+            else:
+                model.AddAllDifferent(
+                    [opponent[(i, r)] + self.n_teams * is_home[(i, r)] for r in range(n_rounds)]
                 )
 
-        # Limiter le nombre total de breaks
-        total_breaks = sum(break_vars.values())
-        model.Add(total_breaks <= (max_breaks * self.n_teams)-2) # Appliquer comme contarinte la limite théorque du nombre de break (n-2 break)
+        return {"formulation": "opponent", "opponent": opponent, "is_home": is_home}
+
+    def replan(self, schedule: Dict[int, List[Tuple[int, int]]], locked_rounds, new_constraints=None,
+               formulation: str = "match", time_limit: float = 5.0) -> Dict[int, List[Tuple[int, int]]]:
+
+        # Re-planification en cours de saison : les journées déjà jouées sont figées, le reste du calendrier
+        # part de l'ancienne solution (AddHint) et on modifie le moins de matchs possible
+        if isinstance(locked_rounds, int):
+            locked_rounds = range(locked_rounds)  # locked_rounds=k : les k premières journées sont jouées
+        locked_rounds = set(locked_rounds)
+        new_constraints = list(new_constraints or [])
+        played = sorted({constraint[-1] for constraint in new_constraints if constraint[-1] in locked_rounds})
+        if played:
+            # Une journée déjà jouée ne peut plus changer : aucune fenêtre ne rendrait la contrainte satisfiable
+            raise ValueError(f"Contraintes sur des journées déjà jouées : {played}")
+        unlocked = [r for r in range(self.total_rounds) if r not in locked_rounds]
+        break_limit = count_breaks(schedule) + self.n_teams  # on tolère jusqu'à n breaks de plus que l'ancien calendrier
+
+        # On ne libère d'abord que les journées touchées par les nouvelles contraintes (et celles des matchs
+        # retour concernés), puis on élargit la fenêtre tant qu'aucune solution n'existe : le modèle reste petit
+        # et les journées hors fenêtre ne changent pas
+        free = self.replan_window(schedule, locked_rounds, new_constraints)
+        deadline = time.perf_counter() + time_limit
+
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+
+            fixed_rounds = [r for r in range(self.total_rounds) if r not in free]
+            status, solver, variables, kept = self.solve_replan(schedule, fixed_rounds, new_constraints,
+                                                                 break_limit, formulation, remaining)
+
+            if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
+                moved = sum(1 for literal in kept if solver.Value(literal) == 0)
+                print(f"\nSolution trouvée ({moved} match{'s' if moved > 1 else ''} modifié{'s' if moved > 1 else ''}, "
+                      f"{len(free)} journées libérées)")
+                return self.extract_schedule(solver, variables)
+
+            if status != cp_model.INFEASIBLE or len(free) == len(unlocked):
+                break
+
+            # Fenêtre trop petite : on libère les journées voisines (sans fenêtre de départ, rien ne peut s'élargir)
+            wider = free | {r + d for r in free for d in (-1, 1) if 0 <= r + d < self.total_rounds and r + d not in locked_rounds}
+            if wider == free:
+                break
+            free = wider
+
+        print("Aucune solution trouvée")
+        return {}
+
+    def replan_window(self, schedule, locked_rounds, new_constraints):
+        # Journées à libérer en premier : celles des nouvelles contraintes + celles où se joue l'autre match des paires concernées
+        free = {constraint[-1] for constraint in new_constraints if constraint[-1] not in locked_rounds}
+        pairs = {frozenset(match) for r in free for match in schedule[r]}
+        for r, matches in schedule.items():
+            if r not in locked_rounds and any(frozenset(match) in pairs for match in matches):
+                free.add(r)
+        return free
 
-        # Objectif : minimiser les breaks
-        model.Minimize(total_breaks)
+    def solve_replan(self, schedule, fixed_rounds, new_constraints, break_limit, formulation, time_limit):
 
-        #Résolution par le solveur
-        solver.parameters.max_time_in_seconds = 30.0
-        solver.parameters.num_search_workers = 10
+        constraints = [("fixed_match", h, a, r) for r in fixed_rounds for h, a in schedule[r]]
+        constraints += new_constraints
 
-        status = solver.Solve(model)
+        model, variables = self.build_model(constraints=constraints, formulation=formulation, break_limit=break_limit)
 
-        if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:  # Retourner la solution si le solveur trouve une solution optimal ou simplement faisable
-            print("\nSolution trouvée")
-            schedule = self.extract_schedule(solver, match_vars)
-            return schedule
-        else:
-            print("Aucune solution trouvée")
-            return {}
+        # Solution de départ : l'ancien calendrier
+        self.add_schedule_hint(model, variables, schedule)
+        played = [(h, a, r) for r, matches in schedule.items() for h, a in matches]
 
-    def extract_schedule(self, solver, match_vars) -> Dict[int, List[Tuple[int, int]]]:  # Methode permettant de traduire toute les valeur booléenne de match_vars en donné utilisable (on ne garde que les valeur de match_vars = 1)
+        # Objectif : conserver le maximum de matchs (même journée, même lieu), puis minimiser les breaks
+        fixed = set(fixed_rounds)
+        kept = [self.match_literal(model, variables, h, a, r) for h, a, r in played if r not in fixed]
+        changes = len(kept) - sum(kept)
+        weight = len(variables["break_vars"]) + 1  # un match déplacé coûte plus que tous les breaks réunis
+        model.Minimize(weight * changes + variables["total_breaks"])
 
-        schedule = {r: [] for r in range(self.total_rounds)}
+        solver = self.create_solver(time_limit)
+        status = solver.Solve(model)
+        return status, solver, variables, kept
+
+    def generate_portfolio(self, count: int = 20, max_breaks: int = 1, formulation: str = "match", workers: int = None,
+                           window: int = 6, time_limit: float = 10.0, seed: int = 0, max_tasks: int = None):
+
+        # Générateur de calendriers distincts (à renumérotation des équipes près), résolus en parallèle :
+        # chaque tâche part d'un calendrier déjà trouvé, libère une fenêtre de journées au hasard, y interdit
+        # un match et ré-optimise avec sa propre graine. Les calendriers uniques sont renvoyés dès qu'ils arrivent.
+        workers = workers or os.cpu_count() or 1
+        max_tasks = max_tasks or 5 * count
+        break_limit = self.max_total_breaks(max_breaks)
+        rng = random.Random(seed)
+
+        start = double_round_robin(self.n_teams)
+        found = [start]
+        seen = {canonical_form(start)}
+        yield start
+
+        submitted = 0
+        pool = ProcessPoolExecutor(max_workers=workers)
+        try:
+            pending = set()
+            while len(found) < count:
+                while len(pending) < workers and submitted < max_tasks:
+                    pending.add(pool.submit(solve_portfolio_task, self.n_teams, rng.choice(found), max_breaks,
+                                            formulation, window, rng.randrange(2 ** 31), time_limit))
+                    submitted += 1
+                if not pending:
+                    break
+
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    schedule = future.result()
+                    if not schedule:
+                        continue
+                    if not ScheduleMatrix.from_schedule(schedule, self.n_teams).is_valid(break_limit):
+                        continue  # calendrier invalide : jamais renvoyé ni réutilisé comme point de départ
+                    key = canonical_form(schedule)
+                    if key in seen:
+                        continue  # doublon (même calendrier avec d'autres numéros d'équipes)
+                    seen.add(key)
+                    found.append(schedule)
+                    yield schedule
+                    if len(found) >= count:
+                        break
+        finally:
+            # Aussi quand l'appelant arrête l'itération (break, islice, ramasse-miettes) : les tâches en attente
+            # sont annulées et on n'attend pas la fin de celles en cours
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def optimize_travel(self, schedule: Dict[int, List[Tuple[int, int]]] = None, time_budget: float = 60.0,
+                        max_breaks: int = None, window: int = 4, team_subset: int = 6, sub_time_limit: float = 1.0,
+                        seed: int = 0, on_progress=None, distances=None):
+
+        # Réduit la distance totale parcourue par recherche à voisinage large (voir lns.py), en partant du calendrier
+        # donné (construction directe par défaut). max_breaks=None : pas de limite de breaks
+        break_limit = None if max_breaks is None else self.max_total_breaks(max_breaks)
+        engine = TravelLNS(self, distances, break_limit, window, team_subset, sub_time_limit, seed=seed)
+        return engine.run(schedule, time_budget, on_progress)
+
+    def add_schedule_hint(self, model, variables, schedule):
+        # Indique au solveur un calendrier complet comme solution de départ (matchs, lieux, breaks)
+        played = [(h, a, r) for r, matches in schedule.items() for h, a in matches]
+        if variables["formulation"] == "match":
+            played_set = set(played)
+            for key, var in variables["match_vars"].items():
+                model.AddHint(var, key in played_set)
+        else:
+            for h, a, r in played:
+                if r >= variables["n_rounds"]:
+                    continue  # phase retour miroir : déduite de la phase aller, pas de variable
+                model.AddHint(variables["opponent"][(h, r)], a)
+                model.AddHint(variables["opponent"][(a, r)], h)
+
+        was_home = {}
+        for h, a, r in played:
+            was_home[(h, r)] = 1
+            was_home[(a, r)] = 0
+        for key, var in variables["is_home"].items():
+            model.AddHint(var, was_home[key])
+        for (i, r), var in variables["break_vars"].items():
+            model.AddHint(var, was_home[(i, r)] == was_home[(i, r + 1)])
+
+    def match_literal(self, model, variables, home_idx, away_idx, r):
+        # Booléen "home_idx reçoit away_idx à la journée r", quelle que soit la formulation
+        if variables["formulation"] == "match":
+            return variables["match_vars"][(home_idx, away_idx, r)]
+
+        meets = model.NewBoolVar(f"meets_{home_idx}_{away_idx}_{r}")
+        model.Add(variables["opponent"][(home_idx, r)] == away_idx).OnlyEnforceIf(meets)
+        model.Add(variables["opponent"][(home_idx, r)] != away_idx).OnlyEnforceIf(meets.Not())
+
+        literal = model.NewBoolVar(f"plays_{home_idx}_{away_idx}_{r}")
+        model.AddBoolAnd([meets, variables["is_home"][(home_idx, r)]]).OnlyEnforceIf(literal)
+        model.AddBoolOr([meets.Not(), variables["is_home"][(home_idx, r)].Not()]).OnlyEnforceIf(literal.Not())
+        return literal
+
+    def apply_constraints(self, model, variables, constraints):
+        # Chaque contrainte est un tuple :
+        #   ("venue_unavailable", équipe, journée)      -> l'équipe ne peut pas recevoir ce jour-là
+        #   ("fixed_match", domicile, extérieur, journée) -> match imposé
+        #   ("forbidden_match", i, j, journée)          -> i et j ne se rencontrent pas ce jour-là
+        # En mode miroir, une journée retour est ramenée à sa journée aller, lieux inversés
+        is_home = variables["is_home"]
+        by_match = variables["formulation"] == "match"
+        n_rounds = variables["n_rounds"]
+        sources = mirror_order(n_rounds, variables["mirror"]) if variables["mirror"] else []
+
+        for constraint in constraints:
+            kind = constraint[0]
+            r = constraint[-1]
+            swapped = r >= n_rounds
+            if swapped:
+                r = sources[r - n_rounds]
+
+            if kind == "venue_unavailable":
+                _, team, _ = constraint
+                model.Add(is_home[(team, r)] == (1 if swapped else 0))
+            elif kind == "fixed_match":
+                _, home_idx, away_idx, _ = constraint
+                if swapped:
+                    home_idx, away_idx = away_idx, home_idx
+                if by_match:
+                    model.Add(variables["match_vars"][(home_idx, away_idx, r)] == 1)
+                else:
+                    model.Add(variables["opponent"][(home_idx, r)] == away_idx)
+                    model.Add(is_home[(home_idx, r)] == 1)
+            elif kind == "forbidden_match":
+                _, i, j, _ = constraint
+                if by_match:
+                    match_vars = variables["match_vars"]
+                    model.Add(match_vars[(i, j, r)] + match_vars[(j, i, r)] == 0)
+                else:
+                    model.Add(variables["opponent"][(i, r)] != j)
+            else:
+                raise ValueError(f"Contrainte inconnue : {kind}")
+
+    def extract_schedule(self, solver, variables) -> Dict[int, List[Tuple[int, int]]]:  # Methode permettant de traduire les valeurs du solveur en donné utilisable (on ne garde que les matchs joués)
+
+        schedule = {r: [] for r in range(variables["n_rounds"])}
+
+        if variables["formulation"] == "match":
+            for (i, j, r), var in variables["match_vars"].items():
+                if solver.Value(var) == 1:
+                    schedule[r].append((i, j))  # i reçoit j
+        else:
+            for (i, r), var in variables["opponent"].items():
+                if solver.Value(variables["is_home"][(i, r)]) == 1:
+                    schedule[r].append((i, solver.Value(var)))  # i reçoit son adversaire
 
-        for (i, j, r), var in match_vars.items():
-            if solver.Value(var) == 1:
-                schedule[r].append((i, j))  # i reçoit j
+        if variables["mirror"]:
+            schedule = mirror_schedule(schedule, variables["mirror"])  # phase retour déduite de la phase aller
 
         return schedule
 
+    def extract_matrix(self, solver, variables) -> ScheduleMatrix:
+        # Même traduction que extract_schedule, directement sous forme de matrices (journées x équipes)
+        matrix = ScheduleMatrix.empty(variables["n_rounds"], self.n_teams)
+
+        if variables["formulation"] == "match":
+            for (i, j, r), var in variables["match_vars"].items():
+                if solver.Value(var) == 1:
+                    matrix.opponent[r, i] = j
+                    matrix.opponent[r, j] = i
+                    matrix.home[r, i] = True
+        else:
+            for (i, r), var in variables["opponent"].items():
+                matrix.opponent[r, i] = solver.Value(var)
+                matrix.home[r, i] = solver.Value(variables["is_home"][(i, r)]) == 1
+
+        if variables["mirror"]:
+            matrix = matrix.mirrored(variables["mirror"])
+
+        return matrix
+
     def print_schedule(self, schedule: Dict[int, List[Tuple[int, int]]]): # Affichage du calendrier dans le terminal
+        if isinstance(schedule, ScheduleMatrix):
+            schedule = schedule.to_schedule()
+
         print("\n")
         print("=" * 40)
         print("CALENDRIER DU TOURNOI")
@@ -163,109 +680,81 @@ class TournamentScheduler:
         print("STATISTIQUES DU CALENDRIER")
         print("=" * 40)
 
-        stats = {i: {'home': 0, 'away': 0, 'breaks': 0} for i in range(self.n_teams)} # Compter les matchs par équipe et par type
-        last_location = {i: None for i in range(self.n_teams)}
-
-        for r in sorted(schedule.keys()): # Parcourir les journées dans l'ordre
-            for home_idx, away_idx in schedule[r]:
-
-                # Compter domicile/extérieur
-                stats[home_idx]['home'] += 1
-                stats[away_idx]['away'] += 1
-
-                # Détection des breaks
-                if last_location[home_idx] == 'home':
-                    stats[home_idx]['breaks'] += 1
-                if last_location[away_idx] == 'away':
-                    stats[away_idx]['breaks'] += 1
-
-                # Mettre à jour la dernière localisation
-                last_location[home_idx] = 'home'
-                last_location[away_idx] = 'away'
+        # Comptages vectorisés sur la représentation matricielle (domicile, extérieur, breaks par équipe)
+        matrix = schedule if isinstance(schedule, ScheduleMatrix) else ScheduleMatrix.from_schedule(schedule, self.n_teams)
+        stats = matrix.statistics()
 
         print("\nÉQUILIBRE DOMICILE/EXTÉRIEUR:")
         for i in range(self.n_teams):
-            team_stats = stats[i]
-            diff = abs(team_stats['home'] - team_stats['away'])
-            print(f"  {self.teams[i]:20}: {team_stats['home']:2}D / {team_stats['away']:2}E (diff: {diff})")
+            diff = abs(stats['home'][i] - stats['away'][i])
+            print(f"  {self.teams[i]:20}: {stats['home'][i]:2}D / {stats['away'][i]:2}E (diff: {diff})")
 
         print("\nBREAKS (matchs consécutifs au même endroit):")
         total_breaks = 0
         for i in range(self.n_teams):
-            breaks = stats[i]['breaks']
+            breaks = int(stats['breaks'][i])
             print(f"  {self.teams[i]:20}: {breaks} break{'s' if breaks > 1 else ''}")
             total_breaks += breaks
 
         print(f"\nTotal des breaks: {total_breaks}")
         print(f"Moyenne par équipe: {total_breaks / self.n_teams:.1f}")
 
-    def visualize_schedule_gantt(self, schedule: Dict[int, List[Tuple[int, int]]]): # Affichage du calendirer sous la forme d'un diagramme de GANT
-        fig, ax = plt.subplots(figsize=(14, 10))
-
-        team_positions = {i: i for i in range(self.n_teams)}
-
-        for r, matches in schedule.items():
-            x_pos = r
+    def visualize_schedule_gantt(self, schedule: Dict[int, List[Tuple[int, int]]], path: str = None, labels: bool = None): # Affichage du calendirer sous la forme d'un diagramme de GANT
+        # Une seule image pour tout le calendrier (voir gantt.py). Avec path (.png, .svg, .pdf, .html),
+        # le diagramme est exporté sans ouvrir de fenêtre ; sinon il est affiché
+        matrix = schedule if isinstance(schedule, ScheduleMatrix) else ScheduleMatrix.from_schedule(schedule, self.n_teams)
 
-            for home_idx, away_idx in matches:
-                home_pos = team_positions[home_idx]
-                away_pos = team_positions[away_idx]
-
-                home_team = self.teams[home_idx]
-                away_team = self.teams[away_idx]
+        if path:
+            return export_gantt(matrix, self.teams, path, labels)
 
-                ax.barh(
-                    home_pos - 0.2, 1, left=x_pos,
-                    height=0.4, color='green', alpha=0.7,
-                    label='Domicile' if r == 0 else ""
-                )
+        fig = plt.figure(figsize=(14, 10))
+        draw_gantt(fig, matrix, self.teams, labels)
+        plt.show()
 
-                ax.text(
-                    x_pos + 0.5, home_pos - 0.2,
-                    away_team,
-                    ha='center', va='center',
-                    fontsize=8, color='white', fontweight='bold'
-                )
 
-                ax.barh(
-                    away_pos + 0.2, 1, left=x_pos,
-                    height=0.4, color='red', alpha=0.7,
-                    label='Extérieur' if r == 0 else ""
-                )
+class SolutionStream(cp_model.CpSolverSolutionCallback):
+    # Callback CP-SAT : chaque solution améliorante est traduite en calendrier et transmise à on_solution
+    def __init__(self, scheduler, variables, on_solution):
+        super().__init__()
+        self.scheduler = scheduler
+        self.variables = variables
+        self.on_solution = on_solution
 
-                ax.text(
-                    x_pos + 0.5, away_pos + 0.2,
-                    home_team,
-                    ha='center', va='center',
-                    fontsize=8, color='white', fontweight='bold'
-                )
+    def on_solution_callback(self):
+        event = {
+            "schedule": self.scheduler.extract_schedule(self, self.variables),
+            "breaks": int(self.ObjectiveValue()),
+            "bound": self.BestObjectiveBound(),
+            "elapsed": self.WallTime(),
+        }
+        if self.on_solution(event):
+            self.StopSearch()
 
-        # Configuration de l'axe Y
-        ax.set_yticks(range(self.n_teams))
-        ax.set_yticklabels(self.teams)
-        ax.set_ylabel('Équipes', fontsize=15, fontweight='bold')
 
-        # Configuration de l'axe X
-        ax.set_xlabel('Journées', fontsize=15, fontweight='bold')
-        ax.set_xlim(-0.2, len(schedule) + 0.2)
-        ax.set_xlim(-0.2, len(schedule) + 0.2)
-        ax.set_xticks(range(len(schedule)))
+def solve_portfolio_task(n_teams, start, max_breaks, formulation, window, seed, time_limit):
+    # Une résolution du portefeuille, exécutée dans un processus séparé (un seul worker CP-SAT par tâche)
+    scheduler = TournamentScheduler(n_teams)
+    rng = random.Random(seed)
 
-        x_labels = [f"J{r + 1}" for r in range(len(schedule))]
-        ax.set_xticklabels(x_labels, rotation=45, ha='right')
+    # Diversification : hors d'une fenêtre de journées tirée au hasard, on garde le calendrier de départ ;
+    # dans la fenêtre, un des matchs de départ est interdit pour forcer un calendrier différent
+    first = rng.randrange(0, scheduler.total_rounds - window + 1)
+    free = range(first, first + window)
+    constraints = [("fixed_match", h, a, r) for r in range(scheduler.total_rounds) if r not in free for h, a in start[r]]
+    r = rng.choice(free)
+    h, a = rng.choice(start[r])
+    constraints.append(("forbidden_match", h, a, r))
 
-        # Légende
-        home_patch = mpatches.Patch(color='green', alpha=0.7, label='Domicile')
-        away_patch = mpatches.Patch(color='red', alpha=0.7, label='Extérieur')
-        ax.legend(handles=[home_patch, away_patch], loc='upper right')
+    model, variables = scheduler.build_model(max_breaks, constraints, formulation)
+    scheduler.add_schedule_hint(model, variables, start)
 
-        ax.set_title(f"CALENDRIER DU CHAMPIONNAT - {self.n_teams} ÉQUIPES",
-                     fontsize=16, fontweight='bold', pad=20)
-        ax.grid(True, alpha=0.3, axis='x')
+    solver = scheduler.create_solver(time_limit, workers=1)
+    solver.parameters.random_seed = seed
 
-        plt.tight_layout()
-        plt.subplots_adjust(bottom=0.1)
-        plt.show()
+    status = solver.Solve(model)
+    if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
+        return scheduler.extract_schedule(solver, variables)
+    return {}
 
 
 def main():
@@ -273,7 +762,7 @@ def main():
 
     print("\n1. INITIALISATION DU TOURNOI")
 
-    # Choix du nombre d'équipe (4 à 12)
+    # Choix du nombre d'équipe (noms de villes jusqu'à 40)
     scheduler = TournamentScheduler(n_teams=8)
     scheduler.print_teams()
 
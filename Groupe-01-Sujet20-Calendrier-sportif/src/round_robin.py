@@ -0,0 +1,128 @@
+from typing import List, Dict, Tuple
+
+# Construction directe (sans solveur) d'un calendrier round-robin aller-retour.
+# Méthode du cercle (Berger) + orientation domicile/extérieur canonique de de Werra :
+# le calendrier obtenu a exactement n-2 breaks, ce qui est la borne inférieure théorique.
+
+Schedule = Dict[int, List[Tuple[int, int]]]
+
+# Variantes de phase retour "miroir" : la phase retour rejoue les journées aller, lieux inversés
+MIRROR_VARIANTS = ("mirror", "french", "english")
+
+
+def berger_rounds(n_teams: int) -> List[List[Tuple[int, int]]]:
+    # Calendrier simple (n-1 journées), chaque match est un couple (domicile, extérieur)
+    if n_teams % 2 != 0 or n_teams < 2:
+        raise ValueError("n_teams doit être pair et >= 2")
+
+    m = n_teams - 1  # l'équipe n-1 est le pivot fixe, les autres tournent sur le cercle
+    rounds = []
+    for k in range(m):
+        matches = [(k, n_teams - 1) if k % 2 == 0 else (n_teams - 1, k)]
+        for i in range(1, n_teams // 2):
+            a, b = (k + i) % m, (k - i) % m
+            matches.append((a, b) if i % 2 == 1 else (b, a))  # orientation alternée => n-2 breaks
+        rounds.append(matches)
+    return rounds
+
+
+def mirror_order(n_rounds: int, variant: str) -> List[int]:
+    # Journée aller rejouée à chaque journée de la phase retour
+    if variant == "mirror":
+        return list(range(n_rounds))  # J(n-1+k) = J(k)
+    if variant == "french":
+        return list(range(1, n_rounds)) + [0]  # retour décalé d'une journée, la J1 est rejouée en dernier
+    if variant == "english":
+        return [n_rounds - 1] + list(range(n_rounds - 1))  # la dernière journée aller ouvre la phase retour
+    raise ValueError(f"Variante miroir inconnue : {variant}")
+
+
+def mirror_schedule(first_half: Schedule, variant: str) -> Schedule:
+    # Complète une phase aller (n-1 journées) avec sa phase retour miroir
+    n_rounds = len(first_half)
+    schedule = {r: list(first_half[r]) for r in range(n_rounds)}
+    for k, source in enumerate(mirror_order(n_rounds, variant)):
+        schedule[n_rounds + k] = [(a, h) for h, a in first_half[source]]
+    return schedule
+
+
+def double_round_robin(n_teams: int, mirrored: str = None) -> Schedule:
+    if mirrored:
+        # Phase aller canonique (n-2 breaks) + phase retour miroir :
+        # 3n-6 breaks en miroir classique (optimal, de Werra), 2n-4 en anglais (optimal), 2n en français
+        return mirror_schedule(dict(enumerate(berger_rounds(n_teams))), mirrored)
+
+    # Chaque journée du calendrier simple est suivie immédiatement de son match retour.
+    # Une équipe joue X puis non-X dans un bloc : il y a break entre deux blocs si elle
+    # change de lieu au match aller. En inversant l'aller d'un bloc sur deux, les breaks
+    # du calendrier aller-retour sont exactement ceux du calendrier simple (n-2).
+    schedule = {}
+    for k, matches in enumerate(berger_rounds(n_teams)):
+        first_leg = matches if k % 2 == 0 else [(a, h) for h, a in matches]
+        schedule[2 * k] = list(first_leg)
+        schedule[2 * k + 1] = [(a, h) for h, a in first_leg]
+    return schedule
+
+
+def count_breaks(schedule: Schedule) -> int:
+    # Nombre total de breaks (deux journées consécutives au même endroit)
+    last_location = {}
+    total = 0
+    for r in sorted(schedule.keys()):
+        for home_idx, away_idx in schedule[r]:
+            if last_location.get(home_idx) == 'home':
+                total += 1
+            if last_location.get(away_idx) == 'away':
+                total += 1
+            last_location[home_idx] = 'home'
+            last_location[away_idx] = 'away'
+    return total
+
+
+def canonical_form(schedule: Schedule) -> Tuple:
+    # Forme canonique d'un calendrier à renumérotation des équipes près : deux calendriers identiques
+    # après permutation des équipes ont la même forme (raffinement de couleurs + individualisation)
+    rounds = sorted(schedule.keys())
+    opponent = {}
+    for r in rounds:
+        for home_idx, away_idx in schedule[r]:
+            opponent[(home_idx, r)] = (away_idx, 1)
+            opponent[(away_idx, r)] = (home_idx, 0)
+    teams = sorted({team for team, _ in opponent})
+
+    def refine(colors):
+        # Une équipe est caractérisée par sa couleur et la suite (couleur de l'adversaire, lieu) de ses journées
+        while True:
+            signatures = {
+                t: (colors[t], tuple((colors[opponent[(t, r)][0]], opponent[(t, r)][1]) for r in rounds))
+                for t in teams
+            }
+            ranking = {signature: k for k, signature in enumerate(sorted(set(signatures.values())))}
+            refined = {t: ranking[signatures[t]] for t in teams}
+            if len(ranking) == len(set(colors.values())):
+                return refined
+            colors = refined
+
+    def encode(colors):
+        return tuple(tuple(sorted((colors[h], colors[a]) for h, a in schedule[r])) for r in rounds)
+
+    def search(colors):
+        colors = refine(colors)
+        cells = {}
+        for t in teams:
+            cells.setdefault(colors[t], []).append(t)
+        tied = [c for c in sorted(cells) if len(cells[c]) > 1]
+        if not tied:
+            return encode(colors)
+
+        # Équipes encore indistinguables : on essaie de distinguer chacune et on garde le plus petit codage
+        cell = tied[0]
+        best = None
+        for chosen in cells[cell]:
+            split = {t: 2 * colors[t] + (1 if colors[t] == cell and t != chosen else 0) for t in teams}
+            candidate = search(split)
+            if best is None or candidate < best:
+                best = candidate
+        return best
+
+    return search({t: 0 for t in teams})
@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+import time
+from typing import List, Dict, Tuple
+
+# Cache disque des calendriers : une configuration de championnat (nombre d'équipes, limite de breaks,
+# contraintes, moteur, ...) donne toujours le même modèle, inutile de le résoudre à nouveau.
+# Seuls les optimums prouvés sont enregistrés : ils ne dépendent ni de la limite de temps ni des workers.
+# Un fichier JSON par configuration, nommé par le hachage de sa forme canonique, avec le calendrier
+# et les statistiques du solveur qui l'a produit. Éviction LRU (date du dernier accès) au-delà de max_entries.
+
+Schedule = Dict[int, List[Tuple[int, int]]]
+
+CACHE_FORMAT = 3  # à incrémenter si le modèle change (les anciennes entrées ne sont plus relues)
+
+
+class ScheduleCache:
+
+    def __init__(self, directory: str = "cache", max_entries: int = 200):
+        self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def config(n_teams: int, max_breaks: int, constraints, engine: str, formulation: str, mirrored,
+               symmetry_breaking: bool = False) -> dict:
+        # Forme canonique des entrées du modèle : l'ordre des contraintes ne compte pas
+        return {
+            "format": CACHE_FORMAT,
+            "n_teams": n_teams,
+            "max_breaks": max_breaks,
+            "constraints": sorted(list(c) for c in constraints or []),
+            "engine": engine,
+            "formulation": formulation if engine == "cp-sat" else "-",
+            "mirrored": mirrored or None,
+            "symmetry_breaking": bool(symmetry_breaking) if engine == "cp-sat" else False,
+        }
+
+    @staticmethod
+    def key(config: dict) -> str:
+        canonical = json.dumps(config, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, config: dict):
+        # Renvoie (calendrier, statistiques) ou None ; un accès rafraîchit la date utilisée pour l'éviction
+        path = self.path(self.key(config))
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("config") != config:
+            return None  # collision ou entrée d'un autre format
+        if entry["stats"].get("status") != "OPTIMAL":
+            return None  # solution non prouvée optimale (limite de temps atteinte) : on relance le solveur
+        os.utime(path)
+        schedule = {r: [tuple(match) for match in matches] for r, matches in enumerate(entry["schedule"])}
+        return schedule, entry["stats"]
+
+    def put(self, config: dict, schedule: Schedule, stats: dict):
+        entry = {
+            "config": config,
+            "schedule": [[list(match) for match in schedule[r]] for r in sorted(schedule.keys())],
+            "stats": stats,
+        }
+        path = self.path(self.key(config))
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, path)  # écriture atomique : un lecteur ne voit jamais un fichier à moitié écrit
+        self.prune()
+
+    def evict(self, config: dict) -> bool:
+        try:
+            os.remove(self.path(self.key(config)))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def entries(self) -> List[str]:
+        return [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith(".json")]
+
+    def prune(self, max_age_days: float = None):
+        # Supprime les entrées les moins récemment utilisées au-delà de max_entries, et celles plus vieilles que max_age_days
+        files = sorted(self.entries(), key=os.path.getmtime, reverse=True)
+        expired = files[self.max_entries:]
+        if max_age_days is not None:
+            limit = time.time() - max_age_days * 86400
+            expired += [path for path in files[:self.max_entries] if os.path.getmtime(path) < limit]
+        for path in expired:
+            os.remove(path)
+        return len(expired)
+
+    def clear(self):
+        for path in self.entries():
+            os.remove(path)
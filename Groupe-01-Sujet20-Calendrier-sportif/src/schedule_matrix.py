@@ -0,0 +1,155 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Dict, Tuple
+
+import numpy as np
+
+from round_robin import mirror_order
+
+# Représentation compacte d'un calendrier : deux matrices (journées x équipes)
+#   opponent[r, t] = adversaire de t à la journée r
+#   home[r, t]     = True si t reçoit à la journée r
+# Les vérifications sont vectorisées et acceptent aussi des piles de calendriers (k, journées, équipes),
+# pour valider d'un coup tous les calendriers d'un portefeuille.
+
+Schedule = Dict[int, List[Tuple[int, int]]]
+
+
+def one_match_per_round(opponent: np.ndarray, home: np.ndarray) -> np.ndarray:
+    # Chaque équipe joue un seul match par journée : l'adversaire de mon adversaire c'est moi, et un seul des deux reçoit
+    teams = np.arange(opponent.shape[-1])
+    opponent = in_range(opponent)
+    valid = (gather(opponent, opponent) == teams) & (opponent != teams) & (home != gather(home, opponent))
+    return valid.all(axis=(-2, -1))
+
+
+def pairs_meet_twice(opponent: np.ndarray, home: np.ndarray) -> np.ndarray:
+    # Chaque paire se rencontre deux fois, une fois chez chacune : pour chaque équipe, chaque couple
+    # (adversaire, lieu) apparaît exactement une fois sur la saison (comptage par bincount)
+    n_rounds, n_teams = opponent.shape[-2:]
+    batch = opponent.shape[:-2]
+    if n_rounds != 2 * (n_teams - 1):
+        return np.zeros(batch, dtype=bool)
+    teams = np.arange(n_teams)
+    calendars = np.arange(int(np.prod(batch))).reshape(batch + (1, 1))
+    codes = (calendars * n_teams + teams) * 2 * n_teams + in_range(opponent) + n_teams * home
+    counts = np.bincount(codes.ravel(), minlength=calendars.size * 2 * n_teams * n_teams)
+    return (counts.reshape(batch + (n_teams, 2 * n_teams)) == expected_counts(n_teams)).all(axis=(-2, -1))
+
+
+@lru_cache(maxsize=None)
+def expected_counts(n_teams: int) -> np.ndarray:
+    # expected[t, j + n * domicile] : 1 pour chaque adversaire j != t, à domicile et à l'extérieur
+    expected = np.ones((n_teams, 2 * n_teams), dtype=np.int64)
+    teams = np.arange(n_teams)
+    expected[teams, teams] = 0
+    expected[teams, teams + n_teams] = 0
+    return expected
+
+
+def in_range(opponent: np.ndarray) -> np.ndarray:
+    # Case vide (-1) ou adversaire hors limites : remplacé par l'équipe elle-même, ce qui invalide le calendrier
+    if opponent.size and 0 <= opponent.min() and opponent.max() < opponent.shape[-1]:
+        return opponent  # cas courant : aucune copie
+    teams = np.arange(opponent.shape[-1])
+    return np.where((opponent >= 0) & (opponent < opponent.shape[-1]), opponent, teams)
+
+
+def gather(values: np.ndarray, opponent: np.ndarray) -> np.ndarray:
+    # values[..., r, opponent[..., r, t]] par un index à plat (plus rapide que take_along_axis)
+    n_teams = opponent.shape[-1]
+    rows = np.arange(opponent.size // n_teams).reshape(opponent.shape[:-1] + (1,)) * n_teams
+    return values.reshape(-1)[opponent + rows]
+
+
+def home_counts(home: np.ndarray) -> np.ndarray:
+    return home.sum(axis=-2)
+
+
+def home_away_balanced(home: np.ndarray) -> np.ndarray:
+    # Écart domicile / extérieur d'au plus 1 pour chaque équipe (0 sur un aller-retour complet)
+    n_rounds = home.shape[-2]
+    return (np.abs(2 * home_counts(home) - n_rounds) <= 1).all(axis=-1)
+
+
+def breaks_per_team(home: np.ndarray) -> np.ndarray:
+    # Break : deux journées consécutives au même endroit
+    return (home[..., 1:, :] == home[..., :-1, :]).sum(axis=-2)
+
+
+def total_breaks(home: np.ndarray) -> np.ndarray:
+    return breaks_per_team(home).sum(axis=-1)
+
+
+def validate(opponent: np.ndarray, home: np.ndarray, break_limit: int = None) -> Dict[str, np.ndarray]:
+    checks = {
+        "one_match_per_round": one_match_per_round(opponent, home),
+        "pairs_meet_twice": pairs_meet_twice(opponent, home),
+        "home_away_balanced": home_away_balanced(home),
+    }
+    if break_limit is not None:
+        checks["breaks_within_limit"] = total_breaks(home) <= break_limit
+    return checks
+
+
+@dataclass
+class ScheduleMatrix:
+    opponent: np.ndarray  # (journées, équipes), entiers
+    home: np.ndarray      # (journées, équipes), booléens
+
+    @property
+    def n_rounds(self) -> int:
+        return self.opponent.shape[0]
+
+    @property
+    def n_teams(self) -> int:
+        return self.opponent.shape[1]
+
+    @classmethod
+    def empty(cls, n_rounds: int, n_teams: int) -> "ScheduleMatrix":
+        return cls(np.full((n_rounds, n_teams), -1, dtype=np.int16), np.zeros((n_rounds, n_teams), dtype=bool))
+
+    @classmethod
+    def from_schedule(cls, schedule: Schedule, n_teams: int = None) -> "ScheduleMatrix":
+        rounds = sorted(schedule.keys())
+        if n_teams is None:
+            n_teams = 2 * len(schedule[rounds[0]])
+        matrix = cls.empty(len(rounds), n_teams)
+        for k, r in enumerate(rounds):
+            if not schedule[r]:
+                continue
+            home_idx, away_idx = np.array(schedule[r]).T
+            matrix.opponent[k, home_idx] = away_idx
+            matrix.opponent[k, away_idx] = home_idx
+            matrix.home[k, home_idx] = True
+        return matrix
+
+    def to_schedule(self) -> Schedule:
+        schedule = {}
+        for r in range(self.n_rounds):
+            hosts = np.flatnonzero(self.home[r])
+            schedule[r] = list(zip(hosts.tolist(), self.opponent[r, hosts].tolist()))
+        return schedule
+
+    def mirrored(self, variant: str) -> "ScheduleMatrix":
+        # Complète une phase aller avec sa phase retour miroir (lieux inversés)
+        order = mirror_order(self.n_rounds, variant)
+        return ScheduleMatrix(np.vstack([self.opponent, self.opponent[order]]), np.vstack([self.home, ~self.home[order]]))
+
+    def validate(self, break_limit: int = None) -> Dict[str, bool]:
+        return {name: bool(ok) for name, ok in validate(self.opponent, self.home, break_limit).items()}
+
+    def is_valid(self, break_limit: int = None) -> bool:
+        return all(self.validate(break_limit).values())
+
+    def statistics(self) -> Dict[str, np.ndarray]:
+        home = home_counts(self.home)
+        return {"home": home, "away": self.n_rounds - home, "breaks": breaks_per_team(self.home)}
+
+    def total_breaks(self) -> int:
+        return int(total_breaks(self.home))
+
+
+def stack(matrices: List[ScheduleMatrix]) -> Tuple[np.ndarray, np.ndarray]:
+    # Pile de calendriers (k, journées, équipes) pour les validations vectorisées en lot
+    return np.stack([m.opponent for m in matrices]), np.stack([m.home for m in matrices])
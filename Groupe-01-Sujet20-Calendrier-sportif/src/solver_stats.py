@@ -0,0 +1,97 @@
+import re
+from dataclasses import dataclass, field
+from typing import List, Dict, Tuple, Optional
+
+from ortools.sat.python import cp_model
+
+# Statistiques structurées d'une résolution CP-SAT, extraites du journal du solveur (capturé en mémoire,
+# rien n'est écrit sur la sortie standard) : réductions du presolve, sous-solveurs ayant trouvé les solutions,
+# temps jusqu'à la première solution, progression de l'objectif et de la borne.
+
+PROGRESS_LINE = re.compile(r"^#(\d+|Bound|Done)\s+([\d.]+)s\s+best:(\S+)\s+next:\[([^\]]*)\]\s*(\S*)")
+TABLE_ROW = re.compile(r"^\s*'([^']+)':\s+([\d']+)")
+
+
+@dataclass
+class SolveReport:
+    status: str
+    objective: Optional[float]
+    best_bound: Optional[float]
+    wall_time_s: float
+    first_solution_s: Optional[float]
+    conflicts: int
+    branches: int
+    presolve: Dict[str, int] = field(default_factory=dict)         # variables / contraintes avant et après presolve
+    worker_wins: Dict[str, int] = field(default_factory=dict)      # solutions trouvées par sous-solveur
+    solutions: List[Tuple[float, float, str]] = field(default_factory=list)  # (temps, objectif, sous-solveur)
+    bounds: List[Tuple[float, float, str]] = field(default_factory=list)     # (temps, borne inférieure, sous-solveur)
+
+
+class SolverLog:
+    # À créer avant solver.Solve : active le journal de recherche et le redirige vers une liste
+    def __init__(self, solver: cp_model.CpSolver):
+        self.lines = []
+        solver.parameters.log_search_progress = True
+        solver.parameters.log_to_stdout = False
+        solver.log_callback = self.lines.append
+
+    def report(self, solver: cp_model.CpSolver, status) -> SolveReport:
+        found = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        report = SolveReport(
+            status=solver.StatusName(status),
+            objective=solver.ObjectiveValue() if found else None,
+            best_bound=solver.BestObjectiveBound() if found else None,
+            wall_time_s=round(solver.WallTime(), 4),
+            first_solution_s=None,
+            conflicts=solver.NumConflicts(),
+            branches=solver.NumBranches(),
+        )
+        parse_log(self.lines, report)
+        return report
+
+
+def parse_log(lines: List[str], report: SolveReport):
+    section = None
+    for line in "\n".join(lines).splitlines():  # une entrée du journal peut contenir plusieurs lignes
+        if line.startswith("Initial optimization model"):
+            section = "before"
+            continue
+        if line.startswith("Presolved optimization model"):
+            section = "after"
+            continue
+        if line.startswith("Solutions ("):
+            section = "wins"
+            continue
+        if not line.strip():
+            section = None
+            continue
+
+        if section in ("before", "after"):
+            if line.startswith("#Variables:"):
+                report.presolve[f"variables_{section}"] = to_int(line.split()[1])
+            elif line.startswith("#k"):  # une ligne par type de contrainte
+                key = f"constraints_{section}"
+                report.presolve[key] = report.presolve.get(key, 0) + to_int(line.split()[1])
+            continue
+
+        if section == "wins":
+            match = TABLE_ROW.match(line)
+            if match:
+                report.worker_wins[match.group(1)] = to_int(match.group(2))
+            continue
+
+        match = PROGRESS_LINE.match(line)
+        if not match:
+            continue
+        kind, elapsed, best, interval, worker = match.groups()
+        elapsed = float(elapsed)
+        if kind == "Bound" and interval:
+            report.bounds.append((elapsed, float(interval.split(",")[0]), worker))
+        elif kind.isdigit():
+            report.solutions.append((elapsed, float(best), worker))
+            if report.first_solution_s is None:
+                report.first_solution_s = elapsed
+
+
+def to_int(text: str) -> int:
+    return int(text.replace("'", ""))  # séparateur de milliers du journal CP-SAT (1'000)
@@ -0,0 +1,61 @@
+"""
+Tests des formulations CP-SAT : les calendriers rendus passent ScheduleMatrix.validate()
+Lancement : python test_formulations.py  (ou pytest)
+"""
+from main import TournamentScheduler
+from schedule_matrix import ScheduleMatrix
+
+SIZES = (4, 6)
+
+
+def solve(n_teams, formulation, symmetry_breaking, mirrored=False):
+    scheduler = TournamentScheduler(n_teams)
+    matrix = scheduler.solve_tournament(engine="cp-sat", formulation=formulation, mirrored=mirrored,
+                                        symmetry_breaking=symmetry_breaking, as_matrix=True)
+    assert matrix is not None, f"aucune solution (n={n_teams}, {formulation})"
+    return scheduler, matrix
+
+
+def test_match_formulation_is_valid():
+    # Aller-retour : chaque couple ordonné (i reçoit j) une seule fois, avec ou sans brisure de symétrie
+    for n in SIZES:
+        for symmetry_breaking in (False, True):
+            scheduler, matrix = solve(n, "match", symmetry_breaking)
+            assert all(matrix.validate().values()), (n, symmetry_breaking, matrix.validate())
+            assert matrix.total_breaks() == scheduler.min_breaks()  # borne atteinte
+
+
+def test_match_symmetry_breaking_first_round():
+    # Journée 1 : l'équipe 2k reçoit l'équipe 2k+1
+    for n in SIZES:
+        _, matrix = solve(n, "match", symmetry_breaking=True)
+        for k in range(n // 2):
+            assert matrix.opponent[0, 2 * k] == 2 * k + 1 and matrix.home[0, 2 * k]
+
+
+def test_formulations_are_equivalent():
+    # Mêmes contraintes dans les deux modèles : calendriers valides et même optimum, saison complète ou miroir
+    for n in SIZES:
+        for mirrored in (False, "mirror"):
+            for formulation in ("match", "opponent"):
+                scheduler, matrix = solve(n, formulation, symmetry_breaking=False, mirrored=mirrored)
+                assert all(matrix.validate().values()), (n, formulation, mirrored, matrix.validate())
+                assert matrix.total_breaks() == scheduler.min_breaks(mirrored), (n, formulation, mirrored)
+
+
+def test_portfolio_yields_valid_calendars():
+    # Chaque calendrier du portefeuille passe validate(), limite de breaks comprise
+    scheduler = TournamentScheduler(6)
+    for formulation in ("match", "opponent"):
+        portfolio = list(scheduler.generate_portfolio(count=4, formulation=formulation, workers=2, window=4,
+                                                      time_limit=3.0))
+        assert len(portfolio) == 4
+        for schedule in portfolio:
+            assert ScheduleMatrix.from_schedule(schedule, 6).is_valid(scheduler.max_total_breaks()), formulation
+
+
+if __name__ == "__main__":
+    for test in (test_match_formulation_is_valid, test_match_symmetry_breaking_first_round,
+                 test_formulations_are_equivalent, test_portfolio_yields_valid_calendars):
+        test()
+        print(f"✓ {test.__name__}")
@@ -0,0 +1,25 @@
+"""
+Tests de la recherche à voisinage large sur les distances (lns.py)
+Lancement : python test_lns.py  (ou pytest)
+"""
+import numpy as np
+
+from main import TournamentScheduler
+from schedule_matrix import ScheduleMatrix
+from travel import distance_matrix, travel_distance
+
+
+def test_numpy_distances_accepted():
+    # Une matrice numpy est acceptée comme les listes ; le calendrier reste valide et ne s'allonge pas
+    scheduler = TournamentScheduler(8)
+    distances = np.array(distance_matrix(scheduler.teams))
+    best, history = scheduler.optimize_travel(time_budget=2.0, distances=distances, seed=1)
+
+    assert ScheduleMatrix.from_schedule(best, 8).is_valid()
+    assert travel_distance(best, distances.tolist()) == history[-1][1] <= history[0][1]
+
+
+if __name__ == "__main__":
+    for test in (test_numpy_distances_accepted,):
+        test()
+        print(f"✓ {test.__name__}")
@@ -0,0 +1,43 @@
+"""
+Tests de la re-planification en cours de saison (TournamentScheduler.replan)
+Lancement : python test_replan.py  (ou pytest)
+"""
+import time
+
+from main import TournamentScheduler
+from round_robin import double_round_robin
+
+
+def test_replan_respects_new_constraint():
+    scheduler = TournamentScheduler(6)
+    schedule = double_round_robin(6)
+    home_at_8 = schedule[8][0][0]
+
+    repaired = scheduler.replan(schedule, locked_rounds=3, new_constraints=[("venue_unavailable", home_at_8, 8)])
+
+    assert repaired, "aucune solution"
+    assert all(h != home_at_8 for h, _ in repaired[8])
+    for r in range(3):
+        assert sorted(repaired[r]) == sorted(schedule[r]), f"journée jouée {r} modifiée"
+
+
+def test_replan_rejects_played_rounds():
+    # Contrainte sur une journée jouée : refus immédiat, pas de boucle jusqu'à la limite de temps
+    scheduler = TournamentScheduler(6)
+    schedule = double_round_robin(6)
+    home_at_1 = schedule[1][0][0]
+
+    start = time.perf_counter()
+    try:
+        scheduler.replan(schedule, locked_rounds=3, new_constraints=[("venue_unavailable", home_at_1, 1)])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("ValueError attendue")
+    assert time.perf_counter() - start < 1.0
+
+
+if __name__ == "__main__":
+    for test in (test_replan_respects_new_constraint, test_replan_rejects_played_rounds):
+        test()
+        print(f"✓ {test.__name__}")
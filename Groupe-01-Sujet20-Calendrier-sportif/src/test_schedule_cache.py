@@ -0,0 +1,38 @@
+"""
+Tests du cache disque des calendriers (schedule_cache.py)
+Lancement : python test_schedule_cache.py  (ou pytest)
+"""
+import tempfile
+
+from main import TournamentScheduler
+from round_robin import double_round_robin
+from schedule_cache import ScheduleCache
+
+CONSTRAINTS = [("venue_unavailable", 1, 3)]
+
+
+def test_optimal_solution_is_cached():
+    cache = ScheduleCache(tempfile.mkdtemp())
+    scheduler = TournamentScheduler(6)
+    schedule = scheduler.solve_tournament(engine="cp-sat", constraints=CONSTRAINTS, cache=cache)
+
+    config = ScheduleCache.config(6, 1, CONSTRAINTS, "cp-sat", "match", None)
+    cached, stats = cache.get(config)
+    assert stats["status"] == "OPTIMAL"
+    assert {r: sorted(m) for r, m in cached.items()} == {r: sorted(m) for r, m in schedule.items()}
+
+
+def test_feasible_entry_is_ignored():
+    # Une solution non prouvée optimale dépend de la limite de temps : jamais resservie
+    cache = ScheduleCache(tempfile.mkdtemp())
+    config = ScheduleCache.config(6, 1, CONSTRAINTS, "cp-sat", "match", None)
+    cache.put(config, double_round_robin(6), {"status": "FEASIBLE"})
+    assert cache.get(config) is None
+    cache.put(config, double_round_robin(6), {"status": "OPTIMAL"})
+    assert cache.get(config) is not None
+
+
+if __name__ == "__main__":
+    for test in (test_optimal_solution_is_cached, test_feasible_entry_is_ignored):
+        test()
+        print(f"✓ {test.__name__}")
@@ -0,0 +1,64 @@
+"""
+Tests des réglages par défaut du solveur (tuning.py)
+Lancement : python test_tuning.py  (ou pytest)
+"""
+import json
+import os
+import tempfile
+
+from ortools.sat.python import cp_model
+
+from main import TournamentScheduler
+from tuning import MIN_PORTFOLIO_WORKERS, default_settings, load_history, tune
+
+BENCHMARK_SIZES = (6, 8, 10, 12)  # tailles par défaut de benchmark.py
+
+
+def test_few_cores_keep_portfolio():
+    # Machine à 1 cœur : pas de CP-SAT à un seul worker, et plus de temps pour compenser le partage du cœur
+    for n in BENCHMARK_SIZES:
+        single, many = default_settings(n, cores=1), default_settings(n, cores=64)
+        assert single.workers == many.workers == min(many.workers, MIN_PORTFOLIO_WORKERS)
+        assert single.time_limit >= many.time_limit
+
+
+def test_defaults_find_calendar_on_one_core():
+    for n in BENCHMARK_SIZES:
+        settings = tune(n, [], cores=1)
+        scheduler = TournamentScheduler(n)
+        model, variables = scheduler.build_model(formulation=settings.formulation,
+                                                 symmetry_breaking=settings.symmetry_breaking)
+        solver = scheduler.create_solver(settings.time_limit, settings.workers)
+        solver.parameters.stop_after_first_solution = True
+        status = solver.Solve(model)
+        assert status in (cp_model.OPTIMAL, cp_model.FEASIBLE), (n, solver.StatusName(status))
+
+
+def measure(time_optimal_s, **extra):
+    return dict(n_teams=8, engine="cp-sat", formulation="match", mirrored="-", max_breaks=1, workers=8,
+                symmetry_breaking=False, bound_cut=True, time_limit_s=30.0, time_best_s=time_optimal_s,
+                time_optimal_s=time_optimal_s, breaks=6, **extra)
+
+
+def test_history_accumulates():
+    # Historique JSON lines : les lancements s'ajoutent, la mesure la plus récente d'une configuration l'emporte
+    path = os.path.join(tempfile.mkdtemp(), "benchmark.jsonl")
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(measure(1.0, recorded_at="2026-01-01 10:00:00")) + "\n")
+        f.write(json.dumps(measure(4.0, recorded_at="2026-02-01 10:00:00")) + "\n")
+        f.write('{"n_teams": 8, "engi')  # écriture interrompue
+    history = load_history(path)
+    assert len(history) == 2
+    assert tune(8, history, cores=8).time_limit == 12.0  # 3 x 4,0 s
+
+    # Ancien format : une liste JSON
+    legacy = os.path.join(os.path.dirname(path), "benchmark.json")
+    with open(legacy, "w", encoding="utf-8") as f:
+        json.dump([measure(1.0)], f)
+    assert load_history(legacy) == [measure(1.0)]
+
+
+if __name__ == "__main__":
+    for test in (test_few_cores_keep_portfolio, test_defaults_find_calendar_on_one_core, test_history_accumulates):
+        test()
+        print(f"✓ {test.__name__}")
@@ -0,0 +1,61 @@
+from math import radians, sin, cos, asin, sqrt
+from typing import List, Dict, Tuple
+
+# Distances de déplacement entre les villes du championnat (à vol d'oiseau, en km).
+# Modèle de trajet classique (Traveling Tournament Problem) : chaque équipe part de chez elle,
+# se rend sur le lieu de chaque match l'un après l'autre, puis rentre chez elle après la dernière journée.
+
+Schedule = Dict[int, List[Tuple[int, int]]]
+
+CITY_COORDINATES = {  # (latitude, longitude)
+    "Paris": (48.857, 2.352), "Lyon": (45.764, 4.836), "Marseille": (43.296, 5.370),
+    "Lille": (50.629, 3.057), "Bordeaux": (44.838, -0.579), "Toulouse": (43.605, 1.444),
+    "Nice": (43.710, 7.262), "Nantes": (47.218, -1.554), "Strasbourg": (48.573, 7.752),
+    "Montpellier": (43.611, 3.877), "Rennes": (48.117, -1.678), "Reims": (49.258, 4.032),
+    "Le Havre": (49.494, 0.108), "Saint-Étienne": (45.440, 4.387), "Toulon": (43.124, 5.928),
+    "Grenoble": (45.188, 5.724), "Dijon": (47.322, 5.041), "Angers": (47.478, -0.563),
+    "Nîmes": (43.837, 4.360), "Villeurbanne": (45.767, 4.880), "Clermont-Ferrand": (45.778, 3.087),
+    "Le Mans": (48.006, 0.199), "Aix-en-Provence": (43.529, 5.447), "Brest": (48.390, -4.486),
+    "Tours": (47.394, 0.685), "Amiens": (49.894, 2.296), "Limoges": (45.834, 1.261),
+    "Annecy": (45.899, 6.129), "Perpignan": (42.699, 2.895), "Metz": (49.119, 6.176),
+    "Besançon": (47.238, 6.024), "Orléans": (47.903, 1.909), "Rouen": (49.443, 1.099),
+    "Mulhouse": (47.750, 7.336), "Caen": (49.182, -0.370), "Nancy": (48.692, 6.184),
+    "Avignon": (43.949, 4.806), "Poitiers": (46.580, 0.340), "Pau": (43.296, -0.370),
+    "Lorient": (47.748, -3.370),
+}
+
+
+def haversine_km(a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    lat1, lon1, lat2, lon2 = map(radians, (a[0], a[1], b[0], b[1]))
+    h = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+    return 2 * 6371.0 * asin(sqrt(h))
+
+
+def distance_matrix(teams: List[str]) -> List[List[int]]:
+    # Matrice des distances (km entiers, pour CP-SAT) entre les villes des équipes, calculée une seule fois
+    missing = [team for team in teams if team not in CITY_COORDINATES]
+    if missing:
+        raise ValueError(f"Coordonnées inconnues pour {missing} : fournir une matrice de distances")
+    return [[round(haversine_km(CITY_COORDINATES[a], CITY_COORDINATES[b])) for b in teams] for a in teams]
+
+
+def team_locations(schedule: Schedule, n_teams: int) -> List[List[int]]:
+    # locations[t][r] = équipe chez qui t joue à la journée r (t elle-même si elle reçoit)
+    rounds = sorted(schedule.keys())
+    locations = [[t] * len(rounds) for t in range(n_teams)]
+    for k, r in enumerate(rounds):
+        for home_idx, away_idx in schedule[r]:
+            locations[away_idx][k] = home_idx
+    return locations
+
+
+def travel_distance(schedule: Schedule, distances: List[List[int]]) -> int:
+    # Distance totale parcourue par toutes les équipes sur la saison (départ et retour à domicile)
+    n_teams = len(distances)
+    total = 0
+    for t, path in enumerate(team_locations(schedule, n_teams)):
+        previous = t
+        for city in path + [t]:
+            total += distances[previous][city]
+            previous = city
+    return total
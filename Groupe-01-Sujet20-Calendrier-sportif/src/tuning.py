@@ -0,0 +1,139 @@
+import argparse
+import json
+import os
+from dataclasses import dataclass, asdict
+from typing import List
+
+# Réglage automatique du solveur selon la taille du championnat, à partir de l'historique du benchmark
+# (results/benchmark.jsonl, complété par benchmark.py : une mesure horodatée par ligne, les lancements
+# successifs s'accumulent). Sans historique, on applique des valeurs par défaut qui dépendent du nombre
+# d'équipes et du nombre de cœurs disponibles.
+
+# Chemins ancrés sur src/ : même historique quel que soit le répertoire de lancement
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+DEFAULT_HISTORY = os.path.join(RESULTS_DIR, "benchmark.jsonl")
+MIN_TIME_LIMIT = 5.0
+MAX_TIME_LIMIT = 300.0
+# CP-SAT répartit ses stratégies (portefeuille) entre les workers : avec un seul worker, n=8 ne trouve déjà plus
+# de solution en 16 s. Sur une machine à peu de cœurs, on garde donc ce minimum et on allonge la limite de temps
+# en proportion, les workers se partageant les cœurs.
+MIN_PORTFOLIO_WORKERS = 8
+
+
+@dataclass
+class SolverSettings:
+    workers: int
+    time_limit: float
+    formulation: str
+    symmetry_breaking: bool
+    source: str  # "history (n=...)" ou "default"
+
+
+def cpu_count() -> int:
+    return os.cpu_count() or 1
+
+
+def fit_to_cores(workers: int, time_limit: float, cores: int):
+    # Workers plafonnés au nombre de cœurs, sans descendre sous MIN_PORTFOLIO_WORKERS ; limite de temps
+    # multipliée par le nombre de workers par cœur
+    workers = max(1, min(workers, max(cores, MIN_PORTFOLIO_WORKERS)))
+    time_limit = time_limit * max(1.0, workers / cores)
+    return workers, round(min(MAX_TIME_LIMIT, max(MIN_TIME_LIMIT, time_limit)), 1)
+
+
+def default_settings(n_teams: int, cores: int = None) -> SolverSettings:
+    # Petits championnats : peu de workers suffisent ; grands : tous les cœurs et plus de temps
+    cores = cores or cpu_count()
+    workers, time_limit = fit_to_cores(4 if n_teams <= 6 else 8 if n_teams <= 12 else 16, 2.0 * n_teams, cores)
+    return SolverSettings(workers, time_limit, "match", False, "default")
+
+
+def load_history(path: str = DEFAULT_HISTORY) -> List[dict]:
+    # Une mesure JSON par ligne ; les lignes illisibles (écriture interrompue) sont ignorées.
+    # Un ancien fichier au format liste JSON (benchmark.json) est encore accepté.
+    try:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+    except OSError:
+        return []
+    if text.lstrip().startswith("["):
+        try:
+            return json.loads(text)
+        except ValueError:
+            return []
+    history = []
+    for line in text.splitlines():
+        try:
+            history.append(json.loads(line))
+        except ValueError:
+            continue
+    return history
+
+
+def latest_measures(history: List[dict]) -> List[dict]:
+    # Une configuration mesurée plusieurs fois : seule la mesure la plus récente compte (ordre du fichier)
+    keys = ("n_teams", "engine", "formulation", "mirrored", "max_breaks", "workers", "symmetry_breaking",
+            "bound_cut", "time_limit_s")
+    latest = {}
+    for row in history:
+        latest[tuple(row.get(key) for key in keys)] = row
+    return list(latest.values())
+
+
+def tune(n_teams: int, history: List[dict], cores: int = None) -> SolverSettings:
+    cores = cores or cpu_count()
+
+    # Lignes utiles : CP-SAT, modèle de base (sans miroir, max_breaks=1), une solution trouvée
+    rows = [row for row in latest_measures(history)
+            if row.get("engine") == "cp-sat" and row.get("mirrored") == "-" and row.get("max_breaks") == 1
+            and row.get("time_best_s") is not None]
+    if not rows:
+        return default_settings(n_teams, cores)
+
+    # Taille mesurée la plus proche (à égalité, la plus grande : on surestime plutôt le temps nécessaire)
+    measured = min({row["n_teams"] for row in rows}, key=lambda n: (abs(n - n_teams), -n))
+    rows = [row for row in rows if row["n_teams"] == measured]
+
+    # Meilleure configuration : optimalité prouvée le plus tôt (sinon moins de breaks, puis meilleure solution la
+    # plus rapide) ; parmi celles à 10 % du meilleur temps, celle qui utilise le moins de workers
+    def elapsed(row):
+        return row["time_optimal_s"] if row.get("time_optimal_s") is not None else row["time_best_s"]
+
+    def quality(row):
+        return row.get("time_optimal_s") is None, row.get("breaks") or 0
+
+    top = min(quality(row) for row in rows)
+    rows = [row for row in rows if quality(row) == top]
+    fastest = min(elapsed(row) for row in rows)
+    best = min((row for row in rows if elapsed(row) <= 1.1 * fastest + 0.05), key=lambda row: (row["workers"], elapsed(row)))
+
+    if best.get("time_optimal_s") is not None:
+        observed = best["time_optimal_s"]
+    else:
+        observed = max(best["time_limit_s"], 3.0 * best["time_best_s"])  # la limite mesurée n'a pas suffi
+    scale = (n_teams / measured) ** 2  # extrapolation grossière si la taille demandée n'a pas été mesurée
+    workers, time_limit = fit_to_cores(best["workers"], 3.0 * observed * scale, cores)
+
+    return SolverSettings(
+        workers=workers,
+        time_limit=time_limit,
+        formulation=best.get("formulation", "match"),
+        symmetry_breaking=bool(best.get("symmetry_breaking", False)),
+        source=f"history (n={measured})",
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Réglages du solveur déduits de l'historique du benchmark")
+    parser.add_argument("--teams", type=int, nargs="+", default=[6, 8, 10, 12, 20, 30, 40])
+    parser.add_argument("--history", default=DEFAULT_HISTORY)
+    args = parser.parse_args()
+
+    history = load_history(args.history)
+    print(f"{len(history)} lignes d'historique, {cpu_count()} cœurs")
+    for n in args.teams:
+        print(n, asdict(tune(n, history)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
+import os
+
 import streamlit as st
 
-from llm_agent import interroger_agent_wordle, load_dictionary
+from service_client import GameClient, service_url
 
 
 # ------------------------
@@ -14,17 +16,27 @@ st.set_page_config(
 
 
 # ------------------------
-# Dictionary + session state
+# Solving service + session state
 # ------------------------
-@st.cache_data
-def get_dictionary():
-    return load_dictionary("wordle.txt")
+@st.cache_resource
+def get_service_url():
+    # WORDLE_SERVICE=<url> to use a running service (python wordle_service.py); otherwise one
+    # service is started in this Streamlit process and shared by every browser session
+    # (dictionary loaded once, LLM connections reused, model preloaded in the background)
+    return service_url(os.environ.get("WORDLE_SERVICE"))
+
 
+try:
+    SERVICE_URL = get_service_url()
+except Exception as e:
+    st.error(f"Cannot start the solver: {e}")
+    st.stop()
 
-DICTIONARY = get_dictionary()
+if "game" not in st.session_state:
+    # One service session per browser session: attempts, remaining candidates and metrics live in the service
+    st.session_state.game = GameClient(SERVICE_URL)
+GAME = st.session_state.game
 
-if "attempts" not in st.session_state:
-    st.session_state.attempts = []  # [(GUESS, FEEDBACK), ...]
 if "history_inputs" not in st.session_state:
     st.session_state.history_inputs = []  # [{"Guess":..., "Feedback":...}, ...]
 if "history_prompts" not in st.session_state:
@@ -56,6 +68,10 @@ with st.expander("Help / expected format", expanded=False):
     st.write("Feedback letters: **V=green**, **J=yellow**, **G=gray**.")
     st.write("Recommended input: `ORATE GVVJG` or `ORATE -> GVVJG`.")
     st.write("The solver keeps a session history of attempts; each new attempt is added to the constraints.")
+    st.write(
+        "Free text is parsed locally when possible (e.g. `j'ai joué orate et j'ai eu g v v j g`, "
+        "`crane: green yellow gray gray green`, `CRANE 🟩🟨⬜⬜🟩`); the LLM is only called for ambiguous text."
+    )
 
 
 # ------------------------
@@ -89,28 +105,42 @@ else:
 # ------------------------
 # Actions
 # ------------------------
-colA, colB = st.columns([1, 1])
+colA, colB, colC = st.columns([1, 1, 1])
 with colA:
     run_now = st.button("Solve", use_container_width=True)
 with colB:
+    undo_now = st.button("Undo last attempt", use_container_width=True)
+with colC:
     reset_now = st.button("Reset game", use_container_width=True)
 
 
 if reset_now:
-    st.session_state.attempts = []
     st.session_state.history_inputs = []
     st.session_state.history_prompts = []
     st.session_state.last_result = None
+    GAME.reset()
     st.success("Reset done.")
 
 
+if undo_now:
+    undo = GAME.undo()
+    undone = undo["undone"]
+    if undone is None:
+        st.info("Nothing to undo.")
+    else:
+        # The previous candidate set is restored from the session stack (no re-filtering)
+        inputs = st.session_state.history_inputs
+        if inputs and [inputs[-1]["Guess"], inputs[-1]["Feedback"]] == undone:
+            inputs.pop()
+        st.session_state.last_result = None
+        st.success(f"Undone: {undone[0]} -> {undone[1]} ({undo['candidates']} candidates left).")
+
+
 # ------------------------
 # Solve
 # ------------------------
 if run_now:
-    if not DICTIONARY:
-        st.error("Dictionary is empty. Please check wordle.txt.")
-    elif not prompt.strip():
+    if not prompt.strip():
         st.error("Please enter an attempt.")
     else:
         with st.spinner("Thinking..."):
@@ -119,11 +149,7 @@ if run_now:
                 if mode == "Free text (LLM extraction)":
                     st.session_state.history_prompts.append(prompt.strip())
 
-                result = interroger_agent_wordle(
-                    prompt_utilisateur=prompt,
-                    dictionary_words=DICTIONARY,
-                    attempts=st.session_state.attempts,
-                )
+                result = GAME.play(prompt)["answer"]
                 st.session_state.last_result = result
 
                 # If the user used the structured mode, log it nicely
@@ -159,7 +185,34 @@ if st.session_state.history_inputs:
 # Attempts debug (optional but useful)
 # ------------------------
 with st.expander("Session attempts (debug)", expanded=False):
-    st.write(st.session_state.attempts)
+    st.write(GAME.state()["attempts"])
+    stats = GAME.stats()
+    st.caption("LLM response cache")
+    st.write(stats["cache"])
+    st.caption(f"Service: {stats['sessions']} sessions, {stats['words']} words, {stats['workers']} worker processes")
+
+
+# ------------------------
+# Diagnostics (optional)
+# ------------------------
+if st.sidebar.checkbox("Show diagnostics", value=False):
+    metrics = GAME.metrics()
+    st.divider()
+    st.subheader("Diagnostics")
+    last = metrics["last"]
+    if last is None:
+        st.info("No turn measured yet.")
+    else:
+        st.caption(f"Last turn: {last['total_ms']:.1f} ms ({last['outcome']})")
+        st.table(last["spans"])
+        st.caption("Latency per stage over this session (ms)")
+        st.table(metrics["summary"])
+        st.download_button(
+            "Download spans (JSON lines)",
+            data=metrics["jsonl"],
+            file_name="wordle_metrics.jsonl",
+            mime="application/jsonl",
+        )
 
 
 # ------------------------
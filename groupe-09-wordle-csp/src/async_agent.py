@@ -0,0 +1,291 @@
+import asyncio
+import concurrent.futures
+import threading
+from typing import Optional
+
+from llm_agent import (
+    EXTRACTION_FAILED,
+    EXTRACTION_TOOLS,
+    INVALID_ATTEMPT,
+    MAX_CANDIDATES_TO_LLM,
+    MODEL,
+    OLLAMA_AVAILABLE,
+    PROMPT_BUDGET,
+    RESPONSE_CACHE,
+    apply_attempt,
+    decision_kind,
+    extraction_messages,
+    format_answer,
+    format_local_ranking,
+    messages_chars,
+    no_solution_message,
+    normalize_feedback,
+    normalize_guess,
+    ollama,
+    parse_local,
+    parse_extraction,
+)
+from llm_cache import ResponseCache
+from metrics import MetricsRecorder, TurnTrace
+from prompt_budget import CHOICE_TOOLS, PromptBudget, estimate_tokens, format_choice, parse_choice, ranking_prompt
+from ranking import rank_by_entropy
+from session import WordleSession
+
+
+# ---------------------------------------------------------------------------
+# Agent asynchrone
+# ---------------------------------------------------------------------------
+# Même pipeline que interroger_agent_wordle, mais sans bloquer : chaque appel au
+# LLM a son propre délai maximal (au-delà, on se rabat sur le classement local),
+# un tour peut être annulé (CancelledError) et plusieurs sessions avancent en
+# parallèle sur un seul client HTTP (pool de connexions keep-alive réutilisées).
+# Le filtrage et le classement (CPU) passent dans un thread pour ne pas geler la boucle.
+EXTRACTION_TIMEOUT = 20.0   # s
+RANKING_TIMEOUT = 30.0      # s
+WARMUP_TIMEOUT = 120.0      # s, le premier chargement d'un modèle peut être long
+KEEP_ALIVE = "30m"          # le modèle reste chargé entre deux tours
+MAX_CONNECTIONS = 16
+
+
+class AsyncWordleAgent:
+    """
+    Client Ollama asynchrone partagé par toutes les sessions.
+
+    Usage :
+        async with AsyncWordleAgent() as agent:
+            await agent.warm_up()
+            text = await agent.handle("ORATE GVVJG", dictionary, attempts, session)
+
+    Un même couple (attempts, session) ne doit pas jouer deux tours en même temps ;
+    des sessions différentes, si.
+    """
+
+    def __init__(self, host: Optional[str] = None, model: str = MODEL,
+                 extraction_timeout: float = EXTRACTION_TIMEOUT, ranking_timeout: float = RANKING_TIMEOUT,
+                 keep_alive: str = KEEP_ALIVE, max_connections: int = MAX_CONNECTIONS,
+                 cache: Optional[ResponseCache] = RESPONSE_CACHE, budget: PromptBudget = PROMPT_BUDGET):
+        self.model = model
+        self.cache = cache  # None : pas de cache
+        self.budget = budget
+        self.extraction_timeout = extraction_timeout
+        self.ranking_timeout = ranking_timeout
+        self.keep_alive = keep_alive
+        self.client = None
+        if OLLAMA_AVAILABLE:
+            import httpx  # dépendance d'ollama
+
+            limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+            self.client = ollama.AsyncClient(host=host, limits=limits)
+        self.stats = {"llm_calls": 0, "timeouts": 0, "errors": 0, "invalid_answers": 0}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.close()
+
+    async def call(self, coroutine, timeout: float):
+        # Délai maximal par appel ; wait_for annule la requête HTTP en cours s'il est dépassé
+        self.stats["llm_calls"] += 1
+        try:
+            return await asyncio.wait_for(coroutine, timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise
+
+    async def warm_up(self, timeout: float = WARMUP_TIMEOUT) -> bool:
+        """Précharge le modèle (generate avec prompt vide + keep_alive) ; False si Ollama est injoignable."""
+        if self.client is None:
+            return False
+        try:
+            await self.call(self.client.generate(model=self.model, prompt="", keep_alive=self.keep_alive), timeout)
+            return True
+        except Exception:
+            self.stats["errors"] += 1
+            return False
+
+    async def extract(self, user_text: str) -> Optional[dict]:
+        if self.cache is not None:
+            cached = self.cache.get("extract", self.model, user_text)
+            if cached is not None:
+                return cached
+        if self.client is None:
+            return None
+        try:
+            response = await self.call(
+                self.client.chat(model=self.model, messages=extraction_messages(user_text),
+                                 tools=EXTRACTION_TOOLS, keep_alive=self.keep_alive),
+                self.extraction_timeout,
+            )
+        except asyncio.TimeoutError:
+            return None
+        except Exception:
+            self.stats["errors"] += 1
+            return None
+        extracted = parse_extraction(response)
+        if extracted and self.cache is not None:
+            self.cache.put("extract", self.model, user_text, extracted)
+        return extracted
+
+    async def rank(self, ranked: list[tuple[str, float]]) -> tuple[str, str, list[str]]:
+        """
+        (intitulé, contenu, candidats envoyés) : choix structuré du LLM, ou classement
+        local si délai dépassé / réponse invalide / LLM indisponible.
+        """
+        prompt, shortlist = self.budget.build(ranked)
+        if self.cache is not None:
+            cached = self.cache.get("choice", self.model, prompt)
+            if cached is not None:
+                return "LLM DECISION (cached)", format_choice(cached), shortlist
+        if self.client is None:
+            return ("LOCAL DECISION (LLM unavailable: ollama is not installed)", format_local_ranking(ranked),
+                    shortlist)
+        messages = [{"role": "user", "content": prompt}]
+        try:
+            response = await self.call(
+                self.client.chat(model=self.model, messages=messages, tools=CHOICE_TOOLS, keep_alive=self.keep_alive),
+                self.ranking_timeout,
+            )
+        except asyncio.TimeoutError:
+            return (f"LOCAL DECISION (LLM timed out after {self.ranking_timeout:g}s)", format_local_ranking(ranked),
+                    shortlist)
+        except Exception as e:
+            self.stats["errors"] += 1
+            return f"LOCAL DECISION (LLM unavailable: {e})", format_local_ranking(ranked), shortlist
+
+        self.budget.observe(response)
+        choice = parse_choice(response, shortlist)
+        if choice is None:
+            self.stats["invalid_answers"] += 1
+            return "LOCAL DECISION (invalid LLM answer)", format_local_ranking(ranked), shortlist
+        if self.cache is not None:
+            self.cache.put("choice", self.model, prompt, choice)
+        return "LLM DECISION", format_choice(choice), shortlist
+
+    async def handle(self, prompt_utilisateur: str, dictionary_words, attempts: list,
+                     session: Optional[WordleSession] = None,
+                     metrics: Optional[MetricsRecorder] = None) -> str:
+        """
+        Un tour complet (voir interroger_agent_wordle).
+
+        Annulation : avant l'étape 3, l'historique n'est pas modifié ; après, la
+        tentative reste enregistrée (elle est valide) et seul le ranking est perdu.
+        """
+        trace = TurnTrace(prompt_utilisateur)
+        try:
+            return await self.run_pipeline(prompt_utilisateur, dictionary_words, attempts, session, trace)
+        except asyncio.CancelledError:
+            trace.attributes["outcome"] = "cancelled"
+            raise
+        finally:
+            if metrics is not None:
+                trace.finish()
+                metrics.record(trace)
+
+    async def solve(self, guess: str, feedback: str, dictionary_words, attempts: list,
+                    session: Optional[WordleSession], trace: TurnTrace) -> tuple[list[str], list[tuple[str, float]]]:
+        """
+        Enregistre la tentative, filtre, puis classe : (candidats, classement), classement vide sans candidat.
+
+        Calcul dans un thread pour ne pas geler la boucle d'événements (le service le
+        délègue à ses processus de calcul, voir wordle_service.py).
+        """
+        before = len(session) if session is not None else len(dictionary_words)
+        with trace.span("filter", candidates_before=before) as span:
+            possible = await asyncio.to_thread(apply_attempt, guess, feedback, dictionary_words, attempts, session)
+            span["candidates_after"] = len(possible)
+        if not possible:
+            return possible, []
+        with trace.span("rank_local", candidates=len(possible)) as span:
+            ranked = await asyncio.to_thread(rank_by_entropy, possible, MAX_CANDIDATES_TO_LLM)
+            span["sent"] = len(ranked)
+        return possible, ranked
+
+    async def run_pipeline(self, prompt_utilisateur: str, dictionary_words, attempts: list,
+                           session: Optional[WordleSession], trace: TurnTrace) -> str:
+        # 1) + 2) Parsing local (direct ou phrase courante), sinon extraction LLM
+        with trace.span("parse") as span:
+            local = parse_local(prompt_utilisateur)
+            span["parsed"] = local is not None
+        if local:
+            guess, feedback = local
+        else:
+            with trace.span("extract_llm", prompt_chars=messages_chars(extraction_messages(prompt_utilisateur))) as span:
+                extracted = await self.extract(prompt_utilisateur)
+                span["ok"] = extracted is not None
+            if not extracted:
+                trace.attributes["outcome"] = "extraction_failed"
+                return EXTRACTION_FAILED
+            guess, feedback = extracted["guess"], extracted["feedback"]
+
+        guess = normalize_guess(guess)
+        feedback = normalize_feedback(feedback)
+        if not guess or not feedback:
+            trace.attributes["outcome"] = "invalid_attempt"
+            return INVALID_ATTEMPT
+
+        # 3) + 4) Historique + filtrage, puis 5) classement local
+        possible, ranked = await self.solve(guess, feedback, dictionary_words, attempts, session, trace)
+        if not possible:
+            trace.attributes["outcome"] = "no_solution"
+            return no_solution_message(guess, feedback, attempts)
+
+        # 6) Ranking LLM (avec délai maximal), prompt sous budget de tokens
+        with trace.span("rank_llm", budget_tokens=self.budget.tokens()) as span:
+            decision, content, shortlist = await self.rank(ranked)
+            prompt = ranking_prompt(shortlist)
+            span.update(prompt_chars=len(prompt), prompt_tokens=estimate_tokens(prompt), sent=len(shortlist),
+                        decision=decision_kind(decision), response_chars=len(content))
+        trace.attributes["outcome"] = decision_kind(decision)
+        return format_answer(guess, feedback, possible, decision, content, sent=len(shortlist))
+
+
+# ---------------------------------------------------------------------------
+# Interfaces synchrones (CLI, Streamlit)
+# ---------------------------------------------------------------------------
+class AgentThread:
+    """
+    Agent asynchrone servi par une boucle d'événements dans un thread de fond.
+
+    La boucle vit aussi longtemps que l'objet : le client (et ses connexions) est
+    réutilisé d'un tour à l'autre, et le préchargement du modèle tourne pendant
+    que l'utilisateur saisit sa première tentative.
+    """
+
+    agent_class = AsyncWordleAgent
+
+    def __init__(self, host: Optional[str] = None, **options):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.agent = self.submit(self._create(host, options)).result()
+
+    async def _create(self, host, options) -> AsyncWordleAgent:
+        # Créé dans la boucle de fond : le client HTTP asynchrone y est rattaché
+        return self.agent_class(host=host, **options)
+
+    def submit(self, coroutine) -> concurrent.futures.Future:
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def warm_up(self) -> concurrent.futures.Future:
+        """Lance le préchargement sans attendre (future.result() pour attendre)."""
+        return self.submit(self.agent.warm_up())
+
+    def handle(self, prompt_utilisateur: str, dictionary_words, attempts: list,
+               session: Optional[WordleSession] = None, metrics: Optional[MetricsRecorder] = None) -> str:
+        """Un tour, en bloquant l'appelant ; Ctrl+C annule le tour en cours."""
+        future = self.submit(self.agent.handle(prompt_utilisateur, dictionary_words, attempts, session, metrics))
+        try:
+            return future.result()
+        except KeyboardInterrupt:
+            future.cancel()
+            raise
+
+    def close(self):
+        self.submit(self.agent.close()).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
@@ -0,0 +1,130 @@
+import argparse
+import asyncio
+import random
+import re
+import time
+
+from async_agent import AsyncWordleAgent
+from csp_solver import wordle_feedback_vjg
+from fake_ollama import FakeOllama
+from llm_agent import load_dictionary
+from llm_cache import ResponseCache
+from metrics import MetricsRecorder, percentile
+from prompt_budget import PromptBudget
+from session import WordleSession
+
+
+# ---------------------------------------------------------------------------
+# Benchmark hors ligne de l'agent asynchrone
+# ---------------------------------------------------------------------------
+# Lance le faux serveur Ollama, puis fait jouer N sessions en parallèle : chaque
+# tour envoie la tentative (format direct ou phrase en texte libre), et le mot
+# choisi par l'agent devient la tentative suivante.
+# Mesure le débit (tours/s), la latence par tour (p50 / p95 / p99 / max) et,
+# avec --metrics, la latence par étape du pipeline (parse, filter, rank_llm...).
+CHOSEN = re.compile(r"Chosen word:\s*([A-Z]{5})")
+OPENERS = ["ORATE", "SLATE", "CRANE", "RAISE"]
+
+
+async def play(agent: AsyncWordleAgent, matrix, secret: str, rng: random.Random, free_text: float,
+               max_turns: int, latencies: list[float], metrics: MetricsRecorder):
+    session = WordleSession(matrix)
+    attempts = []
+    guess = rng.choice(OPENERS)
+    for _ in range(max_turns):
+        feedback = wordle_feedback_vjg(secret, guess)
+        if rng.random() < free_text:
+            prompt = f"I played {guess.lower()} and got {' '.join(feedback.lower())}"
+        else:
+            prompt = f"{guess} {feedback}"
+
+        start = time.perf_counter()
+        answer = await agent.handle(prompt, None, attempts, session, metrics)
+        latencies.append(time.perf_counter() - start)
+
+        if feedback == "VVVVV":
+            return
+        match = CHOSEN.search(answer)
+        if not match:
+            return
+        guess = match.group(1)
+
+
+async def run(args, words, url, metrics: MetricsRecorder) -> dict:
+    rng = random.Random(args.seed)
+    secrets = [rng.choice(words) for _ in range(args.sessions * args.games)]
+    matrix = WordleSession(words).matrix  # dictionnaire compilé une fois, partagé par les sessions
+    latencies = []
+
+    cache = ResponseCache() if args.cache else None  # cache neuf : chaque mesure part à froid
+    budget = PromptBudget()  # budget de tokens non calibré au départ
+    async with AsyncWordleAgent(host=url, ranking_timeout=args.timeout, extraction_timeout=args.timeout,
+                                cache=cache, budget=budget) as agent:
+        if args.warm_up:
+            start = time.perf_counter()
+            await agent.warm_up()
+            print(f"warm-up: {time.perf_counter() - start:.2f}s")
+
+        async def worker(index: int):
+            local = random.Random(args.seed + index)
+            for game in range(args.games):
+                await play(agent, matrix, secrets[index * args.games + game], local, args.free_text, 6, latencies,
+                           metrics)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(args.sessions)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "turns": len(latencies),
+        "elapsed_s": elapsed,
+        "turns_per_s": len(latencies) / elapsed,
+        "p50_s": percentile(latencies, 50),
+        "p95_s": percentile(latencies, 95),
+        "p99_s": percentile(latencies, 99),
+        "max_s": max(latencies),
+        **agent.stats,
+        **budget.stats(),
+        **({f"cache_{k}": v for k, v in cache.stats().items()} if cache else {}),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline throughput / latency benchmark of the async agent")
+    parser.add_argument("--sessions", type=int, default=8, help="concurrent sessions")
+    parser.add_argument("--games", type=int, default=3, help="games per session")
+    parser.add_argument("--free-text", type=float, default=0.5, help="share of turns sent as free text")
+    parser.add_argument("--latency", type=float, default=0.2, help="fake server: mean generation time (s)")
+    parser.add_argument("--jitter", type=float, default=0.3, help="fake server: log-normal sigma")
+    parser.add_argument("--cold-start", type=float, default=2.0, help="fake server: model load time (s)")
+    parser.add_argument("--slots", type=int, default=4, help="fake server: parallel generations")
+    parser.add_argument("--prompt-rate", type=float, default=0.0,
+                        help="fake server: prompt tokens evaluated per second (0: free)")
+    parser.add_argument("--timeout", type=float, default=5.0, help="per-call timeout of the agent (s)")
+    parser.add_argument("--no-warm-up", dest="warm_up", action="store_false")
+    parser.add_argument("--no-cache", dest="cache", action="store_false", help="disable the LLM response cache")
+    parser.add_argument("--metrics", metavar="PATH", help="write per-stage spans as JSON lines")
+    parser.add_argument("--dictionary", default="wordle.txt")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    words = load_dictionary(args.dictionary)
+    with FakeOllama(latency=args.latency, jitter=args.jitter, cold_start=args.cold_start,
+                    slots=args.slots, seed=args.seed, prompt_rate=args.prompt_rate) as server:
+        metrics = MetricsRecorder(max_turns=100_000)
+        result = asyncio.run(run(args, words, server.url, metrics))
+        result.update({f"server_{k}": v for k, v in server.stats.items()})
+
+    for key, value in result.items():
+        print(f"{key:>20}: {value:.3f}" if isinstance(value, float) else f"{key:>20}: {value}")
+
+    print(f"\n{'stage':>20}  {'count':>6}  {'p50_ms':>9}  {'p95_ms':>9}  {'max_ms':>9}")
+    for row in metrics.summary():
+        print(f"{row['stage']:>20}  {row['count']:>6}  {row['p50_ms']:>9.2f}  {row['p95_ms']:>9.2f}  {row['max_ms']:>9.2f}")
+    if args.metrics:
+        metrics.export_jsonl(args.metrics)
+        print(f"\nspans written to {args.metrics}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,8 @@
 from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
 
 def wordle_feedback_vjg(secret: str, guess: str) -> str:
     """
@@ -32,6 +36,46 @@ def wordle_feedback_vjg(secret: str, guess: str) -> str:
     return "".join(res)
 
 
+def clean_attempt(item):
+    """
+    Valide + normalise une tentative (guess, feedback).
+
+    Retour
+    ------
+    tuple[str, str] | None
+        (GUESS, FEEDBACK) en majuscules, ou None si l'entrée est mal formée
+        (on préfère ignorer une entrée invalide plutôt que planter le solver).
+    """
+    # On attend un couple (guess, fb). Si ce n'est pas le cas : on ignore.
+    if not isinstance(item, (list, tuple)) or len(item) != 2:
+        return None
+
+    guess, fb = item
+
+    # Les deux éléments doivent être des strings
+    if not isinstance(guess, str) or not isinstance(fb, str):
+        return None
+
+    # Normalisation (le solver travaille en majuscules, sans espaces)
+    guess = guess.strip().upper()
+    fb = fb.strip().upper()
+
+    # Wordle = 5 lettres, 5 feedbacks
+    if len(guess) != 5 or len(fb) != 5:
+        return None
+
+    # Feedback doit contenir uniquement V/J/G
+    if any(c not in "VJG" for c in fb):
+        return None
+
+    # Guess doit contenir uniquement des lettres A-Z
+    # (si tu gères les accents, on pourra adapter plus tard)
+    if any(not ("A" <= ch <= "Z") for ch in guess):
+        return None
+
+    return guess, fb
+
+
 def solve_wordle_csp(possible_words, attempts):
     """
     Résout Wordle par filtrage de contraintes (approche CSP "par vérification").
@@ -65,34 +109,9 @@ def solve_wordle_csp(possible_words, attempts):
     cleaned_attempts = []
 
     for item in attempts:
-        # On attend un couple (guess, fb). Si ce n'est pas le cas : on ignore.
-        if not isinstance(item, (list, tuple)) or len(item) != 2:
-            continue
-
-        guess, fb = item
-
-        # Les deux éléments doivent être des strings
-        if not isinstance(guess, str) or not isinstance(fb, str):
-            continue
-
-        # Normalisation (le solver travaille en majuscules, sans espaces)
-        guess = guess.strip().upper()
-        fb = fb.strip().upper()
-
-        # Wordle = 5 lettres, 5 feedbacks
-        if len(guess) != 5 or len(fb) != 5:
-            continue
-
-        # Feedback doit contenir uniquement V/J/G
-        if any(c not in "VJG" for c in fb):
-            continue
-
-        # Guess doit contenir uniquement des lettres A-Z
-        # (si tu gères les accents, on pourra adapter plus tard)
-        if any(not ("A" <= ch <= "Z") for ch in guess):
-            continue
-
-        cleaned_attempts.append((guess, fb))
+        attempt = clean_attempt(item)
+        if attempt is not None:
+            cleaned_attempts.append(attempt)
 
     # -------------------------------------------------------------------------
     # 2) Filtrage du dictionnaire
@@ -124,3 +143,152 @@ def solve_wordle_csp(possible_words, attempts):
 
     return solutions
 
+
+# ---------------------------------------------------------------------------
+# Filtre compilé : masques par position + bornes d'occurrences (numpy)
+# ---------------------------------------------------------------------------
+# Une tentative (guess, feedback) équivaut exactement à :
+#   - position i verte : le mot a guess[i] en i ; sinon le mot n'a PAS guess[i] en i
+#   - lettre L : au moins (#V + #J de L) occurrences, et exactement autant si L a
+#     aussi reçu un G (le gris signale qu'il n'y en a pas davantage)
+#   - les jaunes d'une lettre sont attribués de gauche à droite : un feedback avec
+#     un G avant un J pour la même lettre (hors verts) n'est produit par aucun mot
+# Plusieurs tentatives se combinent par intersection (OU des interdits, max des
+# minima, min des maxima) : on compile une fois, puis un seul passage vectorisé.
+OTHER = 26  # code des caractères hors A-Z (ne peut jamais égaler une lettre de guess)
+ALPHABET = 27
+ALL_LETTERS = (1 << ALPHABET) - 1
+
+
+def encode_words(words) -> np.ndarray:
+    """
+    Encode des mots de 5 lettres (déjà normalisés) en matrice (N, 5) uint8 :
+    A=0 ... Z=25, tout autre caractère = OTHER.
+    """
+    text = "".join(words)
+    if text.isascii():
+        codes = np.frombuffer(text.encode("ascii"), dtype=np.uint8).astype(np.int16) - ord("A")
+    else:
+        codes = np.array([ord(ch) - ord("A") for ch in text], dtype=np.int32)
+    codes = codes.reshape(-1, 5)
+    codes[(codes < 0) | (codes >= 26)] = OTHER
+    return codes.astype(np.uint8)
+
+
+@dataclass
+class Constraints:
+    """Tentatives compilées ; forbidden[i] = masque des lettres interdites en position i."""
+    forbidden: list = field(default_factory=lambda: [0] * 5)
+    min_count: dict = field(default_factory=dict)  # lettre -> nombre minimal d'occurrences
+    max_count: dict = field(default_factory=dict)  # lettre -> nombre maximal d'occurrences
+    feasible: bool = True
+
+
+def compile_attempts(attempts) -> Constraints:
+    """Compile des tentatives (mêmes règles de nettoyage que solve_wordle_csp)."""
+    constraints = Constraints()
+
+    for item in attempts:
+        attempt = clean_attempt(item)
+        if attempt is None:
+            continue
+        guess, fb = attempt
+        letters = [ord(ch) - ord("A") for ch in guess]
+
+        # 1) Masques par position
+        for i, (letter, c) in enumerate(zip(letters, fb)):
+            if c == "V":
+                constraints.forbidden[i] |= ALL_LETTERS & ~(1 << letter)
+            else:
+                constraints.forbidden[i] |= 1 << letter
+
+        # 2) Bornes d'occurrences + cohérence de l'ordre des jaunes
+        for letter in set(letters):
+            marks = [c for l, c in zip(letters, fb) if l == letter]
+            found = marks.count("V") + marks.count("J")
+            constraints.min_count[letter] = max(constraints.min_count.get(letter, 0), found)
+            if "G" in marks:
+                constraints.max_count[letter] = min(constraints.max_count.get(letter, 5), found)
+
+            others = "".join(c for c in marks if c != "V")
+            if "GJ" in others:
+                constraints.feasible = False
+
+    return constraints
+
+
+class WordMatrix:
+    """
+    Dictionnaire compilé pour le filtre vectorisé.
+
+    Attributs
+    ---------
+    words : list[str]
+        Mots normalisés (majuscules, 5 lettres), dans l'ordre d'origine.
+    letters : np.ndarray
+        Matrice (N, 5) uint8 des codes de lettres (voir encode_words).
+    bits : np.ndarray
+        (5, N) uint32 : 1 << lettre, une ligne contiguë par position.
+    counts : np.ndarray
+        (27, N) uint8 : nombre d'occurrences de chaque lettre dans chaque mot.
+    """
+
+    def __init__(self, words):
+        self.words = [w.strip().upper() for w in words if len(w.strip()) == 5]
+        self.letters = encode_words(self.words)
+        n = len(self.words)
+
+        # Disposition par colonnes : chaque test porte sur un tableau contigu de N valeurs
+        self.bits = np.ascontiguousarray((np.uint32(1) << self.letters.astype(np.uint32)).T)
+        rows = np.repeat(np.arange(n), 5)
+        counts = np.bincount(rows * ALPHABET + self.letters.ravel(), minlength=n * ALPHABET)
+        self.counts = np.ascontiguousarray(counts.reshape(n, ALPHABET).T.astype(np.uint8))
+
+    @classmethod
+    def from_arrays(cls, words: list[str], letters: np.ndarray, bits: np.ndarray, counts: np.ndarray) -> "WordMatrix":
+        """Matrice déjà compilée (ex. vues sur une mémoire partagée) : aucune copie, aucun recalcul."""
+        matrix = cls.__new__(cls)
+        matrix.words, matrix.letters, matrix.bits, matrix.counts = words, letters, bits, counts
+        return matrix
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def filter(self, constraints: Constraints, indices: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Indices des mots compatibles avec les contraintes compilées.
+
+        indices : sous-ensemble à tester (ex. candidats restants) ; None = tout le dictionnaire.
+        """
+        if indices is None:
+            indices = np.arange(len(self.words))
+            bits, counts = self.bits, self.counts
+        else:
+            indices = np.asarray(indices, dtype=np.intp)
+            bits, counts = self.bits[:, indices], self.counts[:, indices]
+
+        if not constraints.feasible:
+            return indices[:0]
+
+        ok = np.ones(len(indices), dtype=bool)
+        for i, mask in enumerate(constraints.forbidden):
+            if mask:
+                ok &= (bits[i] & np.uint32(mask)) == 0
+        for letter, low in constraints.min_count.items():
+            if low > 0:
+                ok &= counts[letter] >= low
+        for letter, high in constraints.max_count.items():
+            ok &= counts[letter] <= high
+
+        return indices[ok]
+
+
+def solve_wordle_masks(possible_words, attempts) -> list[str]:
+    """
+    Même résultat que solve_wordle_csp, via le filtre compilé.
+
+    Pour des filtrages répétés sur le même dictionnaire, garder le WordMatrix
+    (l'encodage coûte plus cher que le filtrage lui-même).
+    """
+    matrix = possible_words if isinstance(possible_words, WordMatrix) else WordMatrix(possible_words)
+    return [matrix.words[i] for i in matrix.filter(compile_attempts(attempts))]
@@ -0,0 +1,216 @@
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# ---------------------------------------------------------------------------
+# Faux serveur Ollama (benchmarks hors ligne)
+# ---------------------------------------------------------------------------
+# Imite les routes utilisées par l'agent (/api/chat, /api/generate, /api/tags,
+# /api/version) avec des réponses déterministes :
+#   - chat avec l'outil d'extraction : extrait un guess (5 lettres) et un feedback V/J/G du texte
+#   - chat avec l'outil de choix : choisit les premiers candidats du prompt de ranking
+#   - generate avec prompt vide : préchargement du modèle (keep-alive)
+# La latence est simulée : délai de base + bruit log-normal, démarrage à froid tant
+# que le modèle n'est pas chargé, évaluation du prompt à prompt_rate tokens/s
+# (prompt_eval_count / prompt_eval_duration renvoyés comme Ollama), et un nombre
+# limité de requêtes traitées en parallèle (slots) pour reproduire la file d'attente.
+USER_TEXT = re.compile(r"USER TEXT:\s*(.*)\Z", re.S)
+WORD = re.compile(r"\b([A-Za-z]{5})\b")
+FEEDBACK = re.compile(r"\b([VJGvjg](?:[\s,-]*[VJGvjg]){4})\b")
+CANDIDATES = re.compile(r"Candidates:\s*([A-Z ]*)")
+CHARS_PER_TOKEN = 3
+
+
+def extract_attempt(text: str) -> dict:
+    feedback = ""
+    match = FEEDBACK.search(text)
+    if match:
+        feedback = re.sub(r"[^VJGvjg]", "", match.group(1)).upper()
+        text = text[:match.start()] + text[match.end():]
+    words = [w for w in WORD.findall(text) if w.upper() != feedback]
+    guess = words[0].upper() if words and feedback else ""
+    return {"guess": guess, "feedback": feedback if guess else ""}
+
+
+def choose_words(prompt: str) -> dict:
+    match = CANDIDATES.search(prompt)
+    words = match.group(1).split() if match else []
+    return {"chosen": words[0] if words else "", "ranking": words[:3]}
+
+
+class FakeOllama:
+    """
+    Serveur HTTP local (threads) ; start() renvoie l'URL à passer comme host à l'agent.
+
+    latency : délai moyen d'une génération (s) ; jitter : sigma du bruit log-normal ;
+    prompt_rate : tokens de prompt évalués par seconde (0 : évaluation gratuite) ;
+    cold_start : délai supplémentaire tant que le modèle n'a pas été chargé ;
+    slots : requêtes de génération traitées simultanément (au-delà : file d'attente).
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.2, jitter: float = 0.3,
+                 cold_start: float = 2.0, slots: int = 4, seed: int = 0, prompt_rate: float = 0.0):
+        self.latency = latency
+        self.prompt_rate = prompt_rate
+        self.jitter = jitter
+        self.cold_start = cold_start
+        self.slots = threading.Semaphore(slots)
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.loaded = set()
+        self.stats = {"requests": 0, "connections": 0, "chat": 0, "generate": 0}
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive : une connexion sert plusieurs requêtes
+
+            def setup(self):
+                super().setup()
+                server.count("connections")
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path == "/api/version":
+                    self.reply({"version": "0.0.0-fake"})
+                elif self.path == "/api/tags":
+                    self.reply({"models": [{"name": name, "model": name} for name in sorted(server.loaded)]})
+                else:
+                    self.reply({"error": "not found"}, 404)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    self.reply({"error": "invalid JSON"}, 400)
+                    return
+                if self.path == "/api/chat":
+                    self.reply(server.chat(body))
+                elif self.path == "/api/generate":
+                    self.reply(server.generate(body))
+                else:
+                    self.reply({"error": "not found"}, 404)
+
+            def reply(self, payload: dict, status: int = 200):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                try:
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True  # client parti (délai dépassé ou tour annulé)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self.url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def count(self, key: str):
+        with self.lock:
+            self.stats[key] += 1
+            if key in ("chat", "generate"):
+                self.stats["requests"] += 1
+
+    def simulate(self, model: str, work: float) -> float:
+        # Délai simulé : file d'attente (slots) + démarrage à froid + génération bruitée
+        with self.slots:
+            with self.lock:
+                cold = model not in self.loaded
+                self.loaded.add(model)
+                noise = self.random.lognormvariate(0.0, self.jitter) if self.jitter else 1.0
+            delay = (self.cold_start if cold else 0.0) + work * noise
+            time.sleep(delay)
+        return delay
+
+    def chat(self, body: dict) -> dict:
+        self.count("chat")
+        model = body.get("model", "")
+        messages = body.get("messages") or [{}]
+        content = messages[-1].get("content", "")
+        tokens = max(1, len(content) // CHARS_PER_TOKEN)
+        prompt_time = tokens / self.prompt_rate if self.prompt_rate else 0.0
+        duration = self.simulate(model, self.latency + prompt_time)
+
+        message = {"role": "assistant", "content": ""}
+        tools = [tool["function"]["name"] for tool in body.get("tools") or []]
+        if "extract_wordle_attempt" in tools:
+            match = USER_TEXT.search(content)
+            arguments = extract_attempt(match.group(1) if match else content)
+            message["tool_calls"] = [{"function": {"name": "extract_wordle_attempt", "arguments": arguments}}]
+        elif "choose_wordle_guess" in tools:
+            message["tool_calls"] = [{"function": {"name": "choose_wordle_guess", "arguments": choose_words(content)}}]
+        timings = {"prompt_eval_count": tokens, "prompt_eval_duration": int(prompt_time * 1e9)} if prompt_time else {}
+        return self.response(model, duration, message=message, **timings)
+
+    def generate(self, body: dict) -> dict:
+        self.count("generate")
+        model = body.get("model", "")
+        prompt = body.get("prompt") or ""
+        duration = self.simulate(model, self.latency if prompt else 0.0)  # prompt vide = simple chargement
+        return self.response(model, duration, response="", done_reason="load" if not prompt else "stop")
+
+    @staticmethod
+    def response(model: str, duration: float, done_reason: str = "stop", **fields) -> dict:
+        return {
+            "model": model,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "done": True,
+            "done_reason": done_reason,
+            "total_duration": int(duration * 1e9),
+            **fields,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Ollama server for offline benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--latency", type=float, default=0.2, help="mean generation time (s)")
+    parser.add_argument("--jitter", type=float, default=0.3, help="log-normal sigma of the generation time")
+    parser.add_argument("--cold-start", type=float, default=2.0, help="extra delay until the model is loaded (s)")
+    parser.add_argument("--slots", type=int, default=4, help="requests generated in parallel")
+    parser.add_argument("--prompt-rate", type=float, default=0.0, help="prompt tokens evaluated per second (0: free)")
+    args = parser.parse_args()
+
+    server = FakeOllama(args.host, args.port, args.latency, args.jitter, args.cold_start, args.slots,
+                        prompt_rate=args.prompt_rate)
+    print(f"Fake Ollama listening on {server.url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,27 @@
 import json
+import os
 import re
 from typing import Optional
 
-import ollama
+# ---------------------------------------------------------------------------
+# Optional dependency: "ollama"
+# ---------------------------------------------------------------------------
+# Sans ollama (ou sans serveur Ollama joignable), l'agent reste utilisable :
+# le classement local par entropie répond directement (voir plus bas).
+try:
+    import ollama
+    OLLAMA_AVAILABLE = True
+except ImportError:
+    ollama = None
+    OLLAMA_AVAILABLE = False
 
 from csp_solver import solve_wordle_csp
+from llm_cache import ResponseCache
+from metrics import MetricsRecorder, TurnTrace
+from nl_parser import parse_attempt_text
+from prompt_budget import CHOICE_TOOLS, PromptBudget, estimate_tokens, format_choice, parse_choice
+from ranking import rank_by_entropy
+from session import WordleSession
 
 
 # ---------------------------------------------------------------------------
@@ -100,61 +117,64 @@ _DIRECT = re.compile(r"^\s*([A-Za-z]{5})\s*(?:->\s*)?([VvJjGg]{5})\s*$")
 # ---------------------------------------------------------------------------
 # LLM extraction (fallback)
 # ---------------------------------------------------------------------------
-def extract_attempt_from_text(user_text: str) -> Optional[dict]:
+MODEL = "llama3.1"
+
+# Cache des réponses du LLM, partagé par les deux pipelines (sync / async).
+# WORDLE_LLM_CACHE=<dossier> active le niveau disque (réutilisé d'un lancement à l'autre).
+RESPONSE_CACHE = ResponseCache(directory=os.environ.get("WORDLE_LLM_CACHE") or None)
+
+# Budget de tokens du prompt de ranking, ajusté au débit mesuré du modèle (prompt_budget.py)
+PROMPT_BUDGET = PromptBudget()
+
+EXTRACTION_TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "extract_wordle_attempt",
+            "description": "Extract one Wordle attempt (guess + V/J/G feedback)",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "guess": {"type": "string"},
+                    "feedback": {"type": "string"},
+                },
+                "required": ["guess", "feedback"],
+                "additionalProperties": False,
+            },
+        },
+    }
+]
+
+
+def extraction_messages(user_text: str) -> list[dict]:
+    """Messages envoyés au LLM pour extraire une tentative (partagés avec async_agent)."""
+    return [
+        {
+            "role": "user",
+            "content": (
+                "You are a Wordle assistant.\n"
+                "Task: extract EXACTLY ONE Wordle attempt from the user's text.\n\n"
+                "You MUST return ONLY a tool call to extract_wordle_attempt.\n"
+                "Rules:\n"
+                "- guess: a 5-letter ENGLISH word (A-Z)\n"
+                "- feedback: a 5-character string using ONLY V, J, G\n"
+                "  V=green, J=yellow, G=gray\n"
+                "- Do NOT invent data: if guess or feedback is missing/unclear, "
+                'return guess="" and feedback="".\n\n'
+                f"USER TEXT:\n{user_text}"
+            ),
+        }
+    ]
+
+
+def parse_extraction(response) -> Optional[dict]:
     """
-    Utilise le LLM pour extraire EXACTEMENT une tentative Wordle depuis du texte libre.
-
-    Objectif :
-      - l'utilisateur peut écrire : "j'ai joué orate et j'ai eu g v v j g"
-      - on veut récupérer un couple (guess, feedback) strict
-
-    Stratégie :
-      - on force le modèle à répondre via un "tool call" (fonction extract_wordle_attempt)
-      - on revalide ensuite côté Python 
+    Lit le tool call renvoyé par le LLM et revalide les champs.
 
     Retour :
       - {"guess": "ORATE", "feedback": "GVVJG"} si extraction OK
       - None sinon
     """
-    response = ollama.chat(
-        model="llama3.1",
-        messages=[
-            {
-                "role": "user",
-                "content": (
-                    "You are a Wordle assistant.\n"
-                    "Task: extract EXACTLY ONE Wordle attempt from the user's text.\n\n"
-                    "You MUST return ONLY a tool call to extract_wordle_attempt.\n"
-                    "Rules:\n"
-                    "- guess: a 5-letter ENGLISH word (A-Z)\n"
-                    "- feedback: a 5-character string using ONLY V, J, G\n"
-                    "  V=green, J=yellow, G=gray\n"
-                    "- Do NOT invent data: if guess or feedback is missing/unclear, "
-                    'return guess="" and feedback="".\n\n'
-                    f"USER TEXT:\n{user_text}"
-                ),
-            }
-        ],
-        tools=[
-            {
-                "type": "function",
-                "function": {
-                    "name": "extract_wordle_attempt",
-                    "description": "Extract one Wordle attempt (guess + V/J/G feedback)",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "guess": {"type": "string"},
-                            "feedback": {"type": "string"},
-                        },
-                        "required": ["guess", "feedback"],
-                        "additionalProperties": False,
-                    },
-                },
-            }
-        ],
-    )
-
     # Ollama renvoie typiquement un dict avec "message"
     msg = response.get("message", {}) or {}
     tool_calls = msg.get("tool_calls") or []
@@ -183,122 +203,236 @@ def extract_attempt_from_text(user_text: str) -> Optional[dict]:
     return {"guess": guess, "feedback": feedback}
 
 
-# ---------------------------------------------------------------------------
-# Full agent (CSP + LLM ranking)
-# ---------------------------------------------------------------------------
-MAX_CANDIDATES_TO_LLM = 40
-
-
-def interroger_agent_wordle(prompt_utilisateur: str, dictionary_words, attempts: list):
+def extract_attempt_from_text(user_text: str, cache: Optional[ResponseCache] = RESPONSE_CACHE) -> Optional[dict]:
     """
-    Pipeline complet de l'agent Wordle.
+    Utilise le LLM pour extraire EXACTEMENT une tentative Wordle depuis du texte libre.
 
-    Entrées :
-      - prompt_utilisateur : texte brut utilisateur (ex: "ORATE -> GVVJG" ou phrase libre)
-      - dictionary_words : liste de mots 5 lettres (domaine CSP)
-      - attempts : historique MUTABLE des tentatives [(guess, feedback), ...]
-                  (persisté entre tours côté Streamlit/session_state)
+    Objectif :
+      - l'utilisateur peut écrire : "j'ai joué orate et j'ai eu g v v j g"
+      - on veut récupérer un couple (guess, feedback) strict
 
-    Étapes :
-      1) parse direct via regex (rapide, déterministe)
-      2) fallback extraction via LLM si le texte est libre
-      3) append dans l'historique
-      4) CSP: filtrage des candidats compatibles
-      5) si trop de candidats, on sous-échantillonne ceux envoyés au LLM (coût/latence)
-      6) LLM: propose un ranking / next guess parmi les candidats
-    """
+    Stratégie :
+      - on force le modèle à répondre via un "tool call" (fonction extract_wordle_attempt)
+      - on revalide ensuite côté Python 
+      - une phrase déjà vue (à la casse et aux espaces près) est servie par le cache
 
-    # 1) Parsing direct : si l'utilisateur donne un format structuré, pas besoin de LLM
-    m = _DIRECT.match(prompt_utilisateur or "")
-    if m:
-        guess = m.group(1).upper()
-        feedback = m.group(2).upper()
-    else:
-        # 2) Fallback : extraction sémantique via LLM (cas "texte libre")
-        extracted = extract_attempt_from_text(prompt_utilisateur)
-        if not extracted:
-            return (
-                "Could not extract a valid attempt.\n"
-                "Expected format: 'ORATE GVVJG' or 'ORATE -> GVVJG' "
-                "(V=green, J=yellow, G=gray)."
-            )
-        guess = extracted["guess"]
-        feedback = extracted["feedback"]
+    Retour :
+      - {"guess": "ORATE", "feedback": "GVVJG"} si extraction OK
+      - None sinon
+    """
+    if cache is not None:
+        cached = cache.get("extract", MODEL, user_text)
+        if cached is not None:
+            return cached
 
-    # Optionnel mais utile : revalider même après regex (cohérence + sécurité)
-    guess = normalize_guess(guess)
-    feedback = normalize_feedback(feedback)
-    if not guess or not feedback:
-        return "Invalid guess/feedback after normalization. Please use 5 letters and V/J/G."
+    if not OLLAMA_AVAILABLE:
+        return None
 
-    # 3) Mise à jour de l'historique des contraintes
-    attempts.append((guess, feedback))
+    response = ollama.chat(
+        model=MODEL,
+        messages=extraction_messages(user_text),
+        tools=EXTRACTION_TOOLS,
+    )
+    extracted = parse_extraction(response)
+    if extracted and cache is not None:
+        cache.put("extract", MODEL, user_text, extracted)
+    return extracted
 
-    # 4) CSP solving = filtrage du domaine par toutes les contraintes collectées
-    possible = solve_wordle_csp(dictionary_words, attempts)
 
-    # Si plus aucun mot ne satisfait les contraintes, il y a incohérence (erreur feedback,
-    # mot hors dictionnaire, ou extraction incorrecte)
-    if not possible:
-        return (
-            "No solution matches the current constraints.\n"
-            f"Last attempt: {guess} -> {feedback}\n"
-            f"History: {attempts}"
-        )
+# ---------------------------------------------------------------------------
+# Full agent (CSP + LLM ranking)
+# ---------------------------------------------------------------------------
+MAX_CANDIDATES_TO_LLM = 300  # plafond du classement local ; le nombre envoyé dépend de PROMPT_BUDGET
 
-    # 5) On limite le nombre de candidats envoyés au LLM (latence + coût)
-    candidates_for_llm = possible[:]
+EXTRACTION_FAILED = (
+    "Could not extract a valid attempt.\n"
+    "Expected format: 'ORATE GVVJG' or 'ORATE -> GVVJG' "
+    "(V=green, J=yellow, G=gray)."
+)
+INVALID_ATTEMPT = "Invalid guess/feedback after normalization. Please use 5 letters and V/J/G."
 
-    if len(candidates_for_llm) > MAX_CANDIDATES_TO_LLM:
-        # Heuristique simple : favoriser les mots avec plus de lettres distinctes
-        # (souvent bon pour "explorer" en Wordle)
-        candidates_for_llm = sorted(
-            candidates_for_llm, key=lambda w: len(set(w)), reverse=True
-        )[:MAX_CANDIDATES_TO_LLM]
 
-    # 6) LLM ranking : on lui donne la liste, et on lui interdit d'inventer
-    prompt_final = f"""
-You are an expert Wordle solver.
+def parse_direct(prompt_utilisateur: str) -> Optional[tuple[str, str]]:
+    """Format structuré ("ORATE GVVJG", "ORATE -> GVVJG") sans LLM ; None si le texte est libre."""
+    m = _DIRECT.match(prompt_utilisateur or "")
+    if not m:
+        return None
+    return m.group(1).upper(), m.group(2).upper()
 
-You are given a list of valid 5-letter ENGLISH words.
-You MUST choose words ONLY from this list.
-It is strictly forbidden to invent or modify any word.
 
-List of possible words:
-{candidates_for_llm}
+def parse_local(prompt_utilisateur: str) -> Optional[tuple[str, str]]:
+    """Format direct, puis phrases courantes FR/EN (nl_parser) ; None : texte ambigu, LLM nécessaire."""
+    return parse_direct(prompt_utilisateur) or parse_attempt_text(prompt_utilisateur)
 
-Return STRICTLY:
 
-Chosen word: <WORD>
+def apply_attempt(guess: str, feedback: str, dictionary_words, attempts: list,
+                  session: Optional[WordleSession] = None) -> list[str]:
+    """Ajoute la tentative à l'historique et renvoie les candidats restants."""
+    attempts.append((guess, feedback))
 
-Priority ranking:
+    # CSP solving : incrémental avec une session (seule la nouvelle contrainte est testée,
+    # sur les survivants), sinon filtrage du domaine par toutes les contraintes collectées
+    if session is not None:
+        return session.add(guess, feedback)
+    return solve_wordle_csp(dictionary_words, attempts)
 
-1. <WORD>
-2. <WORD>
-3. <WORD>
-"""
 
-    final_response = ollama.chat(
-        model="llama3.1",
-        messages=[{"role": "user", "content": prompt_final}],
+def no_solution_message(guess: str, feedback: str, attempts: list) -> str:
+    return (
+        "No solution matches the current constraints.\n"
+        f"Last attempt: {guess} -> {feedback}\n"
+        f"History: {attempts}"
     )
 
-    content = final_response["message"]["content"]
 
+def format_answer(guess: str, feedback: str, possible: list[str], decision: str, content: str,
+                  sent: Optional[int] = None) -> str:
     # Affichage "humain" : on montre un extrait des candidats CSP
     shown = ", ".join(possible[:30]) + ("..." if len(possible) > 30 else "")
 
     note = ""
-    if len(possible) > MAX_CANDIDATES_TO_LLM:
+    if sent is not None and len(possible) > sent:
         note = (
             f"\n(Note: CSP found {len(possible)} words; "
-            f"only {MAX_CANDIDATES_TO_LLM} were sent to the LLM.)\n"
+            f"the {sent} most informative fit in the prompt budget sent to the LLM.)\n"
         )
 
     return (
         f"ADDED ATTEMPT: {guess} -> {feedback}\n"
         f"POSSIBLE WORDS ({len(possible)}):\n{shown}\n"
         f"{note}\n"
-        f"LLM DECISION:\n{content}"
+        f"{decision}:\n{content}"
     )
 
+
+def interroger_agent_wordle(prompt_utilisateur: str, dictionary_words, attempts: list,
+                            session: Optional[WordleSession] = None,
+                            metrics: Optional[MetricsRecorder] = None):
+    """
+    Pipeline complet de l'agent Wordle.
+
+    Entrées :
+      - prompt_utilisateur : texte brut utilisateur (ex: "ORATE -> GVVJG" ou phrase libre)
+      - dictionary_words : liste de mots 5 lettres (domaine CSP)
+      - attempts : historique MUTABLE des tentatives [(guess, feedback), ...]
+                  (persisté entre tours côté Streamlit/session_state)
+      - session : WordleSession optionnelle (persistée elle aussi) ; si fournie,
+                  seule la nouvelle contrainte est appliquée aux candidats restants
+                  au lieu de refiltrer tout le dictionnaire avec tout l'historique
+      - metrics : MetricsRecorder optionnel ; reçoit la durée de chaque étape du tour
+
+    Étapes :
+      1) parse local : regex directe, puis parseur FR/EN (couleurs, emojis, lettres espacées)
+      2) fallback extraction via LLM si le texte reste ambigu
+      3) append dans l'historique
+      4) CSP: filtrage des candidats compatibles
+      5) classement local par information attendue (entropie) ; seuls les meilleurs
+         candidats sont envoyés au LLM (coût/latence)
+      6) LLM: propose un ranking / next guess parmi les candidats
+         (si le LLM est indisponible : réponse directe avec le classement local)
+
+    Version asynchrone (timeouts, annulation, sessions concurrentes) : async_agent.py
+    """
+    trace = TurnTrace(prompt_utilisateur)
+    try:
+        return run_pipeline(prompt_utilisateur, dictionary_words, attempts, session, trace)
+    finally:
+        if metrics is not None:
+            trace.finish()
+            metrics.record(trace)
+
+
+def messages_chars(messages: list[dict]) -> int:
+    return sum(len(m["content"]) for m in messages)
+
+
+def run_pipeline(prompt_utilisateur: str, dictionary_words, attempts: list,
+                 session: Optional[WordleSession], trace: TurnTrace) -> str:
+    # 1) Parsing local : format structuré ou phrase courante, pas besoin de LLM
+    with trace.span("parse") as span:
+        local = parse_local(prompt_utilisateur)
+        span["parsed"] = local is not None
+    if local:
+        guess, feedback = local
+    else:
+        # 2) Fallback : extraction sémantique via LLM (texte libre ambigu)
+        with trace.span("extract_llm", prompt_chars=messages_chars(extraction_messages(prompt_utilisateur))) as span:
+            extracted = extract_attempt_from_text(prompt_utilisateur)
+            span["ok"] = extracted is not None
+        if not extracted:
+            trace.attributes["outcome"] = "extraction_failed"
+            return EXTRACTION_FAILED
+        guess = extracted["guess"]
+        feedback = extracted["feedback"]
+
+    # Optionnel mais utile : revalider même après regex (cohérence + sécurité)
+    guess = normalize_guess(guess)
+    feedback = normalize_feedback(feedback)
+    if not guess or not feedback:
+        trace.attributes["outcome"] = "invalid_attempt"
+        return INVALID_ATTEMPT
+
+    # 3) + 4) Mise à jour de l'historique des contraintes, puis filtrage
+    before = len(session) if session is not None else len(dictionary_words)
+    with trace.span("filter", candidates_before=before) as span:
+        possible = apply_attempt(guess, feedback, dictionary_words, attempts, session)
+        span["candidates_after"] = len(possible)
+
+    # Si plus aucun mot ne satisfait les contraintes, il y a incohérence (erreur feedback,
+    # mot hors dictionnaire, ou extraction incorrecte)
+    if not possible:
+        trace.attributes["outcome"] = "no_solution"
+        return no_solution_message(guess, feedback, attempts)
+
+    # 5) Classement local : information attendue de chaque candidat sur l'ensemble restant.
+    #    Seuls les plus informatifs entrent dans le prompt (budget de tokens, voir prompt_budget.py).
+    with trace.span("rank_local", candidates=len(possible)) as span:
+        ranked = rank_by_entropy(possible, top=MAX_CANDIDATES_TO_LLM)
+        prompt_final, shortlist = PROMPT_BUDGET.build(ranked)
+        span["sent"] = len(shortlist)
+
+    # 6) LLM ranking : réponse structurée (tool call), même liste de candidats => même réponse (cache)
+    decision = "LLM DECISION"
+    with trace.span("rank_llm", prompt_chars=len(prompt_final), prompt_tokens=estimate_tokens(prompt_final),
+                    budget_tokens=PROMPT_BUDGET.tokens(), sent=len(shortlist)) as span:
+        try:
+            choice = RESPONSE_CACHE.get("choice", MODEL, prompt_final)
+            if choice is not None:
+                decision = "LLM DECISION (cached)"
+            else:
+                if not OLLAMA_AVAILABLE:
+                    raise RuntimeError("ollama is not installed")
+                final_response = ollama.chat(
+                    model=MODEL,
+                    messages=[{"role": "user", "content": prompt_final}],
+                    tools=CHOICE_TOOLS,
+                )
+                PROMPT_BUDGET.observe(final_response)
+                choice = parse_choice(final_response, shortlist)
+                if choice is None:
+                    raise ValueError("no valid choose_wordle_guess tool call")
+                RESPONSE_CACHE.put("choice", MODEL, prompt_final, choice)
+            content = format_choice(choice)
+        except Exception as e:
+            # Serveur arrêté, modèle absent, paquet manquant, réponse invalide... : le classement local répond seul
+            decision = f"LOCAL DECISION (LLM unavailable: {e})"
+            content = format_local_ranking(ranked)
+        span["decision"] = decision_kind(decision)
+        span["response_chars"] = len(content)
+
+    trace.attributes["outcome"] = decision_kind(decision)
+    return format_answer(guess, feedback, possible, decision, content, sent=len(shortlist))
+
+
+def decision_kind(decision: str) -> str:
+    """Intitulé de décision -> issue courte pour les métriques ("llm", "cached", "local")."""
+    if decision.startswith("LOCAL"):
+        return "local"
+    return "cached" if "cached" in decision else "llm"
+
+
+def format_local_ranking(ranked: list[tuple[str, float]], top: int = 3) -> str:
+    """Réponse au même format que le LLM, à partir du classement par entropie."""
+    lines = [f"Chosen word: {ranked[0][0]}", "", "Priority ranking:", ""]
+    lines += [f"{i}. {w} ({bits:.2f} bits)" for i, (w, bits) in enumerate(ranked[:top], 1)]
+    return "\n".join(lines)
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+
+# ---------------------------------------------------------------------------
+# Cache des réponses du LLM
+# ---------------------------------------------------------------------------
+# Les mêmes phrases libres et les mêmes listes de candidats reviennent d'une
+# partie à l'autre : inutile de réinterroger le modèle. La clé est le hachage
+# du type d'appel, du modèle et du prompt normalisé (espaces et casse ignorés) ;
+# la valeur est la réponse déjà exploitée (tentative extraite, texte de ranking).
+# Niveau mémoire borné (LRU) + niveau disque optionnel (un fichier JSON par clé).
+# Seules les réponses valides sont mises en cache : une erreur ou un délai
+# dépassé sera retenté au prochain tour.
+DEFAULT_MAX_ENTRIES = 1024
+
+
+def normalize_prompt(text: str) -> str:
+    return " ".join((text or "").split()).lower()
+
+
+class ResponseCache:
+    """
+    Cache LRU en mémoire, avec un niveau disque optionnel (directory=None : mémoire seule).
+
+    Compteurs : memory_hits, disk_hits, misses (voir stats()).
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, directory: Optional[str] = None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()  # partagé entre la boucle asyncio, ses threads et Streamlit
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(kind: str, model: str, prompt: str) -> str:
+        canonical = json.dumps([kind, model, normalize_prompt(prompt)], ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, kind: str, model: str, prompt: str):
+        """Réponse mise en cache, ou None."""
+        key = self.key(kind, model, prompt)
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.counters["memory_hits"] += 1
+                return self.entries[key]
+
+        value = self.read(key)
+        with self.lock:
+            if value is None:
+                self.counters["misses"] += 1
+                return None
+            self.counters["disk_hits"] += 1
+            self.remember(key, value)
+        return value
+
+    def put(self, kind: str, model: str, prompt: str, value):
+        key = self.key(kind, model, prompt)
+        with self.lock:
+            self.remember(key, value)
+        self.write(key, value)
+
+    def remember(self, key: str, value):
+        # À appeler sous self.lock
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def read(self, key: str):
+        if not self.directory:
+            return None
+        try:
+            with open(self.path(key), encoding="utf-8") as f:
+                return json.load(f)["value"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def write(self, key: str, value):
+        if not self.directory:
+            return
+        path = self.path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"value": value}, f, ensure_ascii=False)
+        os.replace(tmp, path)  # écriture atomique
+
+    def stats(self) -> dict:
+        with self.lock:
+            hits = self.counters["memory_hits"] + self.counters["disk_hits"]
+            total = hits + self.counters["misses"]
+            return {
+                **self.counters,
+                "hits": hits,
+                "hit_rate": hits / total if total else 0.0,
+                "entries": len(self.entries),
+            }
+
+    def clear(self, disk: bool = False):
+        with self.lock:
+            self.entries.clear()
+            self.counters = dict.fromkeys(self.counters, 0)
+        if disk and self.directory:
+            for name in os.listdir(self.directory):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.directory, name))
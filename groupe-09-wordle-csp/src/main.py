@@ -1,3 +1,4 @@
+import os
 import sys
 
 # ---------------------------------------------------------------------------
@@ -14,7 +15,7 @@ try:
 except Exception:
     KEYBOARD_AVAILABLE = False
 
-from llm_agent import interroger_agent_wordle, load_dictionary
+from service_client import GameClient, service_url
 
 
 def main():
@@ -22,7 +23,8 @@ def main():
     Point d'entrée CLI pour piloter le solver Wordle (CSP + Ollama).
 
     Fonctionnement :
-      - charge un dictionnaire de mots ("wordle.txt")
+      - client du service local (wordle_service.py) : WORDLE_SERVICE=<url> pour un
+        service déjà lancé, sinon un service est démarré dans ce processus
       - boucle d'interaction :
             l'utilisateur saisit une tentative (guess + feedback)
             l'agent :
@@ -34,18 +36,20 @@ def main():
     print("--- Wordle Solver (Ollama + CSP) ---")
     print("Input format: GUESS FEEDBACK  (V=green, J=yellow, G=gray)")
     print("Examples: ORATE GVVJG   |   ORATE -> GVVJG")
+    print("Undo the last attempt: type 'undo'.")
+    print("Per-stage latency (p50/p95) of this session: type 'stats'.")
+    print("Cancel a slow answer: press Ctrl+C while thinking.")
     print("Quit: type 'quit' or press Ctrl+C.\n")
 
-    # 1) Chargement du dictionnaire (domaine CSP)
-    dictionary = load_dictionary("wordle.txt")
-    if not dictionary:
-        # Si le dictionnaire est vide, le solver ne peut pas fonctionner.
-        print("Dictionary is empty. Please check 'wordle.txt'.")
+    # 1) + 2) Service : dictionnaire (chargé une fois, en mémoire partagée), historique
+    #    des tentatives et candidats restants sont gardés côté service, par session
+    try:
+        game = GameClient(service_url(os.environ.get("WORDLE_SERVICE")))
+    except Exception as e:
+        # Dictionnaire vide / introuvable, service injoignable...
+        print(f"Cannot start the solver: {e}")
         sys.exit(1)
 
-    # 2) Historique des tentatives (contraintes) conservé pendant la session
-    attempts = []
-
     # 3) Boucle interactive
     while True:
         try:
@@ -53,23 +57,45 @@ def main():
         except (EOFError, KeyboardInterrupt):
             # EOF (Ctrl+D) ou interruption (Ctrl+C) : sortie propre
             print("\nShutting down... Goodbye!")
-            sys.exit(0)
+            shutdown(game)
 
         if KEYBOARD_AVAILABLE and keyboard.is_pressed("esc"):
             print("Shutting down... Goodbye!")
-            sys.exit(0)
+            shutdown(game)
 
         if not user_text:
             # Entrée vide : on redemande
             continue
 
+        if user_text.lower() == "undo":
+            # On revient aux candidats d'avant la dernière tentative (pile de la session)
+            result = game.undo()
+            undone = result["undone"]
+            if undone is None:
+                print("Nothing to undo.\n")
+            else:
+                print(f"Undone: {undone[0]} -> {undone[1]} ({result['candidates']} candidates left).\n")
+            continue
+
+        if user_text.lower() == "stats":
+            rows = game.metrics()["summary"]
+            if not rows:
+                print("No turn measured yet.\n")
+            for row in rows:
+                print(f"{row['stage']:>12}: n={row['count']:<4} p50={row['p50_ms']:.1f}ms  p95={row['p95_ms']:.1f}ms")
+            print()
+            continue
+
         print("\nThinking...\n")
 
         try:
-            # L'agent modifie `attempts` (il append la tentative validée).
-            # Il renvoie une string prête à afficher.
-            result = interroger_agent_wordle(user_text, dictionary, attempts)
-            print(result)
+            # Le service ajoute la tentative validée à l'historique de la session
+            # et renvoie une string prête à afficher.
+            result = game.play(user_text)
+            print(result["answer"])
+        except KeyboardInterrupt:
+            # Ctrl+C pendant la réflexion : on annule le tour, pas la session
+            print("Cancelled.")
         except Exception as e:
             # On catch pour éviter de casser la session CLI sur une erreur ponctuelle
             print(f"Error: {e}")
@@ -77,5 +103,18 @@ def main():
         print("\n" + "-" * 60 + "\n")
 
 
+def shutdown(game: GameClient):
+    # Traces par étape de la session (WORDLE_METRICS=fichier.jsonl), puis fermeture de la session
+    try:
+        path = os.environ.get("WORDLE_METRICS")
+        if path:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(game.metrics()["jsonl"])
+        game.close()
+    except Exception:
+        pass
+    sys.exit(0)
+
+
 if __name__ == "__main__":
     main()
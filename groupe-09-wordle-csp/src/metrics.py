@@ -0,0 +1,112 @@
+import json
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Optional
+
+
+# ---------------------------------------------------------------------------
+# Mesure de latence par étape
+# ---------------------------------------------------------------------------
+# Un tour de l'agent est un TurnTrace : une liste de spans (étape, durée en ms,
+# attributs : nombre de candidats, taille des prompts, cache...). Le
+# MetricsRecorder garde les derniers tours d'une session, les exporte en JSON
+# lines et résume p50 / p95 par étape.
+# Étapes : parse (local), extract_llm, filter (CSP), rank_local (entropie), rank_llm.
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Rang le plus proche : plus petite valeur dont au moins q % des mesures sont inférieures ou égales."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))]
+
+
+class TurnTrace:
+
+    def __init__(self, prompt: str = ""):
+        self.timestamp = time.time()
+        self.start = time.perf_counter()
+        self.spans = []
+        self.attributes = {"input_chars": len(prompt or "")}
+        self.total_ms = None
+
+    @contextmanager
+    def span(self, stage: str, **attributes):
+        # Les attributs connus seulement à la fin (candidats restants, réponse...) s'ajoutent au dict renvoyé
+        record = {"stage": stage, **attributes}
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["ms"] = round((time.perf_counter() - start) * 1000, 3)
+            self.spans.append(record)
+
+    def add(self, stage: str, ms: float, **attributes):
+        """Span mesuré ailleurs (ex. dans un processus de calcul)."""
+        self.spans.append({"stage": stage, **attributes, "ms": round(ms, 3)})
+
+    def finish(self, default_outcome: str = "error"):
+        # L'issue est posée par le pipeline (attributes["outcome"]) ; sinon le tour a levé une exception
+        self.total_ms = round((time.perf_counter() - self.start) * 1000, 3)
+        self.attributes.setdefault("outcome", default_outcome)
+
+    def to_dict(self) -> dict:
+        return {"timestamp": self.timestamp, "total_ms": self.total_ms, **self.attributes, "spans": self.spans}
+
+
+class MetricsRecorder:
+    """
+    Derniers tours mesurés (max_turns) ; path : fichier JSON lines complété à chaque tour (optionnel).
+    """
+
+    def __init__(self, path: Optional[str] = None, max_turns: int = 1000):
+        self.path = path
+        self.turns = deque(maxlen=max_turns)
+        self.lock = threading.Lock()
+
+    def record(self, trace: TurnTrace):
+        turn = trace.to_dict()
+        with self.lock:
+            self.turns.append(turn)
+            if self.path:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(turn, ensure_ascii=False) + "\n")
+
+    def to_jsonl(self) -> str:
+        with self.lock:
+            return "".join(json.dumps(turn, ensure_ascii=False) + "\n" for turn in self.turns)
+
+    def export_jsonl(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_jsonl())
+
+    def last(self) -> Optional[dict]:
+        with self.lock:
+            return self.turns[-1] if self.turns else None
+
+    def summary(self) -> list[dict]:
+        """Une ligne par étape (plus "total") : nombre de mesures, p50 / p95 / max en ms."""
+        with self.lock:
+            turns = list(self.turns)
+        durations = {}
+        for turn in turns:
+            for span in turn["spans"]:
+                durations.setdefault(span["stage"], []).append(span["ms"])
+            if turn["total_ms"] is not None:
+                durations.setdefault("total", []).append(turn["total_ms"])
+        return [
+            {
+                "stage": stage,
+                "count": len(values),
+                "p50_ms": percentile(values, 50),
+                "p95_ms": percentile(values, 95),
+                "max_ms": max(values),
+            }
+            for stage, values in durations.items()
+        ]
+
+    def clear(self):
+        with self.lock:
+            self.turns.clear()
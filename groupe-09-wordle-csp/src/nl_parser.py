@@ -0,0 +1,182 @@
+import re
+import unicodedata
+from typing import Optional
+
+
+# ---------------------------------------------------------------------------
+# Parseur local de tentatives en texte libre (FR / EN)
+# ---------------------------------------------------------------------------
+# Évite l'aller-retour LLM pour les formulations courantes :
+#   "j'ai joué orate et j'ai eu g v v j g"
+#   "I played crane: green yellow gray gray green"
+#   "CRANE 🟩🟨⬜⬜🟩"        "crane → gybbg"        "o vert, r jaune, a gris, t gris, e vert"
+#   "o r a t e g v v j g"   (lettres espacées)
+# Le texte est découpé en jetons (mots, lettres isolées, couleurs, carrés emoji),
+# puis on cherche UN feedback et UN guess. Au moindre doute (plusieurs feedbacks,
+# plusieurs mots candidats sans indice pour trancher), on renvoie None : le LLM
+# prend le relais. Notation interne : V = vert, J = jaune, G = gris.
+EMOJI = {
+    "🟩": "V", "🟢": "V",
+    "🟨": "J", "🟡": "J", "🟧": "J",
+    "⬜": "G", "⬛": "G", "◻": "G", "◼": "G", "⚪": "G", "⚫": "G",
+}
+COLOUR_WORDS = {
+    "vert": "V", "verte": "V", "verts": "V", "vertes": "V", "green": "V",
+    "jaune": "J", "jaunes": "J", "yellow": "J",
+    "gris": "G", "grise": "G", "grises": "G", "gray": "G", "grey": "G", "black": "G", "noir": "G", "white": "G",
+    "blanc": "G",
+}
+FRENCH_CODES = set("vjg")                                  # convention du projet
+ENGLISH_CODES = {"g": "V", "y": "J", "b": "G", "x": "G", "w": "G"}  # g=green, y=yellow, b/x/w=gris
+
+# Mots qui introduisent le guess, et mots de 5 lettres fréquents dans les phrases (jamais le guess)
+CUE_WORDS = {
+    "joue", "jouee", "propose", "tente", "essaye", "teste", "mot", "guess", "guessed", "played", "tried",
+    "word", "entered", "typed", "avec",
+}
+STOP_WORDS = {
+    "guess", "tried", "essai", "avais", "avait", "etait", "apres", "voici", "quand", "comme", "jouee", "jouer",
+    "donne", "alors", "cette", "votre", "notre", "entre", "merci", "salut", "there", "their", "about",
+    "which", "first", "would", "after", "again", "these", "those", "where", "while", "typed", "place", "words",
+    "today", "hello", "thank", "right", "wrong", "maybe", "voila",
+} | set(COLOUR_WORDS)
+CONJUNCTIONS = {"and", "et", "puis", "then", "or", "ou"}
+
+ARROWS = re.compile(r"(?:->|=>|→|⇒|➡️?|⟶|:)")
+
+
+def tokenize(text: str) -> list[tuple[str, bool]]:
+    """Jetons (minuscules, sans accents) + indicateur "écrit en majuscules" dans le texte d'origine."""
+    for emoji, code in EMOJI.items():
+        text = text.replace(emoji, f" <{code}> ")
+    text = text.replace("\ufe0f", "")  # sélecteur de variante des emojis
+    text = ARROWS.sub(" -> ", text)
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+
+    tokens = []
+    for match in re.finditer(r"[A-Za-z]+|<[VJG]>|->", text):
+        raw = match.group(0)
+        if raw.startswith("<") or raw == "->":
+            tokens.append((raw, False))
+        else:
+            tokens.append((raw.lower(), len(raw) > 1 and raw.isupper()))
+    return tokens
+
+
+def letters_to_feedback(letters: str) -> Optional[str]:
+    """'gvvjg' -> 'GVVJG' (convention V/J/G) ; 'gybbg' -> 'VJGGV' (convention anglaise)."""
+    if len(letters) != 5:
+        return None
+    if set(letters) <= FRENCH_CODES:
+        return letters.upper()
+    if set(letters) <= set(ENGLISH_CODES) and set(letters) & {"y", "b", "x", "w"}:
+        return "".join(ENGLISH_CODES[c] for c in letters)
+    return None
+
+
+def colour(token: str) -> Optional[str]:
+    if token.startswith("<"):
+        return token[1]
+    return COLOUR_WORDS.get(token)
+
+
+def find_feedbacks(tokens: list[tuple[str, bool]]):
+    """
+    Feedbacks possibles : (feedback, guess épelé ou None, indices des jetons utilisés).
+
+    Formes reconnues : jeton de 5 codes, 5 couleurs / emojis consécutifs, 5 lettres
+    isolées consécutives (10 si le guess est épelé devant), 5 paires lettre + couleur.
+    """
+    found = []
+    words = [t for t, _ in tokens]
+    n = len(words)
+
+    for i, word in enumerate(words):
+        feedback = letters_to_feedback(word) if len(word) == 5 else None
+        if feedback:
+            found.append((feedback, None, {i}))
+
+    i = 0
+    while i < n:
+        # Couleurs / emojis consécutifs
+        j = i
+        while j < n and colour(words[j]):
+            j += 1
+        if j - i == 5:
+            found.append(("".join(colour(w) for w in words[i:j]), None, set(range(i, j))))
+        if j > i:
+            i = j
+            continue
+
+        # Lettres isolées consécutives
+        j = i
+        while j < n and len(words[j]) == 1:
+            j += 1
+        run = "".join(words[i:j])
+        if j - i == 5 and letters_to_feedback(run):
+            found.append((letters_to_feedback(run), None, set(range(i, j))))
+        elif j - i == 10 and letters_to_feedback(run[5:]):
+            found.append((letters_to_feedback(run[5:]), run[:5], set(range(i, j))))
+        if j > i:
+            i = j
+            continue
+        i += 1
+
+    # Paires lettre + couleur : "o vert r jaune a gris t gris e vert"
+    for start in range(n - 9):
+        pairs = words[start:start + 10]
+        if all(len(pairs[k]) == 1 for k in range(0, 10, 2)) and all(colour(pairs[k]) for k in range(1, 10, 2)):
+            guess = "".join(pairs[0:10:2])
+            feedback = "".join(colour(pairs[k]) for k in range(1, 10, 2))
+            found.append((feedback, guess, set(range(start, start + 10))))
+    return found
+
+
+def pick_guess(tokens: list[tuple[str, bool]], used: set[int]) -> Optional[str]:
+    candidates = []
+    for i, (word, upper) in enumerate(tokens):
+        if i in used or len(word) != 5 or not word.isalpha() or word in STOP_WORDS:
+            continue
+        after_cue = i > 0 and tokens[i - 1][0] in CUE_WORDS
+        before_arrow = i + 1 < len(tokens) and tokens[i + 1][0] == "->"
+        candidates.append((word, upper, after_cue, before_arrow))
+
+    words = {c[0] for c in candidates}
+    if len(words) == 1:
+        return words.pop().upper()
+
+    # "crane et slate" : deux mots joués, on ne sait pas auquel se rapporte le feedback
+    positions = [i for i, (word, _) in enumerate(tokens) if word in words and i not in used]
+    for left, right in zip(positions, positions[1:]):
+        between = {word for word, _ in tokens[left + 1:right]}
+        if between and between <= CONJUNCTIONS:
+            return None
+
+    # Plusieurs mots possibles : un indice doit désigner un seul d'entre eux
+    for hint in (1, 2, 3):  # écrit en majuscules, puis après "joué"/"played"..., puis devant une flèche
+        hinted = {c[0] for c in candidates if c[hint]}
+        if len(hinted) == 1:
+            return hinted.pop().upper()
+    return None
+
+
+def parse_attempt_text(text: str) -> Optional[tuple[str, str]]:
+    """
+    (GUESS, FEEDBACK) extraits sans LLM, ou None si le texte est ambigu / incomplet.
+    """
+    tokens = tokenize(text or "")
+    feedbacks = find_feedbacks(tokens)
+
+    # Le feedback doit être unique (un même feedback trouvé sous deux formes imbriquées compte une fois)
+    distinct = {(feedback, guess) for feedback, guess, _ in feedbacks}
+    if len(distinct) != 1:
+        return None  # aucun feedback, ou plusieurs feedbacks différents
+    feedback, guess = distinct.pop()
+    used = set().union(*(indices for _, _, indices in feedbacks))
+
+    if guess is None:
+        guess = pick_guess(tokens, used)
+    if guess is None or not re.fullmatch(r"[A-Za-z]{5}", guess):
+        return None
+    return guess.upper(), feedback
@@ -0,0 +1,160 @@
+import json
+import math
+import os
+import threading
+from typing import Optional
+
+
+# ---------------------------------------------------------------------------
+# Prompt de ranking sous budget de tokens
+# ---------------------------------------------------------------------------
+# La durée d'un appel au LLM croît avec la taille du prompt. Plutôt qu'un
+# plafond fixe de mots, les candidats (déjà classés par entropie, le meilleur
+# en premier) sont écrits séparés par des espaces et ajoutés tant que leur
+# coût estimé tient dans un budget de tokens. Le budget suit le débit
+# d'évaluation du prompt mesuré sur les réponses d'Ollama
+# (prompt_eval_count / prompt_eval_duration) : le prompt est dimensionné pour
+# être évalué en TARGET_SECONDS environ, entre MIN_TOKENS et MAX_TOKENS.
+# La réponse est un tool call (choose_wordle_guess) lu comme un dict, sans regex.
+CHARS_PER_TOKEN = 3.0     # mots de 5 majuscules + espace ≈ 2 tokens (estimation prudente)
+MIN_CANDIDATES = 3
+DEFAULT_TOKENS = 80       # avant toute mesure : ≈ 40 mots, l'ancien plafond fixe
+MIN_TOKENS = 20
+MAX_TOKENS = int(os.environ.get("WORDLE_PROMPT_TOKENS") or 600)
+TARGET_SECONDS = 0.5      # durée visée pour l'évaluation de la liste des candidats
+SMOOTHING = 0.3           # poids d'une nouvelle mesure dans la moyenne glissante du débit
+
+CHOICE_TOOL = "choose_wordle_guess"
+CHOICE_TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": CHOICE_TOOL,
+            "description": "Choose the next Wordle guess among the candidates",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "chosen": {"type": "string", "description": "the next guess, copied from the candidates"},
+                    "ranking": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "up to 3 candidates, best first",
+                    },
+                },
+                "required": ["chosen", "ranking"],
+                "additionalProperties": False,
+            },
+        },
+    }
+]
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def ranking_prompt(candidates: list[str]) -> str:
+    """Prompt de ranking : consignes fixes (préfixe réutilisable par Ollama), puis les candidats."""
+    return (
+        "You are an expert Wordle solver.\n"
+        "Choose the next guess ONLY among the candidates below (valid 5-letter English words, "
+        "best expected information first). Never invent or modify a word.\n"
+        f"You MUST answer with a tool call to {CHOICE_TOOL}.\n\n"
+        f"Candidates: {' '.join(candidates)}"
+    )
+
+
+class PromptBudget:
+    """
+    Budget de tokens des candidats, ajusté au débit mesuré du modèle.
+
+    Partagé par les tours et les sessions (thread-safe) ; observe() après chaque réponse.
+    """
+
+    def __init__(self, max_tokens: int = MAX_TOKENS, min_tokens: int = MIN_TOKENS,
+                 target_seconds: float = TARGET_SECONDS, initial_tokens: int = DEFAULT_TOKENS):
+        self.max_tokens = max_tokens
+        self.min_tokens = min_tokens
+        self.target_seconds = target_seconds
+        self.initial_tokens = initial_tokens
+        self.rate = None  # tokens/s d'évaluation du prompt (moyenne glissante), None avant la 1re mesure
+        self.lock = threading.Lock()
+
+    def tokens(self) -> int:
+        with self.lock:
+            rate = self.rate
+        budget = self.initial_tokens if rate is None else int(rate * self.target_seconds)
+        return max(self.min_tokens, min(self.max_tokens, budget))
+
+    def observe(self, response):
+        # Ollama omet ces champs (ou les met à 0) quand tout le prompt était déjà en cache
+        count = response.get("prompt_eval_count") or 0
+        duration = response.get("prompt_eval_duration") or 0  # ns
+        if count <= 0 or duration <= 0:
+            return
+        rate = count / (duration / 1e9)
+        with self.lock:
+            self.rate = rate if self.rate is None else (1 - SMOOTHING) * self.rate + SMOOTHING * rate
+
+    def pack(self, ranked: list[tuple[str, float]]) -> list[str]:
+        """Meilleurs candidats d'abord, tant que le budget le permet (au moins MIN_CANDIDATES)."""
+        budget = self.tokens()
+        shortlist, used = [], 0
+        for word, _ in ranked:
+            cost = estimate_tokens(f" {word}")
+            if used + cost > budget and len(shortlist) >= MIN_CANDIDATES:
+                break
+            shortlist.append(word)
+            used += cost
+        return shortlist
+
+    def build(self, ranked: list[tuple[str, float]]) -> tuple[str, list[str]]:
+        """(prompt, candidats envoyés)."""
+        shortlist = self.pack(ranked)
+        return ranking_prompt(shortlist), shortlist
+
+    def stats(self) -> dict:
+        with self.lock:
+            rate = self.rate
+        return {"prompt_tokens_per_s": rate, "budget_tokens": self.tokens()}
+
+
+def parse_choice(response, shortlist: list[str]) -> Optional[dict]:
+    """
+    Lit le tool call de choix : {"chosen": "CRANE", "ranking": [...]} ou None.
+
+    Le mot choisi doit faire partie des candidats envoyés ; le classement ne garde
+    que des candidats (sans doublon) et commence par le mot choisi.
+    """
+    msg = response.get("message", {}) or {}
+    tool_calls = msg.get("tool_calls") or []
+    if not tool_calls:
+        return None
+
+    args = tool_calls[0]["function"]["arguments"]
+    if isinstance(args, str):
+        try:
+            args = json.loads(args)
+        except json.JSONDecodeError:
+            return None
+    if not isinstance(args, dict):
+        return None
+
+    allowed = set(shortlist)
+    chosen = str(args.get("chosen", "")).strip().upper()
+    if chosen not in allowed:
+        return None
+    ranking = args.get("ranking") if isinstance(args.get("ranking"), list) else []
+    ordered = [chosen]
+    for word in ranking:
+        word = str(word).strip().upper()
+        if word in allowed and word not in ordered:
+            ordered.append(word)
+    return {"chosen": chosen, "ranking": ordered[:3]}
+
+
+def format_choice(choice: dict) -> str:
+    """Même présentation que le classement local (Chosen word + Priority ranking)."""
+    lines = [f"Chosen word: {choice['chosen']}", "", "Priority ranking:", ""]
+    lines += [f"{i}. {w}" for i, w in enumerate(choice["ranking"], 1)]
+    return "\n".join(lines)
@@ -0,0 +1,139 @@
+import numpy as np
+
+from csp_solver import encode_words
+
+
+# ---------------------------------------------------------------------------
+# Classement des candidats par information attendue (entropie)
+# ---------------------------------------------------------------------------
+# Pour un guess g, chaque secret possible s produit un feedback ; les 3^5 = 243
+# feedbacks partitionnent les candidats. Plus la partition est fine, plus la
+# tentative apporte d'information : E[g] = -somme p_k log2 p_k (en bits).
+# Les feedbacks sont calculés par lots sous forme de codes entiers
+# (G=0, J=1, V=2 en base 3), puis comptés avec un seul bincount par lot.
+PATTERNS = 3 ** 5
+MAX_PAIRS = 3_000_000      # au-delà de (candidats x secrets), l'entropie est estimée sur un
+MIN_SECRETS = 250          # échantillon régulier de secrets (jamais moins de MIN_SECRETS)
+MAX_GUESSES = 4_000        # classement partiel (top) : guess présélectionnés par fréquence des lettres
+BATCH_PAIRS = 1_000_000    # taille d'un lot (guess x secret), borne la mémoire temporaire
+
+
+def letter_counts(letters: np.ndarray) -> np.ndarray:
+    """(27, N) uint8 : occurrences de chaque lettre dans chaque mot (une ligne contiguë par lettre)."""
+    n = len(letters)
+    rows = np.repeat(np.arange(n), 5)
+    counts = np.bincount(rows * 27 + letters.ravel(), minlength=n * 27).reshape(n, 27)
+    return np.ascontiguousarray(counts.T.astype(np.uint8))
+
+
+def feedback_codes(guesses: np.ndarray, secrets: np.ndarray, secret_counts: np.ndarray = None) -> np.ndarray:
+    """
+    Codes de feedback (B, S) uint8 pour des matrices de lettres (B, 5) et (S, 5).
+
+    Même règle que wordle_feedback_vjg : les jaunes d'une lettre sont attribués
+    de gauche à droite, dans la limite des occurrences non vertes du secret.
+    secret_counts : letter_counts(secrets), à passer si on le calcule déjà.
+    """
+    if secret_counts is None:
+        secret_counts = letter_counts(secrets)
+    guess_cols = [np.ascontiguousarray(guesses[:, i])[:, None] for i in range(5)]
+    secret_cols = [np.ascontiguousarray(secrets[:, i])[None, :] for i in range(5)]
+    green = [guess_cols[i] == secret_cols[i] for i in range(5)]
+
+    codes = np.zeros((len(guesses), len(secrets)), dtype=np.uint8)
+    for i in range(5):
+        present = secret_counts[guesses[:, i]]  # (B, S) : occurrences de g_i dans le secret
+        same = {j: guess_cols[i] == guess_cols[j] for j in range(5) if j != i}
+        same = {j: eq for j, eq in same.items() if eq.any()}  # positions portant la même lettre
+        if not same:
+            # g_i n'est pas répétée : jaune <=> lettre présente ailleurs (vert implique présente)
+            digit = green[i].view(np.uint8) + (present > 0)
+        else:
+            # Occurrences non vertes de g_i dans le secret, moins celles déjà consommées à gauche
+            remaining = present.astype(np.int8) - green[i]
+            before = np.zeros(codes.shape, dtype=np.int8)
+            for j, eq in same.items():
+                remaining -= green[j] & eq
+                if j < i:
+                    before += ~green[j] & eq
+            digit = 2 * green[i] + (~green[i] & (before < remaining))
+        codes += digit.astype(np.uint8) * np.uint8(3 ** i)
+    return codes
+
+
+def letter_scores(guesses: np.ndarray, secrets: np.ndarray) -> np.ndarray:
+    """
+    Score grossier de chaque guess, pour présélectionner ceux dont on calcule l'entropie :
+    nombre de secrets ayant la même lettre à la même position (verts probables), plus
+    nombre de secrets contenant chacune de ses lettres distinctes (jaunes probables).
+    """
+    contains = (letter_counts(secrets) > 0).sum(axis=1)                      # (27,)
+    at = np.stack([np.bincount(secrets[:, i], minlength=27) for i in range(5)])  # (5, 27)
+    score = at[np.arange(5), guesses].sum(axis=1)
+    ordered = np.sort(guesses, axis=1)
+    distinct = np.ones(ordered.shape, dtype=bool)
+    distinct[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    return score + (contains[ordered] * distinct).sum(axis=1)
+
+
+def entropies(guesses: np.ndarray, secrets: np.ndarray) -> np.ndarray:
+    """Information attendue (bits) de chaque guess, les secrets étant équiprobables."""
+    result = np.empty(len(guesses))
+    secret_counts = letter_counts(secrets)
+
+    # Regroupement par motif de lettres répétées (ex. positions 1 et 3 identiques) : dans un
+    # lot homogène, seules les positions réellement répétées passent par le calcul complet
+    motif = np.zeros(len(guesses), dtype=np.int32)
+    bit = 0
+    for i in range(5):
+        for j in range(i + 1, 5):
+            motif |= (guesses[:, i] == guesses[:, j]).astype(np.int32) << bit
+            bit += 1
+
+    batch = max(1, BATCH_PAIRS // max(1, len(secrets)))
+    for key in np.unique(motif):
+        group = np.flatnonzero(motif == key)
+        for start in range(0, len(group), batch):
+            index = group[start:start + batch]
+            codes = feedback_codes(guesses[index], secrets, secret_counts)
+            rows = np.arange(len(index), dtype=np.intp)[:, None] * PATTERNS
+            hist = np.bincount((rows + codes).ravel(), minlength=len(index) * PATTERNS)
+            hist = hist.reshape(len(index), PATTERNS)
+            p = hist / len(secrets)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                result[index] = -np.where(hist > 0, p * np.log2(p), 0.0).sum(axis=1)
+    return result
+
+
+def rank_by_entropy(words: list[str], top: int = None, max_pairs: int = MAX_PAIRS,
+                    max_guesses: int = MAX_GUESSES) -> list[tuple[str, float]]:
+    """
+    Classe les candidats (qui sont aussi les secrets possibles) par information attendue.
+
+    Avec top, au-delà de max_guesses candidats (et de top), seuls les max_guesses meilleurs
+    selon letter_scores sont évalués : ~45 ms au lieu de ~190 ms sur le dictionnaire complet
+    (21 953 mots), avec les mêmes 300 premiers. Sans top, tous les candidats sont évalués.
+
+    Retour
+    ------
+    list[tuple[str, float]]
+        (mot, entropie en bits), du plus informatif au moins informatif ;
+        à entropie égale, l'ordre d'origine est conservé.
+    """
+    if not words:
+        return []
+    letters = encode_words(words)
+    secrets = letters
+    n_secrets = max(MIN_SECRETS, max_pairs // len(words))
+    if len(words) > n_secrets:
+        secrets = letters[np.linspace(0, len(words) - 1, n_secrets).astype(np.intp)]
+
+    pool = np.arange(len(words))
+    if top is not None and len(words) > max(max_guesses, top):
+        pool = np.sort(np.argsort(-letter_scores(letters, secrets), kind="stable")[:max(max_guesses, top)])
+
+    scores = entropies(letters[pool], secrets)
+    order = np.argsort(-scores, kind="stable")
+    if top is not None:
+        order = order[:top]
+    return [(words[pool[i]], float(scores[i])) for i in order]
@@ -0,0 +1,126 @@
+import atexit
+import http.client
+import json
+import threading
+from typing import Optional
+from urllib.parse import urlsplit
+
+
+# ---------------------------------------------------------------------------
+# Client du service local (main.py, app.py)
+# ---------------------------------------------------------------------------
+# Une partie = une session du service (wordle_service.py). Le client garde une
+# connexion HTTP/1.1 ouverte et ne connaît que l'identifiant de session :
+# dictionnaire, candidats, historique et métriques restent côté service.
+# Sans URL (variable WORDLE_SERVICE absente), un service est lancé dans le
+# processus courant, partagé par toutes les parties de ce processus.
+REQUEST_TIMEOUT = 300.0  # s ; les délais LLM sont gérés par le service
+
+_embedded = {}
+_embedded_lock = threading.Lock()
+
+
+def service_url(url: Optional[str] = None, dictionary: str = "wordle.txt") -> str:
+    """URL du service : celle donnée, sinon celle d'un service lancé dans ce processus (une seule fois)."""
+    if url:
+        return url.rstrip("/")
+    with _embedded_lock:
+        if "service" not in _embedded:
+            from wordle_service import WordleService
+
+            service = WordleService(dictionary)
+            service.start()
+            atexit.register(service.stop)  # libère la mémoire partagée à la sortie
+            _embedded["service"] = service
+        return _embedded["service"].url
+
+
+class ServiceError(Exception):
+    pass
+
+
+class GameClient:
+    """
+    Une partie jouée par le service.
+
+    Usage :
+        game = GameClient(service_url(os.environ.get("WORDLE_SERVICE")))
+        print(game.play("ORATE GVVJG")["answer"])
+    """
+
+    def __init__(self, url: str, timeout: float = REQUEST_TIMEOUT):
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.timeout = timeout
+        self.connection = None
+        self.lock = threading.Lock()
+        self.session = self.request("POST", "/sessions")["session"]
+
+    def connect(self) -> http.client.HTTPConnection:
+        if self.connection is None:
+            self.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return self.connection
+
+    def reset_connection(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def request(self, method: str, path: str, body: Optional[dict] = None) -> dict:
+        data = json.dumps(body or {}).encode("utf-8")
+        with self.lock:
+            for retry in (True, False):
+                try:
+                    connection = self.connect()
+                    connection.request(method, path, data, {"Content-Type": "application/json"})
+                    response = connection.getresponse()
+                    payload = json.loads(response.read() or b"{}")
+                    break
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    # Connexion keep-alive fermée par le service entre deux requêtes : une seule reprise
+                    self.reset_connection()
+                    if not retry:
+                        raise
+                except BaseException:
+                    self.reset_connection()  # réponse en cours abandonnée (Ctrl+C, délai) : connexion inutilisable
+                    raise
+        if response.status >= 400:
+            raise ServiceError(payload.get("error", f"HTTP {response.status}"))
+        return payload
+
+    def path(self, action: str = "") -> str:
+        return f"/sessions/{self.session}" + (f"/{action}" if action else "")
+
+    def play(self, prompt: str) -> dict:
+        """Un tour : {"answer": texte, "attempts": [[guess, feedback], ...], "candidates": n}. Ctrl+C annule le tour."""
+        try:
+            return self.request("POST", self.path("turn"), {"prompt": prompt})
+        except KeyboardInterrupt:
+            self.cancel()
+            raise
+
+    def cancel(self) -> bool:
+        return self.request("POST", self.path("cancel"))["cancelled"]
+
+    def undo(self) -> dict:
+        """{"undone": [guess, feedback] ou None, "attempts", "candidates"}."""
+        return self.request("POST", self.path("undo"))
+
+    def reset(self) -> dict:
+        return self.request("POST", self.path("reset"))
+
+    def state(self) -> dict:
+        return self.request("GET", self.path())
+
+    def metrics(self) -> dict:
+        """{"last": dernier tour, "summary": p50 / p95 par étape, "jsonl": tous les tours en JSON lines}."""
+        return self.request("GET", self.path("metrics"))
+
+    def stats(self) -> dict:
+        return self.request("GET", "/stats")
+
+    def close(self):
+        try:
+            self.request("DELETE", self.path())
+        finally:
+            self.reset_connection()
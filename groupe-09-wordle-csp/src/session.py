@@ -0,0 +1,95 @@
+from typing import Optional
+
+import numpy as np
+
+from csp_solver import WordMatrix, clean_attempt, compile_attempts
+
+
+# ---------------------------------------------------------------------------
+# Session incrémentale
+# ---------------------------------------------------------------------------
+# solve_wordle_csp refiltre tout le dictionnaire avec tout l'historique à chaque
+# tour. Or l'ensemble des candidats ne fait que diminuer : une nouvelle
+# contrainte n'a besoin d'être testée que sur les mots qui ont survécu aux
+# précédentes. La session garde donc les indices des survivants et une pile
+# des états précédents (pour annuler une tentative). Chaque contrainte passe
+# par le filtre compilé (masques par position + bornes d'occurrences).
+class WordleSession:
+    """
+    Partie Wordle en cours : domaine CSP + candidats restants + historique.
+
+    Attributs
+    ---------
+    words : list[str]
+        Dictionnaire normalisé (majuscules, 5 lettres), jamais modifié.
+    matrix : WordMatrix
+        Le même dictionnaire, compilé pour le filtre vectorisé.
+    candidates : np.ndarray
+        Indices (dans words) des mots compatibles avec toutes les tentatives.
+    history : list[tuple[str, str, np.ndarray]]
+        Pile des tentatives (guess, feedback, candidats AVANT la tentative).
+        L'annulation dépile simplement le dernier état : pas de recalcul.
+    """
+
+    def __init__(self, dictionary_words):
+        self.matrix = dictionary_words if isinstance(dictionary_words, WordMatrix) else WordMatrix(dictionary_words)
+        self.words = self.matrix.words
+        self.candidates = np.arange(len(self.words))
+        self.history = []
+
+    @property
+    def attempts(self) -> list[tuple[str, str]]:
+        return [(guess, fb) for guess, fb, _ in self.history]
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def possible_words(self) -> list[str]:
+        return [self.words[i] for i in self.candidates]
+
+    def add(self, guess: str, feedback: str) -> list[str]:
+        """
+        Ajoute une tentative et ne filtre que les candidats restants.
+
+        Coût ≈ O(nombre de candidats restants), indépendant de la taille du
+        dictionnaire et de la longueur de l'historique.
+
+        Retour
+        ------
+        list[str]
+            Les mots encore possibles (même résultat que solve_wordle_csp
+            sur le dictionnaire complet avec tout l'historique).
+        """
+        attempt = clean_attempt((guess, feedback))
+        if attempt is None:
+            raise ValueError(f"Tentative invalide : {guess!r} -> {feedback!r}")
+        guess, fb = attempt
+
+        self.history.append((guess, fb, self.candidates))
+        subset = None if len(self.candidates) == len(self.words) else self.candidates  # évite une copie au 1er tour
+        self.candidates = self.matrix.filter(compile_attempts([(guess, fb)]), subset)
+        return self.possible_words()
+
+    def push(self, guess: str, feedback: str, candidates: np.ndarray) -> list[str]:
+        """
+        Enregistre une tentative déjà filtrée ailleurs (processus de calcul du service) :
+        candidates = indices des survivants, calculés sur le même dictionnaire.
+        """
+        attempt = clean_attempt((guess, feedback))
+        if attempt is None:
+            raise ValueError(f"Tentative invalide : {guess!r} -> {feedback!r}")
+        self.history.append((*attempt, self.candidates))
+        self.candidates = candidates
+        return self.possible_words()
+
+    def undo(self) -> Optional[tuple[str, str]]:
+        """Annule la dernière tentative ; renvoie (guess, feedback) ou None si l'historique est vide."""
+        if not self.history:
+            return None
+        guess, fb, previous = self.history.pop()
+        self.candidates = previous
+        return guess, fb
+
+    def reset(self):
+        self.candidates = np.arange(len(self.words))
+        self.history = []
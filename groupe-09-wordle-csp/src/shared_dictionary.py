@@ -0,0 +1,89 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from csp_solver import ALPHABET, WordMatrix
+
+
+# ---------------------------------------------------------------------------
+# Dictionnaire compilé en mémoire partagée
+# ---------------------------------------------------------------------------
+# Le service charge wordle.txt une seule fois ; les tableaux de WordMatrix sont
+# copiés dans un bloc de mémoire partagée que les processus de calcul ouvrent
+# par son nom : leurs tableaux numpy sont des vues sur ce bloc (aucune copie,
+# aucune recompilation, mémoire physique commune à tous les processus).
+#
+# Disposition du bloc (N mots) :
+#   en-tête   8 octets   N (uint64)
+#   words     20 N       mots, '<U5' (UTF-32, 5 caractères)
+#   bits      20 N       (5, N) uint32
+#   letters   5 N        (N, 5) uint8
+#   counts    27 N       (27, N) uint8
+HEADER = 8
+
+
+def layout(n: int) -> list[tuple[str, tuple, str, int]]:
+    """(nom, forme, dtype, décalage) de chaque tableau ; les uint32 restent alignés sur 4 octets."""
+    fields = [("words", (n,), "<U5"), ("bits", (5, n), "<u4"), ("letters", (n, 5), "u1"), ("counts", (ALPHABET, n), "u1")]
+    offset, result = HEADER, []
+    for name, shape, dtype in fields:
+        result.append((name, shape, dtype, offset))
+        offset += int(np.prod(shape)) * np.dtype(dtype).itemsize
+    return result
+
+
+def block_size(n: int) -> int:
+    name, shape, dtype, offset = layout(n)[-1]
+    return offset + int(np.prod(shape)) * np.dtype(dtype).itemsize
+
+
+class SharedDictionary:
+    """
+    Vue WordMatrix sur un bloc de mémoire partagée.
+
+    SharedDictionary.create(words) : le processus principal compile et publie (propriétaire) ;
+    SharedDictionary.attach(name) : un processus de calcul ouvre le bloc sans copie.
+    Le propriétaire appelle unlink() à l'arrêt ; les autres close() (ou rien, à la sortie du processus).
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool = False):
+        self.shm = shm
+        self.owner = owner
+        n = int(np.ndarray((1,), dtype="<u8", buffer=shm.buf)[0])
+        arrays = {name: np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+                  for name, shape, dtype, offset in layout(n)}
+        for array in arrays.values():
+            array.flags.writeable = False  # lecture seule : partagé par toutes les sessions
+        # Seule la liste Python des mots est recréée (les API du solveur manipulent des str)
+        self.matrix = WordMatrix.from_arrays(arrays["words"].tolist(), arrays["letters"], arrays["bits"],
+                                             arrays["counts"])
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @classmethod
+    def create(cls, words, name: str = None) -> "SharedDictionary":
+        matrix = words if isinstance(words, WordMatrix) else WordMatrix(words)
+        n = len(matrix)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=max(block_size(n), 1))
+        np.ndarray((1,), dtype="<u8", buffer=shm.buf)[0] = n
+        source = {"words": np.array(matrix.words, dtype="<U5"), "bits": matrix.bits, "letters": matrix.letters,
+                  "counts": matrix.counts}
+        for field, shape, dtype, offset in layout(n):
+            np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)[...] = source[field]
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedDictionary":
+        return cls(shared_memory.SharedMemory(name=name))
+
+    def close(self):
+        # Les vues numpy doivent disparaître avant de fermer le bloc (sinon BufferError)
+        self.matrix = None
+        self.shm.close()
+
+    def unlink(self):
+        self.close()
+        if self.owner:
+            self.shm.unlink()
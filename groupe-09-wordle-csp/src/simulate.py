@@ -0,0 +1,249 @@
+import argparse
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from csp_solver import wordle_feedback_vjg
+from llm_agent import MAX_CANDIDATES_TO_LLM, MODEL, OLLAMA_AVAILABLE, load_dictionary, ollama
+from metrics import percentile
+from prompt_budget import CHOICE_TOOLS, PromptBudget, parse_choice
+from ranking import rank_by_entropy
+from session import WordleSession
+
+
+# ---------------------------------------------------------------------------
+# Simulation hors ligne sur tout le dictionnaire
+# ---------------------------------------------------------------------------
+# Chaque mot de wordle.txt sert de secret ; une politique de choix (classement
+# local, LLM réel, ou LLM simulé par fake_ollama) joue la partie jusqu'à
+# trouver le mot ou épuiser MAX_TURNS essais. Les parties sont réparties sur un
+# pool de processus (un dictionnaire compilé et une politique par processus).
+# Rapport : distribution du nombre d'essais, taux d'échec, latence par tour et
+# par partie, pour comparer objectivement stratégies et optimisations.
+MAX_TURNS = 6
+
+
+# ---------------------------------------------------------------------------
+# Politiques de choix
+# ---------------------------------------------------------------------------
+class LocalPolicy:
+    """Mot le plus informatif (entropie) parmi les candidats restants."""
+
+    name = "local"
+
+    def __init__(self, opener: Optional[str] = None):
+        self.opener = opener
+
+    def prepare(self, words: list[str]):
+        # Même dictionnaire à chaque partie : l'ouverture est calculée une fois, hors mesure
+        if self.opener is None:
+            self.opener = self.choose(words)
+
+    def first(self, candidates: list[str]) -> str:
+        return self.opener
+
+    def choose(self, candidates: list[str]) -> str:
+        return rank_by_entropy(candidates, top=1)[0][0]
+
+
+class LLMPolicy(LocalPolicy):
+    """
+    Même prompt de ranking (budget de tokens) et même outil de choix que l'agent ; sans
+    choix valide (réponse invalide, erreur, délai), on joue le premier du classement local.
+    """
+
+    name = "llm"
+
+    def __init__(self, opener: Optional[str] = None, host: Optional[str] = None, model: str = MODEL,
+                 timeout: float = 30.0):
+        super().__init__(opener)
+        if not OLLAMA_AVAILABLE:
+            raise RuntimeError("ollama is not installed")
+        self.model = model
+        self.client = ollama.Client(host=host, timeout=timeout)
+        self.budget = PromptBudget()  # calibré par processus sur les réponses du modèle
+        self.first_ranked = None
+        self.stats = {"llm_calls": 0, "fallbacks": 0, "sent": 0}
+
+    def prepare(self, words: list[str]):
+        # Le LLM choisit aussi l'ouverture ; seul le classement du dictionnaire complet est précalculé
+        if self.opener is None:
+            self.first_ranked = rank_by_entropy(words, top=MAX_CANDIDATES_TO_LLM)
+
+    def first(self, candidates: list[str]) -> str:
+        return self.opener or self.ask(self.first_ranked)
+
+    def choose(self, candidates: list[str]) -> str:
+        return self.ask(rank_by_entropy(candidates, top=MAX_CANDIDATES_TO_LLM))
+
+    def ask(self, ranked: list[tuple[str, float]]) -> str:
+        prompt, shortlist = self.budget.build(ranked)
+        self.stats["llm_calls"] += 1
+        self.stats["sent"] += len(shortlist)
+        try:
+            response = self.client.chat(model=self.model, messages=[{"role": "user", "content": prompt}],
+                                        tools=CHOICE_TOOLS)
+            self.budget.observe(response)
+            choice = parse_choice(response, shortlist)
+        except Exception:
+            choice = None
+        if choice:
+            return choice["chosen"]
+        self.stats["fallbacks"] += 1
+        return shortlist[0]
+
+
+POLICIES = {"local": LocalPolicy, "llm": LLMPolicy, "stub": LLMPolicy}  # stub : LLMPolicy sur fake_ollama
+
+
+# ---------------------------------------------------------------------------
+# Parties (exécutées dans les processus du pool)
+# ---------------------------------------------------------------------------
+_worker = {}
+
+
+def init_worker(dictionary: str, policy: str, options: dict):
+    # Une fois par processus : compilation du dictionnaire + politique (client HTTP, ouverture)
+    words = load_dictionary(dictionary)
+    _worker["words"] = words
+    _worker["matrix"] = WordleSession(words).matrix
+    _worker["policy"] = POLICIES[policy](**options)
+    _worker["policy"].prepare(words)
+
+
+def play(secret: str, max_turns: int = MAX_TURNS) -> dict:
+    policy = _worker["policy"]
+    session = WordleSession(_worker["matrix"])
+    candidates = _worker["words"]
+    guesses, turn_ms = [], []
+    counters = dict(getattr(policy, "stats", {}))
+
+    start = time.perf_counter()
+    for turn in range(max_turns):
+        turn_start = time.perf_counter()
+        guess = policy.first(candidates) if turn == 0 else policy.choose(candidates)
+        feedback = wordle_feedback_vjg(secret, guess)
+        candidates = session.add(guess, feedback)
+        turn_ms.append((time.perf_counter() - turn_start) * 1000)
+        guesses.append(guess)
+        if feedback == "VVVVV" or not candidates:
+            break
+
+    return {
+        "secret": secret,
+        "solved": guesses[-1] == secret,
+        "turns": len(guesses),
+        "guesses": guesses,
+        "turn_ms": turn_ms,
+        "game_ms": (time.perf_counter() - start) * 1000,
+        **{key: value - counters[key] for key, value in getattr(policy, "stats", {}).items()},
+    }
+
+
+def play_chunk(secrets: list[str]) -> list[dict]:
+    return [play(secret) for secret in secrets]
+
+
+# ---------------------------------------------------------------------------
+# Rapport
+# ---------------------------------------------------------------------------
+def summarize(games: list[dict], elapsed: float) -> dict:
+    solved = [g for g in games if g["solved"]]
+    turn_ms = [ms for g in games for ms in g["turn_ms"]]
+    game_ms = [g["game_ms"] for g in games]
+    return {
+        "games": len(games),
+        "solved": len(solved),
+        "failure_rate": 1 - len(solved) / len(games),
+        "mean_guesses": sum(g["turns"] for g in solved) / len(solved) if solved else float("nan"),
+        "distribution": dict(sorted(Counter(g["turns"] for g in solved).items())),
+        "games_per_s": len(games) / elapsed,
+        "elapsed_s": elapsed,
+        "turn_p50_ms": percentile(turn_ms, 50),
+        "turn_p95_ms": percentile(turn_ms, 95),
+        "turn_max_ms": max(turn_ms),
+        "game_p50_ms": percentile(game_ms, 50),
+        "game_p95_ms": percentile(game_ms, 95),
+        "game_max_ms": max(game_ms),
+        **{key: sum(g[key] for g in games) for key in ("llm_calls", "fallbacks", "sent") if key in games[0]},
+    }
+
+
+def print_report(report: dict):
+    for key, value in report.items():
+        if key == "distribution":
+            continue
+        print(f"{key:>14}: {value:.3f}" if isinstance(value, float) else f"{key:>14}: {value}")
+
+    width = max(report["distribution"].values(), default=1)
+    print("\nguesses  games")
+    for turns, count in report["distribution"].items():
+        print(f"{turns:>7}  {count:>5}  {'#' * max(1, round(40 * count / width))}")
+    failed = report["games"] - report["solved"]
+    print(f"{'failed':>7}  {failed:>5}")
+
+
+def simulate(args) -> tuple[list[dict], dict]:
+    secrets = load_dictionary(args.dictionary)
+    if args.limit:
+        secrets = secrets[::max(1, len(secrets) // args.limit)][:args.limit]  # échantillon régulier
+
+    options = {"opener": args.opener.upper() if args.opener else None}
+    if args.policy != "local":
+        options.update(host=args.host, model=args.model, timeout=args.timeout)
+
+    # Lots de parties : peu d'allers-retours entre processus, charge encore équilibrée
+    chunks = [secrets[i:i + args.chunk] for i in range(0, len(secrets), args.chunk)]
+    games = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(args.workers, initializer=init_worker,
+                             initargs=(args.dictionary, args.policy, options)) as pool:
+        for done, chunk in enumerate(pool.map(play_chunk, chunks), 1):
+            games.extend(chunk)
+            if args.progress and done % args.progress == 0:
+                print(f"{len(games)}/{len(secrets)} games")
+    return games, summarize(games, time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play every secret of the dictionary and report guess counts / latency")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="local",
+                        help="local ranker, real LLM (Ollama), or stub LLM (local fake server)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="processes in the pool")
+    parser.add_argument("--chunk", type=int, default=50, help="games per task sent to a worker")
+    parser.add_argument("--limit", type=int, default=0, help="play an evenly spaced sample of N secrets")
+    parser.add_argument("--opener", help="fixed first guess (default: chosen by the policy)")
+    parser.add_argument("--host", help="Ollama host for --policy llm")
+    parser.add_argument("--model", default=MODEL)
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-call LLM timeout (s)")
+    parser.add_argument("--latency", type=float, default=0.05, help="stub: mean generation time (s)")
+    parser.add_argument("--prompt-rate", type=float, default=0.0, help="stub: prompt tokens evaluated per second")
+    parser.add_argument("--output", metavar="PATH", help="write one JSON line per game")
+    parser.add_argument("--progress", type=int, default=0, help="print progress every N chunks")
+    parser.add_argument("--dictionary", default="wordle.txt")
+    args = parser.parse_args()
+
+    if args.policy == "stub":
+        from fake_ollama import FakeOllama
+
+        server = FakeOllama(latency=args.latency, cold_start=0.0, slots=args.workers, prompt_rate=args.prompt_rate)
+        args.host = server.start()
+    try:
+        games, report = simulate(args)
+    finally:
+        if args.policy == "stub":
+            server.stop()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            for game in games:
+                f.write(json.dumps(game) + "\n")
+    print(f"policy: {args.policy}, workers: {args.workers}\n")
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
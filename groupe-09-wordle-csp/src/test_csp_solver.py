@@ -0,0 +1,69 @@
+"""
+Équivalence du filtre compilé (WordMatrix / compile_attempts / solve_wordle_masks)
+avec le filtre de référence solve_wordle_csp, sur des parties tirées au hasard.
+Lancement : python test_csp_solver.py  (ou pytest)
+"""
+import os
+import random
+
+from csp_solver import WordMatrix, compile_attempts, solve_wordle_csp, solve_wordle_masks, wordle_feedback_vjg
+
+DICTIONARY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wordle.txt")
+# Guesses à lettres doubles / triples (certains absents du dictionnaire, c'est permis)
+REPEATED = ["EERIE", "GEESE", "SASSY", "LLAMA", "SPEED", "ABBEY", "MAMMA", "ERASE", "LEVEL", "SISSY", "EEEEE"]
+
+
+def load_words(step: int = 7) -> list[str]:
+    with open(DICTIONARY, encoding="utf-8") as f:
+        words = [line.strip().upper() for line in f if len(line.strip()) == 5]
+    return words[::step]  # échantillon régulier : tests rapides, toutes les initiales représentées
+
+
+def random_attempts(rng, words, secret, n_attempts):
+    guesses = [rng.choice(REPEATED) if rng.random() < 0.4 else rng.choice(words) for _ in range(n_attempts)]
+    return [(guess, wordle_feedback_vjg(secret, guess)) for guess in guesses]
+
+
+def test_masks_match_reference_on_real_games():
+    rng = random.Random(15)
+    words = load_words()
+    matrix = WordMatrix(words)
+    for _ in range(200):
+        secret = rng.choice(words)
+        attempts = random_attempts(rng, words, secret, rng.randint(1, 4))
+        expected = solve_wordle_csp(words, attempts)
+        assert solve_wordle_masks(matrix, attempts) == expected, attempts
+        assert secret in expected
+
+
+def test_masks_match_reference_on_arbitrary_feedback():
+    # Feedbacks quelconques (y compris incohérents, ex. G avant J sur la même lettre) : même résultat, souvent vide
+    rng = random.Random(16)
+    words = load_words()
+    matrix = WordMatrix(words)
+    for _ in range(300):
+        guess = rng.choice(REPEATED) if rng.random() < 0.5 else rng.choice(words)
+        feedback = "".join(rng.choice("VJG") for _ in range(5))
+        attempts = [(guess, feedback)]
+        assert solve_wordle_masks(matrix, attempts) == solve_wordle_csp(words, attempts), attempts
+
+
+def test_incremental_filter_matches_one_pass():
+    # Filtrer tentative par tentative (indices restants) = tout compiler d'un coup
+    rng = random.Random(17)
+    words = load_words()
+    matrix = WordMatrix(words)
+    for _ in range(50):
+        secret = rng.choice(words)
+        attempts = random_attempts(rng, words, secret, 3)
+        indices = None
+        for attempt in attempts:
+            indices = matrix.filter(compile_attempts([attempt]), indices)
+        assert list(indices) == list(matrix.filter(compile_attempts(attempts)))
+
+
+if __name__ == "__main__":
+    for test in (test_masks_match_reference_on_real_games, test_masks_match_reference_on_arbitrary_feedback,
+                 test_incremental_filter_matches_one_pass):
+        test()
+        print(f"✓ {test.__name__}")
@@ -0,0 +1,31 @@
+"""
+Percentiles (rang le plus proche) et résumé par étape de metrics.py.
+Lancement : python test_metrics.py  (ou pytest)
+"""
+from metrics import MetricsRecorder, TurnTrace, percentile
+
+
+def test_percentile_nearest_rank():
+    assert percentile([1, 2], 50) == 1
+    assert percentile(list(range(1, 21)), 95) == 19
+    assert percentile(list(range(1, 21)), 100) == 20
+    assert percentile(list(range(1, 101)), 50) == 50
+    assert percentile([7], 0) == 7
+    assert percentile([3, 1, 2], 99) == 3
+
+
+def test_summary_uses_percentile():
+    recorder = MetricsRecorder()
+    for ms in (1.0, 2.0):
+        trace = TurnTrace("ORATE GVVJG")
+        trace.add("filter", ms)
+        trace.finish()
+        recorder.record(trace)
+    row = next(r for r in recorder.summary() if r["stage"] == "filter")
+    assert (row["count"], row["p50_ms"], row["p95_ms"], row["max_ms"]) == (2, 1.0, 2.0, 2.0)
+
+
+if __name__ == "__main__":
+    for test in (test_percentile_nearest_rank, test_summary_uses_percentile):
+        test()
+        print(f"✓ {test.__name__}")
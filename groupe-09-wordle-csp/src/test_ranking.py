@@ -0,0 +1,114 @@
+"""
+Équivalence des codes de feedback vectorisés (ranking.py) avec wordle_feedback_vjg,
+et des entropies avec un calcul naïf (Counter).
+Lancement : python test_ranking.py  (ou pytest)
+"""
+import itertools
+import math
+import os
+import random
+import time
+from collections import Counter
+
+import numpy as np
+
+from csp_solver import encode_words, wordle_feedback_vjg
+from ranking import MIN_SECRETS, entropies, feedback_codes, rank_by_entropy
+
+DICTIONARY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wordle.txt")
+DIGITS = {"G": 0, "J": 1, "V": 2}
+
+
+def load_words() -> list[str]:
+    with open(DICTIONARY, encoding="utf-8") as f:
+        return [line.strip().upper() for line in f if len(line.strip()) == 5]
+
+
+def code(feedback: str) -> int:
+    return sum(DIGITS[c] * 3 ** i for i, c in enumerate(feedback))
+
+
+def naive_entropy(guess: str, secrets: list[str]) -> float:
+    counts = Counter(wordle_feedback_vjg(secret, guess) for secret in secrets)
+    n = len(secrets)
+    return -sum(k / n * math.log2(k / n) for k in counts.values())
+
+
+def test_feedback_codes_exhaustive_small_alphabet():
+    # Tous les mots sur {A, B, C} : toutes les combinaisons de lettres doubles et triples, tous les couples
+    words = ["".join(t) for t in itertools.product("ABC", repeat=5)]
+    letters = encode_words(words)
+    codes = feedback_codes(letters, letters)
+    expected = np.array([[code(wordle_feedback_vjg(s, g)) for s in words] for g in words], dtype=np.uint8)
+    assert np.array_equal(codes, expected)
+
+
+def test_feedback_codes_random_dictionary_pairs():
+    rng = random.Random(16)
+    words = load_words()
+    repeated = [w for w in words if len(set(w)) < 5]
+    guesses = rng.sample(repeated, 100) + rng.sample(words, 100)
+    secrets = rng.sample(words, 300)
+    codes = feedback_codes(encode_words(guesses), encode_words(secrets))
+    for b, guess in enumerate(guesses):
+        for s, secret in enumerate(secrets):
+            assert codes[b, s] == code(wordle_feedback_vjg(secret, guess)), (secret, guess)
+
+
+def test_entropies_match_naive():
+    rng = random.Random(17)
+    words = load_words()
+    guesses = rng.sample(words, 40) + ["EERIE", "SASSY", "MAMMA"]
+    secrets = rng.sample(words, 200)
+    scores = entropies(encode_words(guesses), encode_words(secrets))
+    for guess, score in zip(guesses, scores):
+        assert abs(score - naive_entropy(guess, secrets)) < 1e-9, guess
+
+
+def test_rank_by_entropy_exact_without_sampling():
+    words = random.Random(18).sample(load_words(), 150)
+    ranked = rank_by_entropy(words)
+    assert sorted(w for w, _ in ranked) == sorted(words)
+    scores = [score for _, score in ranked]
+    assert scores == sorted(scores, reverse=True)
+    for word, score in ranked[:10]:
+        assert abs(score - naive_entropy(word, words)) < 1e-9
+
+
+def test_rank_by_entropy_sampling():
+    # Au-delà de max_pairs, l'entropie est calculée sur un échantillon régulier de MIN_SECRETS secrets au moins
+    words = random.Random(19).sample(load_words(), 600)
+    ranked = rank_by_entropy(words, top=5, max_pairs=600 * 100)
+    sample = [words[i] for i in np.linspace(0, len(words) - 1, MIN_SECRETS).astype(np.intp)]
+    assert len(ranked) == 5
+    for word, score in ranked:
+        assert abs(score - naive_entropy(word, sample)) < 1e-9, word
+
+    # Le meilleur mot estimé reste parmi les meilleurs du classement exact
+    exact = rank_by_entropy(words, max_pairs=len(words) ** 2)
+    assert ranked[0][0] in [w for w, _ in exact[:len(words) // 20]]
+
+
+def test_rank_by_entropy_bounded_guesses():
+    # Dictionnaire complet avec top : guess présélectionnés (MAX_GUESSES), même tête de classement, < 100 ms
+    words = load_words()
+    ranked = rank_by_entropy(words, top=50)
+    exact = rank_by_entropy(words, top=50, max_guesses=len(words))
+    assert [w for w, _ in ranked] == [w for w, _ in exact]
+
+    elapsed = min(timed(rank_by_entropy, words, top=50) for _ in range(3))
+    assert elapsed < 0.1, f"{elapsed * 1000:.0f} ms"
+
+
+def timed(function, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    for test in (test_feedback_codes_exhaustive_small_alphabet, test_feedback_codes_random_dictionary_pairs,
+                 test_entropies_match_naive, test_rank_by_entropy_exact_without_sampling,
+                 test_rank_by_entropy_sampling, test_rank_by_entropy_bounded_guesses):
+        test()
+        print(f"✓ {test.__name__}")
@@ -0,0 +1,328 @@
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import multiprocessing
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+import numpy as np
+
+from async_agent import AgentThread, AsyncWordleAgent
+from csp_solver import compile_attempts
+from llm_agent import MAX_CANDIDATES_TO_LLM, RESPONSE_CACHE, load_dictionary
+from metrics import MetricsRecorder
+from ranking import rank_by_entropy
+from session import WordleSession
+from shared_dictionary import SharedDictionary
+
+
+# ---------------------------------------------------------------------------
+# Service local multi-sessions
+# ---------------------------------------------------------------------------
+# Un seul processus charge wordle.txt et le publie en mémoire partagée ; chaque
+# partie (CLI, onglet Streamlit...) est une session du service : historique,
+# candidats restants (indices) et métriques, modifiés tour après tour.
+#   - les appels au LLM passent par l'agent asynchrone (un client, connexions réutilisées) ;
+#   - le filtrage et le classement (CPU) partent dans un pool de processus qui
+#     lisent le dictionnaire partagé sans copie (workers=0 : threads du service).
+# API JSON (HTTP/1.1 keep-alive) :
+#   POST   /sessions                  -> {"session": id}
+#   POST   /sessions/<id>/turn        {"prompt": "..."} -> {"answer", "attempts", "candidates"}
+#   POST   /sessions/<id>/undo        -> {"undone", "attempts", "candidates"}
+#   POST   /sessions/<id>/reset       -> {"attempts", "candidates"}
+#   POST   /sessions/<id>/cancel      -> {"cancelled": bool}
+#   GET    /sessions/<id>             -> {"attempts", "candidates"}
+#   GET    /sessions/<id>/metrics     -> {"last", "summary", "jsonl"}
+#   DELETE /sessions/<id>
+#   GET    /stats
+DEFAULT_PORT = 8765
+SESSION_TTL = 6 * 3600  # s sans activité avant qu'une session soit oubliée
+ROUTE = re.compile(r"^/sessions/([0-9a-f]{32})(?:/(turn|undo|reset|cancel|metrics))?$")
+
+
+# ---------------------------------------------------------------------------
+# Processus de calcul
+# ---------------------------------------------------------------------------
+_worker = {}
+
+
+def init_worker(name: str):
+    # Une fois par processus : ouverture du dictionnaire partagé (vues numpy, aucune copie)
+    _worker["dictionary"] = SharedDictionary.attach(name)
+
+
+def solve_turn(candidates: Optional[np.ndarray], guess: str, feedback: str, top: int):
+    """Filtre les candidats par la nouvelle tentative puis les classe : (indices, classement, ms filtre, ms classement)."""
+    matrix = _worker["dictionary"].matrix
+    start = time.perf_counter()
+    indices = matrix.filter(compile_attempts([(guess, feedback)]), candidates)
+    filtered = time.perf_counter()
+    ranked = rank_by_entropy([matrix.words[i] for i in indices], top) if len(indices) else []
+    return indices, ranked, (filtered - start) * 1000, (time.perf_counter() - filtered) * 1000
+
+
+class PooledWordleAgent(AsyncWordleAgent):
+    """AsyncWordleAgent dont le filtrage et le classement tournent dans un pool de processus."""
+
+    def __init__(self, host: Optional[str] = None, executor: Optional[ProcessPoolExecutor] = None, **options):
+        super().__init__(host=host, **options)
+        self.executor = executor  # None : threads, comme l'agent de base
+
+    async def solve(self, guess, feedback, dictionary_words, attempts, session, trace):
+        if self.executor is None:
+            return await super().solve(guess, feedback, dictionary_words, attempts, session, trace)
+
+        # Au premier tour, None = tout le dictionnaire (évite d'envoyer N indices au processus)
+        before = len(session)
+        subset = None if before == len(session.words) else session.candidates
+        indices, ranked, filter_ms, rank_ms = await asyncio.get_running_loop().run_in_executor(
+            self.executor, solve_turn, subset, guess, feedback, MAX_CANDIDATES_TO_LLM)
+
+        attempts.append((guess, feedback))
+        possible = session.push(guess, feedback, indices)
+        trace.add("filter", filter_ms, candidates_before=before, candidates_after=len(possible))
+        if possible:
+            trace.add("rank_local", rank_ms, candidates=len(possible), sent=len(ranked))
+        return possible, ranked
+
+
+class PooledAgentThread(AgentThread):
+    agent_class = PooledWordleAgent
+
+
+class GameSession:
+
+    def __init__(self, matrix):
+        self.session = WordleSession(matrix)
+        self.attempts = []
+        self.metrics = MetricsRecorder()
+        self.lock = threading.Lock()  # un tour à la fois par session
+        self.pending = None           # future du tour en cours (annulation)
+        self.last_used = time.monotonic()
+
+    def state(self) -> dict:
+        return {"attempts": self.attempts, "candidates": len(self.session)}
+
+
+class ServiceError(Exception):
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class WordleService:
+    """
+    Serveur HTTP local (threads) ; start() renvoie l'URL à passer aux clients (service_client.py).
+
+    workers : processus de calcul (0 : filtrage et classement dans les threads du service) ;
+    ollama_host : serveur Ollama de l'agent ; agent_options : délais, cache... (voir AsyncWordleAgent).
+    """
+
+    def __init__(self, dictionary: str = "wordle.txt", host: str = "127.0.0.1", port: int = 0, workers: int = 0,
+                 ollama_host: Optional[str] = None, **agent_options):
+        words = load_dictionary(dictionary)
+        if not words:
+            raise ValueError(f"Dictionary '{dictionary}' is empty or missing.")
+        self.shared = SharedDictionary.create(words)
+        self.matrix = self.shared.matrix
+        self.executor = None
+        if workers:
+            # spawn : pas de fork d'un processus qui a déjà des threads (serveur, boucle de l'agent)
+            self.executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"),
+                                                initializer=init_worker, initargs=(self.shared.name,))
+            for _ in range(workers):
+                self.executor.submit(int)  # démarre les processus sans attendre le premier tour
+        self.agent = PooledAgentThread(ollama_host, executor=self.executor, **agent_options)
+        self.agent.warm_up()
+        self.workers = workers
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                self.dispatch("GET")
+
+            def do_POST(self):
+                self.dispatch("POST")
+
+            def do_DELETE(self):
+                self.dispatch("DELETE")
+
+            def dispatch(self, method: str):
+                try:
+                    length = int(self.headers.get("Content-Length", 0))
+                    try:
+                        body = json.loads(self.rfile.read(length) or b"{}")
+                    except ValueError:
+                        raise ServiceError(400, "invalid JSON")
+                    self.reply(service.route(method, self.path, body))
+                except ServiceError as e:
+                    self.reply({"error": str(e)}, e.status)
+                except Exception as e:
+                    self.reply({"error": f"{type(e).__name__}: {e}"}, 500)
+
+            def reply(self, payload: dict, status: int = 200):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                try:
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True  # client parti (Ctrl+C)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self.url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.close()
+
+    def close(self):
+        self.httpd.server_close()
+        self.agent.close()
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+        self.sessions.clear()
+        self.matrix = None
+        self.shared.unlink()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # Sessions
+    # ------------------------------------------------------------------
+    def create_session(self) -> str:
+        session_id = uuid.uuid4().hex
+        with self.lock:
+            now = time.monotonic()
+            for key in [k for k, s in self.sessions.items() if now - s.last_used > SESSION_TTL]:
+                del self.sessions[key]
+            self.sessions[session_id] = GameSession(self.matrix)
+        return session_id
+
+    def get(self, session_id: str) -> GameSession:
+        with self.lock:
+            game = self.sessions.get(session_id)
+        if game is None:
+            raise ServiceError(404, "unknown session")
+        game.last_used = time.monotonic()
+        return game
+
+    def route(self, method: str, path: str, body: dict) -> dict:
+        if path == "/stats" and method == "GET":
+            return self.stats()
+        if path == "/sessions" and method == "POST":
+            return {"session": self.create_session()}
+
+        match = ROUTE.match(path)
+        if not match:
+            raise ServiceError(404, "not found")
+        session_id, action = match.groups()
+        if action is None and method == "DELETE":
+            with self.lock:
+                self.sessions.pop(session_id, None)
+            return {}
+
+        game = self.get(session_id)
+        if action is None and method == "GET":
+            return game.state()
+        if action == "metrics" and method == "GET":
+            return {"last": game.metrics.last(), "summary": game.metrics.summary(), "jsonl": game.metrics.to_jsonl()}
+        if method != "POST":
+            raise ServiceError(405, "method not allowed")
+        if action == "turn":
+            return self.turn(game, body.get("prompt") or "")
+        if action == "cancel":
+            pending = game.pending
+            return {"cancelled": bool(pending and pending.cancel())}
+        with game.lock:
+            if action == "undo":
+                undone = game.session.undo()
+                if undone is not None:
+                    game.attempts.pop()
+                return {"undone": undone, **game.state()}
+            if action == "reset":
+                game.session.reset()
+                game.attempts.clear()
+                return game.state()
+        raise ServiceError(404, "not found")
+
+    def turn(self, game: GameSession, prompt: str) -> dict:
+        with game.lock:
+            game.pending = self.agent.submit(
+                self.agent.agent.handle(prompt, None, game.attempts, game.session, game.metrics))
+            try:
+                answer = game.pending.result()
+            except concurrent.futures.CancelledError:
+                raise ServiceError(409, "turn cancelled")
+            finally:
+                game.pending = None
+        return {"answer": answer, **game.state()}
+
+    def stats(self) -> dict:
+        with self.lock:
+            sessions = len(self.sessions)
+        return {
+            "sessions": sessions,
+            "words": len(self.matrix),
+            "workers": self.workers,
+            "shared_memory": {"name": self.shared.name, "bytes": self.shared.shm.size},
+            "agent": self.agent.agent.stats,
+            "prompt_budget": self.agent.agent.budget.stats(),
+            "cache": RESPONSE_CACHE.stats(),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local multi-session Wordle solving service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=2, help="processes for filtering / ranking (0: threads)")
+    parser.add_argument("--ollama-host", help="Ollama server used by the agent")
+    parser.add_argument("--dictionary", default="wordle.txt")
+    args = parser.parse_args()
+
+    service = WordleService(args.dictionary, args.host, args.port, args.workers, args.ollama_host)
+    print(f"Wordle service listening on {service.url} "
+          f"({len(service.matrix)} words, {args.workers} workers; Ctrl+C to stop)")
+    print(f"Clients: WORDLE_SERVICE={service.url} python main.py   |   streamlit run app.py")
+    try:
+        service.httpd.serve_forever()
+    except KeyboardInterrupt:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()